@@ -1,32 +1,51 @@
 __all__ = (
+    'HitTestIndex',
+    'JobScheduler',
+    'TaskLimiter',
+    'ThreadChannel',
     'anim_attrs',
     'anim_attrs_abbr',
     'anim_with_ratio',
     'block_touch_events',
     'cancel_managed_tasks',
+    'configure_load_texture',
+    'configure_pool',
     'event',
     'event_freq',
     'fade_transition',
     'interpolate',
     'interpolate_seq',
+    'iter_in_thread',
+    'key',
+    'key_stream',
+    'limit_completions_per_frame',
+    'load_texture',
     'managed_start',
     'move_on_after',
     'n_frames',
     'rest_of_touch_events',
     'rest_of_touch_events_cm',
+    'run_in_asyncio',
     'run_in_executor',
+    'run_in_pool',
+    'run_in_process',
     'run_in_thread',
     'sandwich_canvas',
+    'shutdown',
+    'shutdown_pools',
     'sleep',
     'sleep_free',
     'sleep_freq',
     'smooth_attr',
     'stencil_mask',
     'stencil_widget_mask',
+    'stop_requested',
     'suppress_event',
     'sync_attr',
     'sync_attrs',
     'transform',
+    'widget_scope',
+    'wrap_future',
 )
 
 from asyncgui import *
@@ -35,6 +54,15 @@ from ._event import event, event_freq, suppress_event, rest_of_touch_events, res
     block_touch_events
 from ._anim_attrs import anim_attrs, anim_attrs_abbr
 from ._interpolate import interpolate, interpolate_seq, fade_transition
-from ._threading import run_in_executor, run_in_thread
+from ._threading import run_in_executor, run_in_thread, limit_completions_per_frame, iter_in_thread, \
+    ThreadChannel, wrap_future
 from ._etc import transform, sync_attr, sync_attrs, stencil_mask, stencil_widget_mask, sandwich_canvas, smooth_attr
-from ._managed_start import managed_start, cancel_managed_tasks
+from ._pool import run_in_pool, run_in_process, configure_pool, shutdown_pools
+from ._managed_start import managed_start, cancel_managed_tasks, shutdown, stop_requested
+from ._key import key, key_stream
+from ._hit_test import HitTestIndex
+from ._job_scheduler import JobScheduler
+from ._task_limiter import TaskLimiter
+from ._asyncio_bridge import run_in_asyncio
+from ._load_texture import load_texture, configure_load_texture
+from ._widget_scope import widget_scope
@@ -4,6 +4,8 @@ import kivy.clock
 from kivy.animation import AnimationTransition
 import asyncgui
 
+from . import _trace, _instrument
+
 
 def _update(setattr, zip, min, obj, duration, transition, anim_params, task, p_time, dt):
     time = p_time[0] + dt
@@ -55,14 +57,19 @@ def _anim_attrs(
         for attr_name, goal_value in animated_properties.items()
     ]
 
+    task = (yield _current_task)[0][0]
+    update = partial(_update, obj, duration, transition, anim_params, task, [0., ])
+    if _instrument.active:
+        update = _instrument.timed(task, 'anim_attrs', update)
+    if (tracer := _trace.tracer) is not None:
+        span_id = tracer.begin('anim_attrs', type(obj).__name__, {'attrs': list(animated_properties)})
     try:
-        clock_event = Clock.schedule_interval(
-            partial(_update, obj, duration, transition, anim_params, (yield _current_task)[0][0], [0., ]),
-            step,
-        )
+        clock_event = Clock.schedule_interval(update, step)
         yield _sleep_forever
     finally:
         clock_event.cancel()
+        if tracer is not None:
+            tracer.end('anim_attrs', type(obj).__name__, span_id)
 
 
 def anim_attrs(obj, *, duration=1.0, step=0, transition=AnimationTransition.linear, **animated_properties):
@@ -0,0 +1,75 @@
+import asyncio
+from threading import Thread
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from kivy.base import EventLoop
+
+from ._threading import wrap_future
+
+_loop: asyncio.AbstractEventLoop = None
+_thread: Thread = None
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _thread
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        _thread = Thread(name='asynckivy.asyncio', target=_loop.run_forever, daemon=True)
+        _thread.start()
+    return _loop
+
+
+async def _cancel_remaining_tasks():
+    tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.get_running_loop().shutdown_asyncgens()
+
+
+# How long the app exit waits for the remaining asyncio tasks to respond to cancellation.
+_SHUTDOWN_TIMEOUT = 2.0
+
+
+def _shutdown_loop(*__):
+    global _loop, _thread
+    loop, thread = _loop, _thread
+    if loop is None:
+        return
+    _loop = _thread = None
+    try:
+        asyncio.run_coroutine_threadsafe(_cancel_remaining_tasks(), loop).result(_SHUTDOWN_TIMEOUT)
+    except FutureTimeoutError:
+        # A coroutine that swallows cancellation must not hang the app exit. The thread is a daemon, so it's left
+        # behind.
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(_SHUTDOWN_TIMEOUT)
+    if not thread.is_alive():
+        loop.close()
+
+
+async def run_in_asyncio(coro):
+    '''
+    Runs an asyncio coroutine within an asyncio event loop managed by asynckivy, and waits for its completion.
+
+    .. code-block::
+
+        async def fetch(session, url):
+            async with session.get(url) as resp:
+                return await resp.read()
+
+        data = await run_in_asyncio(fetch(session, url))
+
+    The event loop runs in a background thread. It's created the first time this function is called, and is shared
+    by all the subsequent calls, so the resources bound to it, such as connection pools, can be reused across calls.
+    It's closed when an ``EventLoop.on_stop`` event fires.
+
+    Cancelling the caller Task cancels the coroutine. If the coroutine is cancelled on the asyncio side instead,
+    :exc:`concurrent.futures.CancelledError` is raised in the caller Task.
+
+    .. versionadded:: 0.11.0
+    '''
+    return await wrap_future(asyncio.run_coroutine_threadsafe(coro, _get_loop()))
+
+
+EventLoop.fbind("on_stop", _shutdown_loop)
@@ -0,0 +1,20 @@
+# The object that records the bindings, which is set while asynckivy.debug.start_tracking_bindings() is in effect.
+tracker = None
+
+
+def fbind(dispatcher, event_name, callback) -> int:
+    '''
+    :meth:`kivy.event.EventDispatcher.fbind` that lets the :attr:`tracker` know about the binding. The APIs that bind
+    callbacks on behalf of the user, such as :func:`asynckivy.event` and :class:`asynckivy.sync_attr`, bind through
+    this and :func:`unbind_uid`.
+    '''
+    uid = dispatcher.fbind(event_name, callback)
+    if uid and tracker is not None:
+        tracker.on_bind(dispatcher, event_name, uid)
+    return uid
+
+
+def unbind_uid(dispatcher, event_name, uid):
+    dispatcher.unbind_uid(event_name, uid)
+    if tracker is not None:
+        tracker.on_unbind(dispatcher, event_name, uid)
@@ -12,6 +12,10 @@ from kivy.graphics import (
     PushMatrix, PopMatrix, InstructionGroup, StencilPush, StencilUse, StencilUnUse, StencilPop, Rectangle,
     Canvas, Instruction,
 )
+
+from ._bindings import fbind, unbind_uid
+from . import _instrument
+
 CanvasLayer: T.TypeAlias = T.Literal["inner", "outer", "inner_outer"]
 
 
@@ -183,7 +187,7 @@ class sync_attr:
 
     def __init__(self, from_: tuple[EventDispatcher, str], to_: tuple[T.Any, str]):
         setattr(*to_, getattr(*from_))
-        bind_uid = from_[0].fbind(from_[1], partial(self._sync, setattr, *to_))
+        bind_uid = fbind(*from_, partial(self._sync, setattr, *to_))
         self._exit = partial(self._unbind, *from_, bind_uid)
 
     @staticmethod
@@ -192,7 +196,7 @@ class sync_attr:
 
     @staticmethod
     def _unbind(event_dispatcher, event_name, bind_uid, *__):
-        event_dispatcher.unbind_uid(event_name, bind_uid)
+        unbind_uid(event_dispatcher, event_name, bind_uid)
 
     def __enter__(self):
         pass
@@ -256,7 +260,7 @@ class sync_attrs:
     def __init__(self, from_: tuple[EventDispatcher, str], *to_):
         sync = partial(self._sync, setattr, to_)
         sync(None, getattr(*from_))
-        bind_uid = from_[0].fbind(from_[1], sync)
+        bind_uid = fbind(*from_, sync)
         self._exit = partial(self._unbind, *from_, bind_uid)
 
     @staticmethod
@@ -327,16 +331,17 @@ class smooth_attr:
             update = self._update_follower_ver_seq
         else:
             raise ValueError(f"Unsupported target type: {target_desc}")
-        trigger = Clock.schedule_interval(
-            partial(update, *target, *follower, -speed, -min_diff, min_diff), 0
-        )
-        bind_uid = target_obj.fbind(target_attr, trigger)
+        update = partial(update, *target, *follower, -speed, -min_diff, min_diff)
+        if _instrument.active:
+            update = _instrument.timed(None, 'smooth_attr', update)
+        trigger = Clock.schedule_interval(update, 0)
+        bind_uid = fbind(target_obj, target_attr, trigger)
         self._exit = partial(self._cleanup, trigger, target_obj, target_attr, bind_uid)
 
     @staticmethod
     def _cleanup(trigger, target_obj, target_attr, bind_uid, *__):
         trigger.cancel()
-        target_obj.unbind_uid(target_attr, bind_uid)
+        unbind_uid(target_obj, target_attr, bind_uid)
 
     def __enter__(self):
         pass
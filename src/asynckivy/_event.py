@@ -5,9 +5,15 @@ from contextlib import asynccontextmanager, ExitStack
 
 from asyncgui import _current_task, _sleep_forever, move_on_when, ExclusiveEvent, _wait_args
 
+from .filters import _as_callable, ungrabbed, collides
+from ._bindings import fbind, unbind_uid
+from . import _instrument
+
+_block_touch_events_filter = (ungrabbed & collides('pos')).compiled
+
 
 @types.coroutine
-def event(event_dispatcher, event_name, *, filter=None, stop_dispatching=False):
+def event(event_dispatcher, event_name, *, filter=None, stop_dispatching=False, index=None):
     '''
     Returns an :class:`~collections.abc.Awaitable` that can be used to wait for:
 
@@ -39,14 +45,30 @@ def event(event_dispatcher, event_name, *, filter=None, stop_dispatching=False):
     The ``stop_dispatching`` parameter:
 
       This only works for events not for properties.
+
+    The ``index`` parameter:
+
+      A :class:`asynckivy.HitTestIndex`. If specified, the event must be a touch event, and the task waits only for
+      the touches inside the widget, without binding anything to the widget.
+
+    .. versionchanged:: 0.11.0
+        The ``filter`` parameter accepts a :class:`asynckivy.filters.Filter`.
+
+    .. versionchanged:: 0.11.0
+        The ``index`` parameter was added.
     '''
+    if index is not None:
+        return (yield from index._wait_for_touch_event(
+            event_dispatcher, event_name, _as_callable(filter), stop_dispatching))
     task = (yield _current_task)[0][0]
-    bind_id = event_dispatcher.fbind(event_name, partial(_event_callback, filter, task._step, stop_dispatching))
+    step = _instrument.resumer(task)
+    bind_id = fbind(
+        event_dispatcher, event_name, partial(_event_callback, _as_callable(filter), step, stop_dispatching))
     assert bind_id  # check if binding succeeded
     try:
         return (yield _sleep_forever)[0]
     finally:
-        event_dispatcher.unbind_uid(event_name, bind_id)
+        unbind_uid(event_dispatcher, event_name, bind_id)
 
 
 def _event_callback(filter, task_step, stop_dispatching, *args, **kwargs):
@@ -95,7 +117,7 @@ class event_freq:
     def __init__(self, event_dispatcher, event_name, *, filter=None, stop_dispatching=False, free_to_await=False):
         self._disp = event_dispatcher
         self._name = event_name
-        self._filter = filter
+        self._filter = _as_callable(filter)
         self._stop = stop_dispatching
         self._free_to_await = free_to_await
 
@@ -103,16 +125,18 @@ class event_freq:
     def __aenter__(self):
         if self._free_to_await:
             e = ExclusiveEvent()
-            self._bind_id = self._disp.fbind(self._name, partial(_event_callback, self._filter, e.fire, self._stop))
+            self._bind_id = fbind(
+                self._disp, self._name, partial(_event_callback, self._filter, e.fire, self._stop))
             return e.wait_args
         else:
             task = (yield _current_task)[0][0]
-            self._bind_id = self._disp.fbind(
-                self._name, partial(_event_callback, self._filter, task._step, self._stop))
+            step = _instrument.resumer(task)
+            self._bind_id = fbind(
+                self._disp, self._name, partial(_event_callback, self._filter, step, self._stop))
             return _wait_args
 
     async def __aexit__(self, *args):
-        self._disp.unbind_uid(self._name, self._bind_id)
+        unbind_uid(self._disp, self._name, self._bind_id)
 
 
 class suppress_event:
@@ -151,13 +175,13 @@ class suppress_event:
     def __init__(self, event_dispatcher, event_name, *, filter=lambda *args, **kwargs: True):
         self._dispatcher = event_dispatcher
         self._name = event_name
-        self._filter = filter
+        self._filter = _as_callable(filter)
 
     def __enter__(self):
-        self._bind_uid = self._dispatcher.fbind(self._name, self._filter)
+        self._bind_uid = fbind(self._dispatcher, self._name, self._filter)
 
     def __exit__(self, *args):
-        self._dispatcher.unbind_uid(self._name, self._bind_uid)
+        unbind_uid(self._dispatcher, self._name, self._bind_uid)
 
 
 class block_touch_events:
@@ -185,21 +209,36 @@ class block_touch_events:
         ):
             ...
 
+    If an :class:`asynckivy.HitTestIndex` is given through the ``index`` parameter, the touches are blocked by the
+    index instead of the handlers bound to the widget.
+
     .. versionadded:: 0.10.0
+    .. versionchanged:: 0.11.0
+        The ``index`` parameter was added.
     '''
-    __slots__ = ('_dispatcher', '_filter', )
+    __slots__ = ('_dispatcher', '_filter', '_index', )
 
-    def __init__(self, event_dispatcher, *, filter=lambda w, t: t.grab_current is None and w.collide_point(*t.pos)):
+    def __init__(self, event_dispatcher, *, filter=_block_touch_events_filter, index=None):
         self._dispatcher = event_dispatcher
-        self._filter = filter
+        self._index = index
+        if index is not None and filter is _block_touch_events_filter:
+            # The index has already done the hit-test.
+            filter = ungrabbed.compiled
+        self._filter = _as_callable(filter)
 
     def __enter__(self):
         f = self._filter
-        self._dispatcher.bind(on_touch_down=f, on_touch_move=f, on_touch_up=f)
+        if (index := self._index) is None:
+            self._dispatcher.bind(on_touch_down=f, on_touch_move=f, on_touch_up=f)
+        else:
+            index._block(self._dispatcher, f)
 
     def __exit__(self, *__):
         f = self._filter
-        self._dispatcher.unbind(on_touch_down=f, on_touch_move=f, on_touch_up=f)
+        if (index := self._index) is None:
+            self._dispatcher.unbind(on_touch_down=f, on_touch_move=f, on_touch_up=f)
+        else:
+            index._unblock(self._dispatcher, f)
 
 
 async def rest_of_touch_events(widget, touch, *, stop_dispatching=False, grab=True) -> AsyncIterator[None]:
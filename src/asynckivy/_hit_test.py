@@ -0,0 +1,188 @@
+import types
+from functools import partial
+
+from kivy.metrics import dp
+from asyncgui import _current_task, _sleep_forever
+
+from ._event import _event_callback
+from . import _instrument
+
+_TOUCH_EVENTS = ('on_touch_down', 'on_touch_move', 'on_touch_up', )
+
+
+class _Region:
+    '''(internal) The area of a widget registered to a :class:`HitTestIndex`.'''
+    __slots__ = ('widget', 'cells', 'handlers', 'blockers', 'n_handlers', 'bind_uids', )
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.cells = frozenset()
+        self.handlers = {name: [] for name in _TOUCH_EVENTS}
+        # The filters of 'block_touch_events', kept apart from the handlers so that they can run first.
+        self.blockers = {name: [] for name in _TOUCH_EVENTS}
+        self.n_handlers = 0
+
+
+class HitTestIndex:
+    '''
+    A uniform grid that indexes the bounding boxes of widgets, which lets a single window-level handler deliver each
+    touch only to the widgets under it, instead of every widget running its own handler and rejecting the touches
+    that are not inside it.
+
+    .. code-block::
+
+        from kivy.core.window import Window
+
+        index = HitTestIndex(Window)
+
+        # Equivalent to ak.event(widget, 'on_touch_down', filter=lambda w, t: w.collide_point(*t.pos))
+        __, touch = await ak.event(widget, 'on_touch_down', index=index)
+
+        with ak.block_touch_events(widget, index=index):
+            ...
+
+    Pass it to the ``index`` parameter of :func:`asynckivy.event` or :class:`asynckivy.block_touch_events`.
+    This pays off when hundreds of widgets are waiting for touches at the same time.
+
+    Be aware of the following differences from the ordinary APIs:
+
+    * The touch events are handled at the window level before any widget sees them, so the touches passed to the
+      waiters are in window coordinates, and :class:`asynckivy.block_touch_events` blocks the touches for the entire
+      window, not just for the widget and its descendants. The waiters of the same index under the blocked widget
+      don't receive them either.
+    * The grid is updated when the ``pos`` or ``size`` of an indexed widget changes. If an ancestor of it moves while
+      it stays still relative to the ancestor, which happens inside a
+      :class:`~kivy.uix.relativelayout.RelativeLayout`, call :meth:`refresh`.
+
+    :param cell_size: The side length of the grid cells in pixels. Ideally, it's about the size of the typical
+        widget being indexed.
+
+    .. versionadded:: 0.11.0
+    '''
+    __slots__ = ('_window', '_cell_size', '_grid', '_regions', '_bind_uids', )
+
+    def __init__(self, window, *, cell_size=dp(100)):
+        self._window = window
+        self._cell_size = cell_size
+        self._grid: dict[tuple[int, int], list[_Region]] = {}
+        self._regions: dict[int, _Region] = {}
+        self._bind_uids = None
+
+    def refresh(self, widget=None):
+        '''
+        Re-calculates the area of the given widget, or all the indexed widgets if None.
+        '''
+        if widget is None:
+            for r in self._regions.values():
+                self._update_cells(r)
+        elif (r := self._regions.get(id(widget))) is not None:
+            self._update_cells(r)
+
+    def _update_cells(self, region: _Region, *__):
+        w = region.widget
+        x, y = w.to_window(*w.pos)
+        width, height = w.size
+        cs = self._cell_size
+        new_cells = {
+            (cx, cy)
+            for cx in range(int(x // cs), int((x + width) // cs) + 1)
+            for cy in range(int(y // cs), int((y + height) // cs) + 1)
+        }
+        old_cells = region.cells
+        grid = self._grid
+        for c in old_cells.difference(new_cells):
+            lst = grid[c]
+            lst.remove(region)
+            if not lst:
+                del grid[c]
+        for c in new_cells.difference(old_cells):
+            grid.setdefault(c, []).append(region)
+        region.cells = new_cells
+
+    def _add(self, widget, event_name, handler, blocker=False):
+        if (r := self._regions.get(id(widget))) is None:
+            if not self._regions:
+                self._start_handling_touches()
+            self._regions[id(widget)] = r = _Region(widget)
+            update = partial(self._update_cells, r)
+            r.bind_uids = (widget.fbind('pos', update), widget.fbind('size', update), )
+            self._update_cells(r)
+        (r.blockers if blocker else r.handlers)[event_name].append(handler)
+        r.n_handlers += 1
+
+    def _remove(self, widget, event_name, handler, blocker=False):
+        r = self._regions[id(widget)]
+        (r.blockers if blocker else r.handlers)[event_name].remove(handler)
+        r.n_handlers -= 1
+        if r.n_handlers:
+            return
+        pos_uid, size_uid = r.bind_uids
+        widget.unbind_uid('pos', pos_uid)
+        widget.unbind_uid('size', size_uid)
+        grid = self._grid
+        for c in r.cells:
+            lst = grid[c]
+            lst.remove(r)
+            if not lst:
+                del grid[c]
+        del self._regions[id(widget)]
+        if not self._regions:
+            self._stop_handling_touches()
+
+    def _start_handling_touches(self):
+        f = self._window.fbind
+        self._bind_uids = tuple(f(name, partial(self._dispatch, name)) for name in _TOUCH_EVENTS)
+
+    def _stop_handling_touches(self):
+        f = self._window.unbind_uid
+        for name, uid in zip(_TOUCH_EVENTS, self._bind_uids):
+            f(name, uid)
+        self._bind_uids = None
+
+    def _dispatch(self, event_name, window, touch):
+        x, y = touch.pos
+        cs = self._cell_size
+        if (regions := self._grid.get((int(x // cs), int(y // cs)))) is None:
+            return
+        hits = []
+        for r in regions:
+            if not (r.handlers[event_name] or r.blockers[event_name]):
+                continue
+            w = r.widget
+            p = w.parent
+            if p is not None and w.collide_point(*p.to_widget(x, y)):
+                hits.append(r)
+        # The blockers run first so that they shield the waiters under them regardless of the registration order,
+        # as they do without the index.
+        for r in hits:
+            for f in tuple(r.blockers[event_name]):
+                if f(r.widget, touch):
+                    return True
+        stop = False
+        for r in hits:
+            w = r.widget
+            for h in tuple(r.handlers[event_name]):
+                if h(w, touch):
+                    stop = True
+        return stop
+
+    @types.coroutine
+    def _wait_for_touch_event(self, widget, event_name, filter, stop_dispatching):
+        if event_name not in _TOUCH_EVENTS:
+            raise ValueError(f"{event_name!r} cannot be indexed. It must be one of {_TOUCH_EVENTS}.")
+        task = (yield _current_task)[0][0]
+        step = _instrument.resumer(task)
+        handler = partial(_event_callback, filter, step, stop_dispatching)
+        self._add(widget, event_name, handler)
+        try:
+            return (yield _sleep_forever)[0]
+        finally:
+            self._remove(widget, event_name, handler)
+
+    def _block(self, widget, filter):
+        for name in _TOUCH_EVENTS:
+            self._add(widget, name, filter, True)
+
+    def _unblock(self, widget, filter):
+        for name in _TOUCH_EVENTS:
+            self._remove(widget, name, filter, True)
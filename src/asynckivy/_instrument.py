@@ -0,0 +1,102 @@
+from time import perf_counter
+from functools import partial
+from weakref import WeakKeyDictionary
+
+from asyncgui import Task
+
+# True while at least one hook is registered.
+active = False
+_hooks = []
+# The hooks that also have a 'before_run()' method.
+_pre_hooks = []
+# Keyed by the root coroutine of a task because tasks don't support weak references.
+_names = WeakKeyDictionary()
+
+# The total time spent in the timed runs nested inside the current one, which is excluded from the current one's time.
+_nested_time = 0.
+
+
+def label_of(task: Task) -> str:
+    '''
+    Returns the name given to the task via :func:`asynckivy.debug.name_task`, or the qualified name of the awaitable
+    the task was started with.
+    '''
+    root_coro = task._root_coro
+    try:
+        return _names[root_coro]
+    except KeyError:
+        pass
+    # While the task is suspended, the root coroutine is awaiting the awaitable the task was started with.
+    aw = root_coro.cr_await
+    return getattr(aw, '__qualname__', None) or type(aw).__name__
+
+
+def run_timed(task: Task, label: str, source: str, func, *args, **kwargs):
+    '''
+    Calls ``func(*args, **kwargs)``, and reports the time it took, excluding the time taken by the timed runs nested
+    inside it, to the hooks.
+    '''
+    global _nested_time
+    for h in tuple(_pre_hooks):
+        h.before_run(task, source)
+    outer_nested_time = _nested_time
+    _nested_time = 0.
+    start = perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        elapsed = perf_counter() - start
+        own_time = elapsed - _nested_time
+        _nested_time = outer_nested_time + elapsed
+        for h in tuple(_hooks):
+            h.on_run(task, label, source, start, own_time)
+
+
+def _run_timed(task, source, func, *args, **kwargs):
+    label = f"asynckivy.{source}" if task is None else label_of(task)
+    return run_timed(task, label, source, func, *args, **kwargs)
+
+
+def timed(task: Task | None, source: str, func):
+    '''
+    Returns a version of ``func`` whose calls are timed runs of the task. ``func`` is either the function that resumes
+    the task, with ``source`` being ``'step'``, or a per-frame update that runs on behalf of it.
+    '''
+    return partial(_run_timed, task, source, func)
+
+
+def resumer(task: Task, resume=None):
+    '''
+    Returns the function that resumes the task, which is ``resume``, or ``task._step`` if it's None. While a hook is
+    registered, it's returned as a timed one. The primitives call this each time they start waiting.
+    '''
+    if resume is None:
+        resume = task._step
+    return partial(_run_timed, task, 'step', resume) if active else resume
+
+
+def add_hook(hook):
+    '''
+    Registers an object that has an ``on_run(task, label, source, start, own_time)`` method, which is called after
+    each timed run. If it also has a ``before_run(task, source)`` method, that is called before each timed run, while
+    the task is still suspended.
+
+    While at least one hook is registered, the primitives of asynckivy time the calls that resume the waiting tasks,
+    and the per-frame updates of :func:`asynckivy.anim_attrs` and :class:`asynckivy.smooth_attr`, whose runs are
+    reported with the ``source`` being ``'step'``, ``'anim_attrs'`` and ``'smooth_attr'`` respectively. The runs of
+    :class:`asynckivy.smooth_attr` are reported with ``task`` being None. Only the waits that begin while a hook is
+    registered are timed, and the ones on the primitives of asyncgui, such as :class:`asyncgui.Event`, are not.
+    '''
+    global active
+    _hooks.append(hook)
+    if hasattr(hook, 'before_run'):
+        _pre_hooks.append(hook)
+    active = True
+
+
+def remove_hook(hook):
+    global active
+    _hooks.remove(hook)
+    if hook in _pre_hooks:
+        _pre_hooks.remove(hook)
+    active = bool(_hooks)
@@ -0,0 +1,129 @@
+import types
+import heapq
+from functools import partial
+from collections.abc import Hashable, Mapping
+from concurrent.futures import Executor
+
+from asyncgui import _current_task, _sleep_forever
+
+from ._threading import _run_in_executor
+from ._pool import _get_pool
+from . import _instrument
+
+
+class _Job:
+    __slots__ = ('resume', 'alive', )
+
+    def __init__(self, resume):
+        self.resume = resume
+        self.alive = True
+
+
+class _Category:
+    __slots__ = ('max_in_flight', 'n_in_flight', 'heap', 'n_dead', )
+
+    def __init__(self, max_in_flight):
+        self.max_in_flight = max_in_flight
+        self.n_in_flight = 0
+        self.heap: list[tuple[int, int, _Job]] = []
+        self.n_dead = 0
+
+
+class JobScheduler:
+    '''
+    Runs functions within an executor like :func:`run_in_executor` does, but limits the number of functions running
+    at the same time per category, and lets the waiting ones start in priority order instead of FIFO.
+
+    .. code-block::
+
+        scheduler = JobScheduler(max_in_flight=4)
+
+        async def load_thumbnail(row):
+            data = await scheduler.run(partial(fetch, row.url), priority=row.visible, category='thumbnail')
+            ...
+
+    A function doesn't enter the executor until its turn comes, so a job whose caller Task is cancelled while waiting
+    for its turn is simply dropped, and never occupies a worker. This is where it differs from
+    :func:`run_in_executor`, which can only cancel the functions that the executor hasn't started yet. On the other
+    hand, a function that has already started keeps its slot until it returns, even if its caller Task is cancelled.
+
+    :param max_in_flight: The maximum number of functions each category can have in the executor at the same time.
+    :param max_in_flight_per_category: Overrides ``max_in_flight`` for specific categories.
+    :param executor: The executor to run the functions in. Defaults to the ``'io'`` pool of :func:`run_in_pool`.
+
+    .. versionadded:: 0.11.0
+    '''
+    __slots__ = ('_executor', '_max_in_flight', '_overrides', '_categories', '_seq', )
+
+    def __init__(self, *, max_in_flight=4, max_in_flight_per_category: Mapping[Hashable, int]=None,
+                 executor: Executor=None):
+        overrides = {} if max_in_flight_per_category is None else dict(max_in_flight_per_category)
+        for n in (max_in_flight, *overrides.values()):
+            if n < 1:
+                raise ValueError(f"'max_in_flight' must be a positive integer. (was {n})")
+        self._executor = executor
+        self._max_in_flight = max_in_flight
+        self._overrides = overrides
+        self._categories: dict[Hashable, _Category] = {}
+        self._seq = 0
+
+    def _get_category(self, name) -> _Category:
+        if (c := self._categories.get(name)) is None:
+            self._categories[name] = c = _Category(self._overrides.get(name, self._max_in_flight))
+        return c
+
+    def n_waiting(self, category: Hashable=None) -> int:
+        '''The number of the jobs waiting for their turn in the category.'''
+        if (c := self._categories.get(category)) is None:
+            return 0
+        return len(c.heap) - c.n_dead
+
+    async def run(self, func, *, priority=0, category: Hashable=None, cancel_token=False, wait_on_cancel=False):
+        '''
+        Waits for the turn of the ``func``, runs it within the executor, then waits for its completion.
+
+        :param priority: Jobs with higher priority start first. Among the ones with the same priority, the one that
+            started waiting earlier goes first.
+        :param category: Each category has its own limit on the number of jobs in flight.
+
+        The other parameters work the same as the ones of :func:`run_in_executor`.
+        '''
+        c = self._get_category(category)
+        if c.n_in_flight < c.max_in_flight:
+            c.n_in_flight += 1
+        else:
+            self._seq = seq = self._seq + 1
+            await self._wait_for_turn(c, -priority, seq)
+        if (executor := self._executor) is None:
+            executor = _get_pool('io')
+        # The slot is released when the 'func' actually returns, not when the caller stops waiting for it, so
+        # cancelled callers don't let more functions than 'max_in_flight' run at the same time.
+        return await _run_in_executor(executor, func, cancel_token, wait_on_cancel, partial(self._pass_turn, c))
+
+    @types.coroutine
+    def _wait_for_turn(self, c: _Category, neg_priority, seq):
+        job = _Job(_instrument.resumer((yield _current_task)[0][0]))
+        heapq.heappush(c.heap, (neg_priority, seq, job, ))
+        try:
+            yield _sleep_forever
+        finally:
+            # 'alive' is already False if the turn has come.
+            if job.alive:
+                job.alive = False
+                c.n_dead += 1
+                if c.n_dead > len(c.heap) // 2:
+                    c.heap = [e for e in c.heap if e[2].alive]
+                    heapq.heapify(c.heap)
+                    c.n_dead = 0
+
+    def _pass_turn(self, c: _Category):
+        '''Hands the slot over to the next job, or frees it if there is none.'''
+        heap = c.heap
+        while heap:
+            job = heapq.heappop(heap)[2]
+            if job.alive:
+                job.alive = False
+                job.resume()
+                return
+            c.n_dead -= 1
+        c.n_in_flight -= 1
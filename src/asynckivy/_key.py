@@ -0,0 +1,196 @@
+import types
+from bisect import insort
+from collections.abc import Iterable
+
+from asyncgui import _current_task, _sleep_forever, ExclusiveEvent, _wait_args
+
+from . import _instrument
+
+_MODIFIERS = frozenset(('shift', 'ctrl', 'alt', 'meta', ))
+
+
+def _to_keycode(key: str | int) -> int:
+    if isinstance(key, int):
+        return key
+    from kivy.core.window import Keyboard
+    try:
+        return Keyboard.keycodes[key]
+    except KeyError:
+        raise ValueError(f"Unknown key name: {key!r}") from None
+
+
+def _to_modifiers(modifiers: Iterable[str] | None) -> frozenset | None:
+    if modifiers is None:
+        return None
+    modifiers = frozenset(modifiers)
+    if not modifiers <= _MODIFIERS:
+        raise ValueError(f"Unknown modifiers: {modifiers - _MODIFIERS}")
+    return modifiers
+
+
+class _Entry:
+    __slots__ = ('sort_key', 'callback', 'consume', 'alive', )
+
+    def __init__(self, sort_key, callback, consume):
+        self.sort_key = sort_key
+        self.callback = callback
+        self.consume = consume
+        self.alive = True
+
+
+def _sort_key(entry: _Entry):
+    return entry.sort_key
+
+
+class _Keymap:
+    '''
+    (internal)
+    Binds ``on_keyboard`` once per window, and routes each key press only to the entries registered for it.
+    '''
+    __slots__ = ('_window', '_bind_uid', '_entries', '_n_entries', '_seq', '_dispatching', )
+
+    def __init__(self, window):
+        self._window = window
+        self._entries: dict[tuple[int, frozenset | None], list[_Entry]] = {}
+        self._n_entries = 0
+        self._seq = 0
+        self._dispatching = False
+        self._bind_uid = window.fbind('on_keyboard', self._on_keyboard)
+
+    def _on_keyboard(self, window, keycode, scancode, codepoint, modifiers, *args):
+        entries = self._entries
+        exact = entries.get((keycode, _MODIFIERS.intersection(modifiers)), ())
+        wildcard = entries.get((keycode, None), ())
+        if exact and wildcard:
+            candidates = sorted((*exact, *wildcard), key=_sort_key)
+        else:
+            candidates = (*exact, *wildcard)
+        if not candidates:
+            return
+        self._dispatching = True
+        try:
+            for e in candidates:
+                if not e.alive:
+                    continue
+                e.callback(window, keycode, scancode, codepoint, modifiers)
+                if e.consume:
+                    return True
+        finally:
+            self._dispatching = False
+            if not self._n_entries:
+                self._close()
+
+    def add(self, keycode, modifiers, callback, priority, consume) -> _Entry:
+        # Higher priority first. Among the same priority, the most recently added one first.
+        self._seq = seq = self._seq - 1
+        entry = _Entry((-priority, seq, ), callback, consume)
+        insort(self._entries.setdefault((keycode, modifiers), []), entry, key=_sort_key)
+        self._n_entries += 1
+        return entry
+
+    def remove(self, keycode, modifiers, entry: _Entry):
+        entry.alive = False
+        lst = self._entries[(keycode, modifiers)]
+        lst.remove(entry)
+        if not lst:
+            del self._entries[(keycode, modifiers)]
+        self._n_entries -= 1
+        if not (self._n_entries or self._dispatching):
+            self._close()
+
+    def _close(self):
+        w = self._window
+        w.unbind_uid('on_keyboard', self._bind_uid)
+        del _keymaps[id(w)]
+
+
+_keymaps: dict[int, _Keymap] = {}
+
+
+def _get_keymap(window) -> _Keymap:
+    if (km := _keymaps.get(id(window))) is None:
+        _keymaps[id(window)] = km = _Keymap(window)
+    return km
+
+
+@types.coroutine
+def key(window, key: str | int, *, modifiers: Iterable[str] | None=(), priority=0, consume=True):
+    '''
+    Waits for a key to be pressed.
+
+    .. code-block::
+
+        from kivy.core.window import Window
+
+        await key(Window, 'escape')
+        await key(Window, 's', modifiers={'ctrl', })
+
+        # It returns the arguments of the 'on_keyboard' event.
+        window, keycode, scancode, codepoint, modifiers = await key(Window, 'enter', modifiers=None)
+
+    All the waiters on the same window share a single ``on_keyboard`` binding, and a key press is routed only to the
+    waiters for that key, so the cost of a key press doesn't grow with the number of registered shortcuts.
+
+    :param key: A key name listed in :attr:`kivy.core.window.Keyboard.keycodes`, or a keycode.
+    :param modifiers: The modifier keys (any of ``'shift'``, ``'ctrl'``, ``'alt'`` and ``'meta'``) that must be held
+        down. Lock keys such as NumLock are ignored. If None, any combination of modifiers is accepted.
+    :param priority: When multiple waiters are waiting for the same key, higher ones receive it first.
+        Among the ones with the same priority, the one that started waiting most recently goes first.
+    :param consume: If True, lower-priority waiters and the rest of the ``on_keyboard`` handlers won't receive the
+        key press.
+
+    .. versionadded:: 0.11.0
+    '''
+    keycode = _to_keycode(key)
+    modifiers = _to_modifiers(modifiers)
+    task = (yield _current_task)[0][0]
+    step = _instrument.resumer(task)
+    keymap = _get_keymap(window)
+    entry = keymap.add(keycode, modifiers, step, priority, consume)
+    try:
+        return (yield _sleep_forever)[0]
+    finally:
+        keymap.remove(keycode, modifiers, entry)
+
+
+class key_stream:
+    '''
+    The :class:`asynckivy.event_freq` of :func:`key`.
+
+    .. code-block::
+
+        async with key_stream(Window, 'right') as right_key_pressed:
+            while True:
+                await right_key_pressed()
+                ...
+
+    The ``free_to_await`` parameter works the same as the one of :class:`asynckivy.event_freq`.
+
+    .. versionadded:: 0.11.0
+    '''
+    __slots__ = ('_window', '_keycode', '_modifiers', '_priority', '_consume', '_free_to_await', '_keymap', '_entry')
+
+    def __init__(self, window, key: str | int, *, modifiers: Iterable[str] | None=(), priority=0, consume=True,
+                 free_to_await=False):
+        self._window = window
+        self._keycode = _to_keycode(key)
+        self._modifiers = _to_modifiers(modifiers)
+        self._priority = priority
+        self._consume = consume
+        self._free_to_await = free_to_await
+
+    @types.coroutine
+    def __aenter__(self):
+        if self._free_to_await:
+            e = ExclusiveEvent()
+            callback = e.fire
+            wait = e.wait_args
+        else:
+            callback = _instrument.resumer((yield _current_task)[0][0])
+            wait = _wait_args
+        self._keymap = km = _get_keymap(self._window)
+        self._entry = km.add(self._keycode, self._modifiers, callback, self._priority, self._consume)
+        return wait
+
+    async def __aexit__(self, *args):
+        self._keymap.remove(self._keycode, self._modifiers, self._entry)
@@ -0,0 +1,180 @@
+import types
+import heapq
+from collections import OrderedDict
+
+from kivy.clock import Clock
+from asyncgui import _current_task, _sleep_forever, StatefulEvent
+
+from ._pool import run_in_pool
+from . import _instrument
+
+
+def _decode(path):
+    '''(internal) Runs in a worker thread.'''
+    from kivy.core.image import ImageLoader
+    return ImageLoader.load(path, keep_data=True, nocache=True)._data[0]
+
+
+def _nbytes(image_data) -> int:
+    return memoryview(image_data.data).nbytes
+
+
+class _DecodedCache:
+    '''(internal) An LRU cache of decoded images, bounded by the total number of bytes.'''
+    __slots__ = ('_entries', '_nbytes', 'max_bytes', )
+
+    def __init__(self, max_bytes):
+        self._entries: OrderedDict[str, object] = OrderedDict()
+        self._nbytes = 0
+        self.max_bytes = max_bytes
+
+    def get(self, path):
+        if (im := self._entries.get(path)) is not None:
+            self._entries.move_to_end(path)
+        return im
+
+    def put(self, path, im):
+        entries = self._entries
+        if (old := entries.pop(path, None)) is not None:
+            self._nbytes -= _nbytes(old)
+        entries[path] = im
+        self._nbytes += _nbytes(im)
+        self.trim()
+
+    def trim(self):
+        entries = self._entries
+        while self._nbytes > self.max_bytes and entries:
+            self._nbytes -= _nbytes(entries.popitem(last=False)[1])
+
+    def clear(self):
+        self._entries.clear()
+        self._nbytes = 0
+
+
+class _Uploader:
+    '''
+    (internal)
+    Creates textures from decoded images on the main thread, in priority order, without exceeding a certain number of
+    bytes per frame.
+    '''
+    __slots__ = ('_heap', '_seq', '_armed', 'bytes_per_frame', '__weakref__', )
+
+    def __init__(self, bytes_per_frame):
+        self._heap: list[tuple[int, int, list]] = []
+        self._seq = 0
+        self._armed = False
+        self.bytes_per_frame = bytes_per_frame
+
+    @types.coroutine
+    def upload(self, image_data, priority):
+        # [image_data, resume], where 'image_data' is set to None when the request is withdrawn.
+        request = [image_data, _instrument.resumer((yield _current_task)[0][0])]
+        self._seq = seq = self._seq + 1
+        heapq.heappush(self._heap, (-priority, seq, request, ))
+        if not self._armed:
+            self._armed = True
+            Clock.schedule_once(self._upload)
+        try:
+            return (yield _sleep_forever)[0][0]
+        finally:
+            request[0] = None
+
+    def _upload(self, dt):
+        from kivy.graphics.texture import Texture
+        create_from_data = Texture.create_from_data
+        heap = self._heap
+        budget = self.bytes_per_frame
+        # At least one image is uploaded per frame even if it exceeds the budget by itself.
+        first = True
+        try:
+            while heap:
+                im, resume = heap[0][2]
+                if im is None:
+                    heapq.heappop(heap)
+                    continue
+                n = _nbytes(im)
+                if n > budget and not first:
+                    break
+                heapq.heappop(heap)
+                budget -= n
+                first = False
+                resume(create_from_data(im))
+        finally:
+            if heap:
+                Clock.schedule_once(self._upload)
+            else:
+                self._armed = False
+
+
+_cache = _DecodedCache(64 * 1024 * 1024)
+_uploader = _Uploader(4 * 1024 * 1024)
+# The decodes in progress, keyed by the path. The event fires with (image_data, exception) when the decode ends, or
+# with (None, None) if the task that was decoding got cancelled, in which case the waiting ones start over.
+_decoding: dict[str, StatefulEvent] = {}
+
+
+async def _decode_shared(path):
+    '''(internal) Decodes an image, sharing the decode with the other tasks that request the same path meanwhile.'''
+    while (ev := _decoding.get(path)) is not None:
+        im, exc = (await ev.wait())[0]
+        if exc is not None:
+            raise exc
+        if im is not None:
+            return im
+    _decoding[path] = ev = StatefulEvent()
+    im = exc = None
+    try:
+        im = await run_in_pool(lambda: _decode(path), pool='cpu')
+    except Exception as e:
+        exc = e
+        raise
+    finally:
+        del _decoding[path]
+        ev.fire(im, exc)
+    _cache.put(path, im)
+    return im
+
+
+def configure_load_texture(*, bytes_per_frame: int=None, cache_bytes: int=None):
+    '''
+    Changes the settings of :func:`load_texture`.
+
+    :param bytes_per_frame: The number of bytes of pixel data that can be uploaded to the GPU per frame.
+        Defaults to 4 MiB.
+    :param cache_bytes: The maximum total size of the decoded images kept in memory. Defaults to 64 MiB.
+
+    .. versionadded:: 0.11.0
+    '''
+    if bytes_per_frame is not None:
+        if bytes_per_frame < 1:
+            raise ValueError(f"'bytes_per_frame' must be a positive integer. (was {bytes_per_frame})")
+        _uploader.bytes_per_frame = bytes_per_frame
+    if cache_bytes is not None:
+        if cache_bytes < 0:
+            raise ValueError(f"'cache_bytes' must be a non-negative integer. (was {cache_bytes})")
+        _cache.max_bytes = cache_bytes
+        _cache.trim()
+
+
+async def load_texture(path: str, *, priority=0):
+    '''
+    Loads an image as a :class:`~kivy.graphics.texture.Texture` without blocking the main thread.
+
+    .. code-block::
+
+        image.texture = await load_texture('photo.jpg')
+
+    The image is decoded in the ``'cpu'`` pool of :func:`run_in_pool`, and the texture is created on the main thread.
+    The textures are created in priority order, and the amount of pixel data uploaded to the GPU per frame is
+    limited (see :func:`configure_load_texture`), so that opening a screen full of images doesn't drop frames.
+
+    The decoded images are kept in an LRU cache keyed by the path, so loading the same image again skips decoding.
+    The requests for an image that is being decoded share that decode.
+
+    :param priority: Images with higher priority are uploaded first.
+
+    .. versionadded:: 0.11.0
+    '''
+    if (im := _cache.get(path)) is None:
+        im = await _decode_shared(path)
+    return await _uploader.upload(im, priority)
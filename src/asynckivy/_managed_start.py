@@ -1,15 +1,24 @@
+from time import perf_counter
 import asyncgui as ag
-from asyncgui import Task, start
+from asyncgui import Task, start, StatefulEvent
 from kivy.base import EventLoop
+from kivy.clock import Clock
 
 
-_managed_tasks = []
-_n_until_gc = _GC_IN_EVERY = 1000
+# Maps the id of a task to the task and the time it started. Tasks remove themselves when they end, so finished ones
+# are never retained.
+_managed_tasks: dict[int, tuple[Task, float]] = {}
 
 
-def _collect_garbage(STARTED=ag.TaskState.STARTED):
-    global _managed_tasks
-    _managed_tasks = [task for task in _managed_tasks if task.state is STARTED]
+def _unregister(task: Task, _pop=_managed_tasks.pop):
+    _pop(id(task), None)
+
+
+def _unregister_then(on_end):
+    def on_end_wrapper(task: Task, _pop=_managed_tasks.pop):
+        _pop(id(task), None)
+        on_end(task)
+    return on_end_wrapper
 
 
 def managed_start(aw: ag.Aw_or_Task, /) -> Task:
@@ -26,15 +35,19 @@ def managed_start(aw: ag.Aw_or_Task, /) -> Task:
     .. versionadded:: 0.7.1
     .. versionchanged:: 0.10.0
         Uses ``EventLoop.on_stop`` instead of ``App.on_stop``.
+    .. versionchanged:: 0.11.0
+        Tasks are no longer retained after they end.
     '''
-    global _n_until_gc
-    task = start(aw)
-    _managed_tasks.append(task)
-    _n_until_gc -= 1
-    if _n_until_gc <= 0:
-        _n_until_gc = _GC_IN_EVERY
-        _collect_garbage()
-    return task
+    if isinstance(aw, Task):
+        task = aw
+        if task._state is not ag.TaskState.CREATED:
+            raise ValueError(f"{task} has already started")
+    else:
+        task = Task(aw)
+    on_end = task._on_end
+    task._on_end = _unregister if on_end is None else _unregister_then(on_end)
+    _managed_tasks[id(task)] = (task, perf_counter(), )
+    return start(task)
 
 
 def cancel_managed_tasks(*__):
@@ -47,11 +60,72 @@ def cancel_managed_tasks(*__):
 
     .. versionadded:: 0.10.0
     '''
-    global _managed_tasks
-    tasks = _managed_tasks
-    _managed_tasks = []
-    for t in tasks:
+    tasks = tuple(_managed_tasks.values())
+    _managed_tasks.clear()
+    for t, __ in tasks:
         t.cancel()
 
 
+_stop_request = StatefulEvent()
+
+
+async def stop_requested():
+    '''
+    Waits for :func:`shutdown` to be called. If it has already been called, returns immediately.
+
+    .. code-block::
+
+        async def edit_draft(draft):
+            async with move_on_when(stop_requested()):
+                ...  # edit the draft
+            await run_in_thread(draft.save)
+
+        managed_start(edit_draft(draft))
+
+    .. versionadded:: 0.11.0
+    '''
+    await _stop_request.wait()
+
+
+def shutdown(deadline=1.0, *, tick=None) -> list[Task]:
+    '''
+    Gives the tasks started with :func:`managed_start` a chance to finish before they are cancelled.
+
+    #. Tasks waiting for :func:`stop_requested` are resumed.
+    #. Until either all the tasks end or ``deadline`` seconds pass, the clock keeps being ticked so that the tasks
+       can go on, e.g. receiving the results of :func:`run_in_thread` or :func:`run_in_executor`.
+    #. The tasks that are still running are cancelled.
+
+    Returns the tasks that had to be cancelled in the last step.
+
+    This is meant to be called from ``App.on_stop``, which is dispatched before ``EventLoop.on_stop``, where
+    :func:`cancel_managed_tasks` and :func:`shutdown_pools` are called.
+
+    .. code-block::
+
+        class MyApp(App):
+            def on_stop(self):
+                for task in shutdown(deadline=2.0):
+                    Logger.warning(f"MyApp: {task} was cancelled on exit")
+
+    :param deadline: Measured by ``Clock.time()``.
+    :param tick: The function that advances the clock by one frame. Defaults to ``Clock.tick``.
+
+    .. versionadded:: 0.11.0
+    '''
+    if tick is None:
+        tick = Clock.tick
+    _stop_request.fire()
+    try:
+        end = Clock.time() + deadline
+        while _managed_tasks and Clock.time() < end:
+            tick()
+        tasks = [t for t, __ in _managed_tasks.values()]
+        cancel_managed_tasks()
+        return tasks
+    finally:
+        # so that the app can be run again in the same process
+        _stop_request.clear()
+
+
 EventLoop.fbind("on_stop", cancel_managed_tasks)
@@ -0,0 +1,185 @@
+import os
+import sys
+import multiprocessing
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Executor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from kivy.base import EventLoop
+import asyncgui
+
+from ._threading import run_in_executor, _deliver, _wait_for_func_to_return
+
+# The name reserved for the process pool used by 'run_in_process()'.
+_PROCESS = 'process'
+
+# None means the default size of the executors, which is the number of the CPU cores for ProcessPoolExecutor.
+_pool_sizes: dict[str, int | None] = {'io': None, 'cpu': os.cpu_count() or 1, _PROCESS: None, }
+_pools: dict[str, Executor] = {}
+
+
+def configure_pool(name: str, *, max_workers: int | None=None):
+    '''
+    Sets the size of a pool used by :func:`run_in_pool`, or adds a new pool. Pools named ``'io'`` and ``'cpu'``
+    exist by default. The former has the default size of :class:`~concurrent.futures.ThreadPoolExecutor`, and the
+    latter has as many threads as the CPU cores. The name ``'process'`` refers to the process pool used by
+    :func:`run_in_process`.
+
+    .. code-block::
+
+        configure_pool('io', max_workers=16)
+        configure_pool('db', max_workers=1)
+
+    This must be called before the pool is used for the first time.
+
+    .. versionadded:: 0.11.0
+    '''
+    if name in _pools:
+        raise RuntimeError(f"The pool {name!r} has already been created.")
+    if max_workers is not None and max_workers < 1:
+        raise ValueError(f"'max_workers' must be a positive integer or None. (was {max_workers})")
+    _pool_sizes[name] = max_workers
+
+
+def _get_pool(name) -> Executor:
+    if (pool := _pools.get(name)) is None:
+        try:
+            max_workers = _pool_sizes[name]
+        except KeyError:
+            raise ValueError(f"Unknown pool: {name!r}. Add it with 'configure_pool()' first.") from None
+        if name == _PROCESS:
+            # 'fork', the default on Linux before Python 3.14, would copy a process that has a window, a GL context
+            # and several threads.
+            pool = ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context('spawn'))
+        else:
+            pool = ThreadPoolExecutor(max_workers, thread_name_prefix=f'asynckivy.{name}')
+        _pools[name] = pool
+    return pool
+
+
+async def run_in_pool(func, *, pool='io', cancel_token=False, wait_on_cancel=False):
+    '''
+    Runs a function within a thread pool managed by asynckivy, and waits for the completion of the function.
+
+    .. code-block::
+
+        return_value = await run_in_pool(func)
+        return_value = await run_in_pool(func, pool='cpu')
+
+    Unlike :func:`run_in_thread`, this doesn't create a thread per call, and unlike :func:`run_in_executor`, you don't
+    have to manage the lifetime of the executor. The pools are created the first time they are used, and are shut
+    down when an ``EventLoop.on_stop`` event fires.
+
+    The other parameters work the same as the ones of :func:`run_in_executor`.
+
+    .. versionadded:: 0.11.0
+    '''
+    if pool == _PROCESS:
+        raise ValueError(f"Use 'run_in_process()' to run a function in the {_PROCESS!r} pool.")
+    return await run_in_executor(_get_pool(pool), func, cancel_token=cancel_token, wait_on_cancel=wait_on_cancel)
+
+
+def _create_untracked_shared_memory(size) -> SharedMemory:
+    '''
+    (internal)
+    Creates a shared memory block that the resource tracker of the current process doesn't unlink when the process
+    exits, since the main process takes over the ownership, and unlinks it.
+    '''
+    if sys.version_info >= (3, 13):
+        return SharedMemory(create=True, size=size, track=False)
+    shm = SharedMemory(create=True, size=size)
+    if os.name == 'posix':
+        # The tracker knows the block by the name with the leading slash that 'SharedMemory.name' omits.
+        resource_tracker.unregister(f"/{shm.name}", 'shared_memory')
+    return shm
+
+
+def _call_and_share(func, args):
+    '''(internal) Runs in a worker process, and places the result in a newly created shared memory block.'''
+    data = memoryview(func(*args)).cast('B')
+    shm = _create_untracked_shared_memory(max(data.nbytes, 1))
+    try:
+        shm.buf[:data.nbytes] = data
+        return (shm.name, data.nbytes, )
+    finally:
+        shm.close()
+
+
+def _receive_shared(result) -> bytes:
+    name, size = result
+    shm = SharedMemory(name)
+    try:
+        return bytes(shm.buf[:size])
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _discard_shared(future):
+    if not future.cancelled() and future.exception() is None:
+        _receive_shared(future.result())
+
+
+async def run_in_process(func, *args, shared_memory=False, wait_on_cancel=False):
+    '''
+    Runs a function within a process pool managed by asynckivy, and waits for the completion of the function.
+    Use this for CPU-bound work implemented in pure Python, which would stall frames even if it runs in another
+    thread because of the GIL.
+
+    .. code-block::
+
+        thumbnail = await run_in_process(make_thumbnail, image_bytes, (128, 128))
+
+    The ``func``, the ``args`` and the return value must be picklable. The pool is created the first time it's used,
+    and is shut down when an ``EventLoop.on_stop`` event fires. Use :func:`configure_pool` with the name
+    ``'process'`` to change its size.
+
+    The worker processes are started with the ``'spawn'`` method on every platform, so they import the module that
+    defines the ``func`` from scratch. Keep the entry point of the app under ``if __name__ == '__main__':``.
+
+    :param shared_memory: If True, the ``func`` must return a :term:`bytes-like object`, which is passed back via
+        shared memory instead of being pickled and sent through a pipe. This pays off when the result is large.
+        The return value of this function is :class:`bytes` in that case.
+    :param wait_on_cancel: Works the same as the one of :func:`run_in_executor`.
+
+    Exceptions raised by the ``func`` propagate to the caller, and cancelling the caller Task cancels the ``func`` if
+    it hasn't started running yet, in the same way as :func:`run_in_executor`. There is no ``cancel_token``
+    parameter because a :class:`threading.Event` cannot be shared with another process.
+
+    .. versionadded:: 0.11.0
+    '''
+    ev = asyncgui.ExclusiveEvent()
+    pool = _get_pool(_PROCESS)
+    future = pool.submit(_call_and_share, func, args) if shared_memory else pool.submit(func, *args)
+    future.add_done_callback(partial(_deliver, ev.fire))
+    try:
+        await ev.wait()
+    except asyncgui.Cancelled:
+        if not future.cancel():
+            if wait_on_cancel:
+                await _wait_for_func_to_return(ev)
+            if shared_memory:
+                future.add_done_callback(_discard_shared)
+        raise
+    result = future.result()
+    return _receive_shared(result) if shared_memory else result
+
+
+def shutdown_pools(*__):
+    '''
+    Shuts down all the pools used by :func:`run_in_pool` and :func:`run_in_process`. The functions that haven't
+    started running yet are cancelled, and :exc:`concurrent.futures.CancelledError` is raised in their callers. The
+    pools will be re-created if they are used again.
+
+    Usually, you do not need to call this function directly, as it is automatically called when an
+    ``EventLoop.on_stop`` event fires.
+
+    .. versionadded:: 0.11.0
+    '''
+    pools = tuple(_pools.values())
+    _pools.clear()
+    for p in pools:
+        p.shutdown(wait=False, cancel_futures=True)
+
+
+EventLoop.fbind("on_stop", shutdown_pools)
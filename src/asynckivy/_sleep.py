@@ -4,6 +4,8 @@ import types
 from kivy.clock import Clock
 from asyncgui import _current_task, _sleep_forever, move_on_when, Task, Cancelled, ExclusiveEvent, _wait_args_0
 
+from . import _instrument
+
 
 @types.coroutine
 def sleep(duration):
@@ -15,7 +17,8 @@ def sleep(duration):
         dt = await sleep(5)  # wait for 5 seconds
     '''
     task = (yield _current_task)[0][0]
-    clock_event = Clock.create_trigger(task._step, duration, False, False)
+    step = _instrument.resumer(task)
+    clock_event = Clock.create_trigger(step, duration, False, False)
     clock_event()
 
     try:
@@ -35,7 +38,8 @@ def sleep_free(duration):
         dt = await sleep_free(5)  # wait for 5 seconds
     '''
     task = (yield _current_task)[0][0]
-    clock_event = Clock.create_trigger_free(task._step, duration, False, False)
+    step = _instrument.resumer(task)
+    clock_event = Clock.create_trigger_free(step, duration, False, False)
     clock_event()
 
     try:
@@ -99,7 +103,8 @@ class sleep_freq:
             return e.wait_args_0
         else:
             task = (yield _current_task)[0][0]
-            self._trigger = t = Clock.create_trigger(task._step, self._step, True, False)
+            step = _instrument.resumer(task)
+            self._trigger = t = Clock.create_trigger(step, self._step, True, False)
             t()
             return _wait_args_0
 
@@ -194,12 +199,13 @@ def n_frames(n: int):
         return
 
     task = (yield _current_task)[0][0]
+    step = _instrument.resumer(task)
 
     def callback(dt):
         nonlocal n
         n -= 1
         if not n:
-            task._step()
+            step()
             return False
 
     clock_event = Clock.schedule_interval(callback, 0)
@@ -0,0 +1,114 @@
+import heapq
+from collections.abc import Callable
+
+from asyncgui import Task, InvalidStateError, Cancelled
+
+from ._managed_start import managed_start
+
+
+class TaskLimiter:
+    '''
+    Starts tasks in a way that no more than a certain number of them run at the same time. The rest wait in a queue
+    until a running one ends.
+
+    .. code-block::
+
+        limiter = TaskLimiter(8)
+        for item in items:
+            limiter.start(animate_in, item)
+
+    The tasks are started with :func:`managed_start` by default. To start them in a nursery, pass its ``start``
+    method:
+
+    .. code-block::
+
+        async with open_nursery() as nursery:
+            limiter = TaskLimiter(8, start=nursery.start)
+            for row in rows:
+                limiter.start(prefetch, row)
+
+    When a running task is cancelled, the waiting ones are discarded, as a cancellation usually means the whole
+    fan-out is being torn down, e.g. by :func:`cancel_managed_tasks` or a closing nursery.
+
+    A waiting one is held as a tuple of the function and its arguments, and no coroutine is created until its turn
+    comes, so queueing thousands of them costs little memory.
+
+    :param max_concurrent: The maximum number of tasks running at the same time.
+    :param start: The function that starts a task. Defaults to :func:`managed_start`.
+
+    .. versionadded:: 0.11.0
+    '''
+    __slots__ = ('_max_concurrent', '_start', '_heap', '_seq', '_n_active', '_filling', )
+
+    def __init__(self, max_concurrent: int, *, start: Callable[..., Task]=managed_start):
+        if max_concurrent < 1:
+            raise ValueError(f"'max_concurrent' must be a positive integer. (was {max_concurrent})")
+        self._max_concurrent = max_concurrent
+        self._start = start
+        self._heap: list[tuple[int, int, Callable, tuple, dict]] = []
+        self._seq = 0
+        self._n_active = 0
+        self._filling = False
+
+    @property
+    def n_active(self) -> int:
+        '''The number of the tasks currently running.'''
+        return self._n_active
+
+    @property
+    def n_waiting(self) -> int:
+        '''The number of the tasks waiting for their turn.'''
+        return len(self._heap)
+
+    def start(self, async_func, /, *args, priority=0, **kwargs):
+        '''
+        Starts ``async_func(*args, **kwargs)`` as a task if the limit allows, otherwise queues it.
+
+        :param priority: Tasks with higher priority start first. Among the ones with the same priority, the one
+            queued earlier goes first. This parameter is not passed to the ``async_func``.
+        '''
+        self._seq = seq = self._seq + 1
+        heapq.heappush(self._heap, (-priority, seq, async_func, args, kwargs, ))
+        self._fill()
+
+    def clear(self):
+        '''Discards the tasks waiting for their turn. The running ones are not affected.'''
+        self._heap.clear()
+
+    async def _run(self, async_func, args, kwargs):
+        cancelled = False
+        try:
+            await async_func(*args, **kwargs)
+        except Cancelled:
+            cancelled = True
+            raise
+        finally:
+            self._n_active -= 1
+            if cancelled:
+                # Most likely, everything is being cancelled, e.g. by cancel_managed_tasks() or a nursery, so the
+                # waiting ones are dropped instead of being started only to be cancelled.
+                self._heap.clear()
+            else:
+                self._fill()
+
+    def _fill(self):
+        # A task that ends during its first step calls this recursively. Leaving it to the outermost call keeps the
+        # recursion from growing with the queue.
+        if self._filling:
+            return
+        self._filling = True
+        heap = self._heap
+        try:
+            while heap and self._n_active < self._max_concurrent:
+                __, __, async_func, args, kwargs = heapq.heappop(heap)
+                coro = self._run(async_func, args, kwargs)
+                self._n_active += 1
+                try:
+                    self._start(coro)
+                except InvalidStateError:
+                    # The nursery has been closed.
+                    self._n_active -= 1
+                    coro.close()
+                    heap.clear()
+        finally:
+            self._filling = False
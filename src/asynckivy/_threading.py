@@ -1,10 +1,76 @@
-from threading import Thread
-from concurrent.futures import ThreadPoolExecutor
+from threading import Thread, Lock, Event, Condition
+from queue import Queue, Empty
+from functools import partial
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, CancelledError
 from kivy.clock import Clock
 import asyncgui
 
+from . import _trace, _instrument
 
-def _wrapper(func, ev):
+
+class _CompletionQueue:
+    '''
+    (internal)
+    Delivers callbacks from worker threads to the main thread. Instead of scheduling a clock event per callback,
+    it schedules one when the queue becomes non-empty, and runs all the queued callbacks in it.
+    '''
+    __slots__ = ('_queue', '_lock', '_armed', 'max_per_frame', '__weakref__', )
+
+    def __init__(self):
+        self._queue = deque()
+        self._lock = Lock()
+        self._armed = False
+        self.max_per_frame: int | None = None
+
+    def put(self, func, *args):
+        '''Schedules ``func(*args)`` to be called on the main thread. Can be called from any thread.'''
+        self._queue.append((func, args, ))
+        with self._lock:
+            if self._armed:
+                return
+            self._armed = True
+        Clock.schedule_once(self._drain)
+
+    def _drain(self, dt):
+        q = self._queue
+        popleft = q.popleft
+        n = len(q)
+        if (cap := self.max_per_frame) is not None and cap < n:
+            n = cap
+        try:
+            for __ in range(n):
+                func, args = popleft()
+                func(*args)
+        finally:
+            with self._lock:
+                if q:
+                    # leftovers are processed in the next frame
+                    Clock.schedule_once(self._drain)
+                else:
+                    self._armed = False
+
+
+_completion_queue = _CompletionQueue()
+_deliver = _completion_queue.put
+
+
+def limit_completions_per_frame(n: int | None):
+    '''
+    Limits the number of thread completions processed in a single frame. The rest are carried over to the following
+    frames. This prevents a flood of completions, e.g. from hundreds of parallel downloads, from blowing the frame
+    budget. Pass None to lift the limit, which is the default.
+
+    The completions of :func:`run_in_thread` and :func:`run_in_executor` are subject to this limit.
+
+    .. versionadded:: 0.11.0
+    '''
+    if n is not None and n < 1:
+        raise ValueError(f"'n' must be a positive integer or None. (was {n})")
+    _completion_queue.max_per_frame = n
+
+
+def _wrapper(func, fire):
     ret = None
     exc = None
     try:
@@ -12,10 +78,20 @@ def _wrapper(func, ev):
     except Exception as e:
         exc = e
     finally:
-        Clock.schedule_once(lambda __: ev.fire(ret, exc))
+        _deliver(fire, ret, exc)
 
 
-async def run_in_thread(func, *, daemon=None):
+async def _wait_for_func_to_return(ev: asyncgui.ExclusiveEvent):
+    '''Waits for the ``func`` to return, ignoring cancellation requests.'''
+    task = await asyncgui.current_task()
+    task._cancel_disabled = True
+    try:
+        await ev.wait()
+    finally:
+        task._cancel_disabled = False
+
+
+async def run_in_thread(func, *, daemon=None, cancel_token=False, wait_on_cancel=False):
     '''
     Creates a new thread, runs a function within it, then waits for the completion of that function.
 
@@ -26,20 +102,57 @@ async def run_in_thread(func, *, daemon=None):
     See :ref:`io-in-asynckivy` for details.
 
     .. warning::
-        When the caller Task is cancelled, the ``func`` will be left running, which violates "structured concurrency".
+        When the caller Task is cancelled, the ``func`` will be left running, which violates "structured concurrency",
+        unless ``wait_on_cancel`` is True.
+
+    **Cooperative cancellation**
+
+    If ``cancel_token`` is True, a :class:`threading.Event` is passed to the ``func`` as its sole argument, and it
+    will be set when the caller Task is cancelled, so that the ``func`` can bail out early:
+
+    .. code-block::
+
+        def download(cancel_token):
+            with requests.get(url, stream=True) as r:
+                for chunk in r.iter_content(8192):
+                    if cancel_token.is_set():
+                        return
+                    ...
+
+        await run_in_thread(download, cancel_token=True)
+
+    If ``wait_on_cancel`` is True, the caller Task keeps waiting for the ``func`` to return even after being
+    cancelled, which restores "structured concurrency". Whatever the ``func`` returns or raises in that case is
+    discarded.
+
+    .. versionchanged:: 0.11.0
+        The ``cancel_token`` and ``wait_on_cancel`` parameters were added.
     '''
     ev = asyncgui.ExclusiveEvent()
+    fire = _instrument.resumer(await asyncgui.current_task(), ev.fire)
+    if cancel_token:
+        token = Event()
+        func = partial(func, token)
+    if (tracer := _trace.tracer) is not None:
+        func = tracer.wrap_job(func, 'run_in_thread')
     Thread(
         name='asynckivy.run_in_thread',
-        target=_wrapper, daemon=daemon, args=(func, ev, ),
+        target=_wrapper, daemon=daemon, args=(func, fire, ),
     ).start()
-    ret, exc = (await ev.wait())[0]
+    try:
+        ret, exc = (await ev.wait())[0]
+    except asyncgui.Cancelled:
+        if cancel_token:
+            token.set()
+        if wait_on_cancel:
+            await _wait_for_func_to_return(ev)
+        raise
     if exc is not None:
         raise exc
     return ret
 
 
-async def run_in_executor(executor: ThreadPoolExecutor, func):
+async def run_in_executor(executor: ThreadPoolExecutor, func, *, cancel_token=False, wait_on_cancel=False):
     '''
     Runs a function within a :class:`concurrent.futures.ThreadPoolExecutor`, and waits for the completion of the
     function.
@@ -54,16 +167,306 @@ async def run_in_executor(executor: ThreadPoolExecutor, func):
 
     .. warning::
         When the caller Task is cancelled, the ``func`` will be left running if it has already started,
-        which violates "structured concurrency".
+        which violates "structured concurrency", unless ``wait_on_cancel`` is True.
+
+    **Cooperative cancellation**
+
+    If ``cancel_token`` is True, a :class:`threading.Event` is passed to the ``func`` as its sole argument, and it
+    will be set when the caller Task is cancelled, so that the ``func`` can bail out early:
+
+    .. code-block::
+
+        def download(cancel_token):
+            with requests.get(url, stream=True) as r:
+                for chunk in r.iter_content(8192):
+                    if cancel_token.is_set():
+                        return
+                    ...
+
+        await run_in_executor(executor, download, cancel_token=True)
+
+    If ``wait_on_cancel`` is True, the caller Task keeps waiting for the ``func`` to return even after being
+    cancelled, which restores "structured concurrency". Whatever the ``func`` returns or raises in that case is
+    discarded.
+
+    If the ``func`` is cancelled before it starts running, for instance because the ``executor`` is shut down with
+    ``cancel_futures=True``, :exc:`concurrent.futures.CancelledError` is raised in the caller Task.
+
+    .. versionchanged:: 0.11.0
+        The ``cancel_token`` and ``wait_on_cancel`` parameters were added.
+    '''
+    return await _run_in_executor(executor, func, cancel_token, wait_on_cancel)
+
+
+def _deliver_on_done(on_done, future):
+    _deliver(on_done)
+
+
+def _deliver_if_cancelled(fire, future):
+    # '_wrapper' never runs for a future cancelled before it started, so the caller has to be woken up from here.
+    if future.cancelled():
+        _deliver(fire, None, CancelledError())
+
+
+async def _run_in_executor(executor, func, cancel_token, wait_on_cancel, on_done=None):
+    '''
+    (internal)
+    The body of :func:`run_in_executor`. If ``on_done`` is given, it's called on the main thread once the ``func``
+    has returned, or it's certain that the ``func`` will never run.
     '''
     ev = asyncgui.ExclusiveEvent()
-    future = executor.submit(_wrapper, func, ev)
+    fire = _instrument.resumer(await asyncgui.current_task(), ev.fire)
+    if cancel_token:
+        token = Event()
+        func = partial(func, token)
+    if (tracer := _trace.tracer) is not None:
+        func = tracer.wrap_job(func, 'run_in_executor')
+    try:
+        future = executor.submit(_wrapper, func, fire)
+    except BaseException:
+        if on_done is not None:
+            on_done()
+        raise
+    future.add_done_callback(partial(_deliver_if_cancelled, fire))
+    if on_done is not None:
+        future.add_done_callback(partial(_deliver_on_done, on_done))
     try:
         ret, exc = (await ev.wait())[0]
     except asyncgui.Cancelled:
-        future.cancel()
+        if not future.cancel():
+            if cancel_token:
+                token.set()
+            if wait_on_cancel:
+                await _wait_for_func_to_return(ev)
         raise
     assert future.done()
     if exc is not None:
         raise exc
     return ret
+
+
+async def wrap_future(future: Future):
+    '''
+    Waits for a :class:`concurrent.futures.Future` to complete, and returns its result.
+
+    .. code-block::
+
+        future = grpc_stub.GetFeature.future(point)
+        feature = await wrap_future(future)
+
+    Unlike ``await run_in_thread(future.result)``, this doesn't occupy a thread while waiting. The completion is
+    delivered to the main thread in the same way as :func:`run_in_executor`, exceptions propagate to the caller, and
+    cancelling the caller Task cancels the ``future``.
+
+    .. versionadded:: 0.11.0
+    '''
+    ev = asyncgui.ExclusiveEvent()
+    fire = _instrument.resumer(await asyncgui.current_task(), ev.fire)
+    future.add_done_callback(partial(_deliver, fire))
+    try:
+        await ev.wait()
+    except asyncgui.Cancelled:
+        future.cancel()
+        raise
+    return future.result()
+
+
+# kinds of the items that 'iter_in_thread' puts into the queue
+_ITEM, _END, _ERROR = range(3)
+
+
+class iter_in_thread:
+    '''
+    Runs a generator function within a new thread, and iterates over what it yields.
+
+    .. code-block::
+
+        def read_lines(path):
+            with open(path) as f:
+                yield from f
+
+        async with iter_in_thread(partial(read_lines, path), maxsize=100) as lines:
+            async for line in lines:
+                ...
+
+    The items flow through a queue that can hold up to ``maxsize`` items, and the generator blocks when the queue
+    is full, so the generator doesn't get too far ahead of the consumer.
+
+    When the with-block exits, the generator is closed the next time it yields, without waiting for it.
+    Exceptions raised by the generator propagate to the consumer.
+
+    .. versionadded:: 0.11.0
+    '''
+    __slots__ = ('_gen_func', '_maxsize', '_daemon', '_queue', '_stop', '_ev', '_notified', '_finished', )
+
+    def __init__(self, gen_func, *, maxsize=8, daemon=None):
+        if maxsize < 1:
+            raise ValueError(f"'maxsize' must be a positive integer. (was {maxsize})")
+        self._gen_func = gen_func
+        self._maxsize = maxsize
+        self._daemon = daemon
+
+    async def __aenter__(self):
+        self._queue = Queue(self._maxsize)
+        self._stop = Event()
+        self._ev = asyncgui.ExclusiveEvent()
+        self._notified = False
+        self._finished = False
+        Thread(name='asynckivy.iter_in_thread', target=self._produce, daemon=self._daemon).start()
+        return self
+
+    async def __aexit__(self, *args):
+        self._stop.set()
+        # unblocks the generator if it's waiting for the queue to have a free slot
+        q = self._queue
+        try:
+            while True:
+                q.get_nowait()
+        except Empty:
+            pass
+
+    def _produce(self):
+        put = self._put
+        is_stopped = self._stop.is_set
+        try:
+            gen = self._gen_func()
+            try:
+                for item in gen:
+                    put(_ITEM, item)
+                    if is_stopped():
+                        return
+            finally:
+                gen.close()
+        except Exception as e:
+            put(_ERROR, e)
+        else:
+            put(_END, None)
+
+    def _put(self, kind, value):
+        self._queue.put((kind, value, ))
+        # Wakes up the consumer only if it hasn't been woken up yet, so that a fast generator doesn't flood the
+        # main thread.
+        if not self._notified:
+            self._notified = True
+            _deliver(self._wake_up)
+
+    def _wake_up(self):
+        self._notified = False
+        self._ev.fire()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._finished:
+            raise StopAsyncIteration
+        get = self._queue.get_nowait
+        while True:
+            try:
+                kind, value = get()
+                break
+            except Empty:
+                await self._ev.wait()
+        if kind is _ITEM:
+            return value
+        self._finished = True
+        if kind is _ERROR:
+            raise value
+        raise StopAsyncIteration
+
+
+class ThreadChannel:
+    '''
+    A channel through which any number of threads send items to a task on the main thread.
+
+    .. code-block::
+
+        ch = ThreadChannel(maxsize=1000, policy='drop_oldest')
+
+        def read_sensor():  # runs in another thread
+            while True:
+                ch.send(sensor.read())
+
+        async def plot_readings():  # runs on the main thread
+            while True:
+                for reading in await ch.recv_batch():
+                    ...
+
+    Instead of waking up the receiver per item, the receiver is woken up at most once per frame, and receives all the
+    items that have arrived in the meantime at once. This keeps a high-rate producer, such as a 1 kHz sensor feed,
+    from flooding the main thread.
+
+    :param maxsize: The maximum number of items the channel can hold. 0 means unlimited.
+    :param policy: What :meth:`send` does when the channel is full. ``'block'`` blocks until there is room,
+        ``'drop_newest'`` discards the item being sent, and ``'drop_oldest'`` discards the oldest item in the
+        channel to make room.
+
+    .. versionadded:: 0.11.0
+    '''
+    __slots__ = ('_items', '_maxsize', '_policy', '_lock', '_not_full', '_notified', '_ev', )
+
+    _POLICIES = ('block', 'drop_newest', 'drop_oldest', )
+
+    def __init__(self, maxsize=0, *, policy='block'):
+        if policy not in self._POLICIES:
+            raise ValueError(f"'policy' must be one of {self._POLICIES}. (was {policy!r})")
+        if maxsize < 0:
+            raise ValueError(f"'maxsize' must be a non-negative integer. (was {maxsize})")
+        # 'drop_oldest' needs no lock because deque(maxlen=...) discards the oldest item by itself.
+        self._items = deque(maxlen=maxsize) if (policy == 'drop_oldest' and maxsize) else deque()
+        self._maxsize = maxsize if policy != 'drop_oldest' else 0
+        self._policy = policy
+        self._lock = lock = Lock()
+        self._not_full = Condition(lock)
+        self._notified = False
+        self._ev = asyncgui.ExclusiveEvent()
+
+    def __len__(self):
+        return len(self._items)
+
+    def send(self, item) -> bool:
+        '''
+        Sends an item. This can be called from any thread, but must not be called from the main thread if the
+        ``policy`` is ``'block'``, as it would block forever when the channel is full.
+
+        Returns False if the item was discarded.
+        '''
+        items = self._items
+        if maxsize := self._maxsize:
+            with self._lock:
+                if len(items) >= maxsize:
+                    if self._policy == 'drop_newest':
+                        return False
+                    wait = self._not_full.wait
+                    while len(items) >= maxsize:
+                        wait()
+                items.append(item)
+        else:
+            items.append(item)
+        if not self._notified:
+            self._notified = True
+            _deliver(self._wake_up)
+        return True
+
+    def _wake_up(self):
+        self._notified = False
+        self._ev.fire()
+
+    async def recv_batch(self, max_items: int=None) -> list:
+        '''
+        Receives the items that have arrived so far, oldest first. Waits if there are none.
+
+        :param max_items: The maximum number of items to receive. The rest are kept in the channel.
+        '''
+        items = self._items
+        while not items:
+            await self._ev.wait()
+        n = len(items)
+        if max_items is not None and max_items < n:
+            n = max_items
+        popleft = items.popleft
+        batch = [popleft() for __ in range(n)]
+        if self._maxsize and self._policy == 'block':
+            with self._lock:
+                self._not_full.notify_all()
+        return batch
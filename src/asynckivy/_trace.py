@@ -0,0 +1,2 @@
+# The object that records trace events, which is set while asynckivy.debug.start_tracing() is in effect.
+tracer = None
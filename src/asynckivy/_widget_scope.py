@@ -0,0 +1,127 @@
+from functools import partial
+
+from asyncgui import Task, TaskState
+
+from ._managed_start import managed_start
+
+
+class widget_scope:
+    '''
+    Ties the lifetime of tasks to the presence of a widget in a window.
+
+    .. code-block::
+
+        scope = widget_scope(widget)
+
+        # Cancelled when the widget is detached from the window.
+        scope.start(async_func(...))
+
+        # Started every time the widget is attached to a window, and cancelled every time it's detached.
+        # This suits widgets that are recycled, such as the ones in a RecycleView.
+        scope.start_on_attach(async_func, ...)
+
+    The widget counts as attached when the chain of its ``parent`` reaches a window. The scope watches the ``parent``
+    of every widget in the chain, so it notices not only the widget itself being removed, but also any of its
+    ancestors being removed.
+
+    The tasks are started with :func:`managed_start`, so they are also cancelled when the app stops.
+
+    .. versionadded:: 0.11.0
+    '''
+    __slots__ = ('_widget', '_chain', '_attached', '_tasks', '_factories', )
+
+    def __init__(self, widget):
+        self._widget = widget
+        self._chain: list[tuple[object, int]] = []
+        self._tasks: dict[int, Task] = {}
+        self._factories = []
+        self._attached = self._track()
+
+    @property
+    def attached(self) -> bool:
+        '''Whether the widget is currently in a window.'''
+        return self._attached
+
+    def start(self, aw, /) -> Task:
+        '''
+        Starts a task that will be cancelled when the widget is detached. It's started even if the widget is not
+        attached at the moment.
+        '''
+        if isinstance(aw, Task):
+            task = aw
+            if task._state is not TaskState.CREATED:
+                raise ValueError(f"{task} has already started")
+        else:
+            task = Task(aw)
+        tasks = self._tasks
+        on_end = task._on_end
+        task._on_end = partial(self._forget, tasks) if on_end is None else partial(self._forget_then, tasks, on_end)
+        tasks[id(task)] = task
+        return managed_start(task)
+
+    def start_on_attach(self, async_func, /, *args, **kwargs):
+        '''
+        Calls ``async_func(*args, **kwargs)`` and starts the resulting coroutine as a task every time the widget is
+        attached, including right now if it's already attached. The task is cancelled when the widget is detached.
+        '''
+        factory = partial(async_func, *args, **kwargs)
+        self._factories.append(factory)
+        if self._attached:
+            self.start(factory())
+
+    def close(self):
+        '''Cancels all the tasks, and stops watching the widget.'''
+        self._factories.clear()
+        self._unbind_chain()
+        self._cancel_tasks()
+
+    @staticmethod
+    def _forget(tasks, task):
+        tasks.pop(id(task), None)
+
+    @staticmethod
+    def _forget_then(tasks, on_end, task):
+        tasks.pop(id(task), None)
+        on_end(task)
+
+    def _cancel_tasks(self):
+        tasks = tuple(self._tasks.values())
+        self._tasks.clear()
+        for t in tasks:
+            t.cancel()
+
+    def _unbind_chain(self, start=0):
+        chain = self._chain
+        for obj, uid in chain[start:]:
+            obj.unbind_uid('parent', uid)
+        del chain[start:]
+
+    def _track(self) -> bool:
+        w = self._widget
+        self._chain.append((w, w.fbind('parent', self._on_parent), ))
+        return self._extend_chain(w)
+
+    def _extend_chain(self, obj) -> bool:
+        '''Binds the ``parent`` of the ancestors of ``obj``, and returns whether the chain reaches a window.'''
+        from kivy.core.window import WindowBase
+        chain = self._chain
+        on_parent = self._on_parent
+        while True:
+            if (obj := obj.parent) is None:
+                return False
+            if isinstance(obj, WindowBase):
+                return True
+            chain.append((obj, obj.fbind('parent', on_parent), ))
+
+    def _on_parent(self, obj, parent):
+        # Only the part of the chain above 'obj' is re-bound. The binding being dispatched is left untouched.
+        chain = self._chain
+        idx = next(i for i, (o, __) in enumerate(chain) if o is obj)
+        self._unbind_chain(idx + 1)
+        was_attached = self._attached
+        self._attached = attached = self._extend_chain(obj)
+        if was_attached and not attached:
+            self._cancel_tasks()
+        elif attached and not was_attached:
+            for factory in tuple(self._factories):
+                self.start(factory())
@@ -0,0 +1,854 @@
+__all__ = (
+    'TaskInfo', 'task_infos', 'dump_tasks', 'await_counts',
+    'name_task', 'TaskProfile', 'start_profiling', 'stop_profiling', 'profile_results', 'dump_profile',
+    'BindingInfo', 'start_tracking_bindings', 'stop_tracking_bindings', 'binding_infos', 'dump_bindings',
+    'SlowStep', 'start_detecting_slow_steps', 'stop_detecting_slow_steps',
+    'FrameRecord', 'FrameContribution', 'start_recording_frames', 'stop_recording_frames', 'frame_records',
+    'frame_drop_report', 'dump_frame_drop_report',
+    'start_tracing', 'stop_tracing', 'dump_trace',
+)
+
+import os
+import sys
+import json
+import threading
+import itertools
+import warnings
+from time import perf_counter
+from weakref import ref
+from functools import partial
+from typing import NamedTuple
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator, Callable
+
+from asyncgui import Task, TaskState
+from kivy.logger import Logger
+from kivy.clock import Clock
+
+from ._managed_start import _managed_tasks
+from . import _instrument, _bindings, _trace
+
+_LIBRARIES = ('asynckivy', 'asyncgui', )
+
+
+class TaskInfo(NamedTuple):
+    task: Task
+    age: float | None
+    '''Seconds since the task was started by :func:`asynckivy.managed_start`. None if it wasn't.'''
+    awaiting: str
+    '''
+    What the task is currently awaiting, e.g. ``'asynckivy.event'`` or ``'asynckivy.sleep'``. This is the outermost
+    function of asynckivy or asyncgui in the await chain, or the type of the innermost awaitable if there is none.
+    '''
+    target: object
+    '''The event dispatcher being waited on if ``awaiting`` is an event-related one, otherwise None.'''
+    event_name: str | None
+    '''The name of the event being waited on if ``awaiting`` is an event-related one, otherwise None.'''
+    stack: list[tuple[str, str, int]]
+    '''The ``(function name, filename, line number)`` of each coroutine in the await chain, outermost first.'''
+
+
+def _iter_await_chain(task: Task) -> Iterator[tuple[object, object]]:
+    '''Yields the awaitables in the await chain of a task along with their frames, outermost first.'''
+    obj = task.root_coro
+    first = True
+    while obj is not None:
+        frame = getattr(obj, 'cr_frame', None) or getattr(obj, 'gi_frame', None)
+        if frame is None:
+            yield obj, None
+            return
+        if first:
+            # skips the wrapper that asyncgui.Task puts around the awaitable
+            first = False
+        else:
+            yield obj, frame
+        obj = getattr(obj, 'cr_await', None) or getattr(obj, 'gi_yieldfrom', None)
+
+
+def _inspect(task: Task, stack: list | None) -> tuple[str, object]:
+    '''
+    Returns what the task is awaiting, and the frame of the function that represents it. Fills the ``stack`` if it's
+    not None, otherwise returns as soon as it finds the function.
+    '''
+    if task.state is not TaskState.STARTED:
+        return (f"<{task.state.name.lower()}>", None, )
+    awaiting = awaiting_frame = innermost = None
+    for obj, frame in _iter_await_chain(task):
+        innermost = obj
+        if frame is None:
+            break
+        code = frame.f_code
+        if awaiting is None:
+            root_module = frame.f_globals.get('__name__', '').partition('.')[0]
+            if root_module in _LIBRARIES:
+                awaiting = f"{root_module}.{code.co_name}"
+                awaiting_frame = frame
+                if stack is None:
+                    break
+        if stack is not None:
+            stack.append((code.co_name, code.co_filename, frame.f_lineno, ))
+    if awaiting is None:
+        awaiting = '<running>' if innermost is None else type(innermost).__name__
+    return (awaiting, awaiting_frame, )
+
+
+def _describe(task: Task, started_at: float | None, now: float) -> TaskInfo:
+    stack = []
+    awaiting, frame = _inspect(task, stack)
+    f_locals = {} if frame is None else frame.f_locals
+    return TaskInfo(
+        task, None if started_at is None else now - started_at, awaiting,
+        f_locals.get('event_dispatcher'), f_locals.get('event_name'), stack,
+    )
+
+
+def task_infos(tasks: Iterable[Task]=None) -> list[TaskInfo]:
+    '''
+    Inspects the tasks started by :func:`asynckivy.managed_start` that are still running, or the given ``tasks``.
+    '''
+    now = perf_counter()
+    if tasks is None:
+        pairs = tuple(_managed_tasks.values())
+    else:
+        started_at = {id(t): s for t, s in _managed_tasks.values()}
+        pairs = tuple((t, started_at.get(id(t))) for t in tasks)
+    return [_describe(t, s, now) for t, s in pairs]
+
+
+def _info_to_dict(info: TaskInfo) -> dict:
+    return {
+        'task': repr(info.task),
+        'age': info.age,
+        'awaiting': info.awaiting,
+        'target': None if info.target is None else repr(info.target),
+        'event_name': info.event_name,
+        'stack': [list(s) for s in info.stack],
+    }
+
+
+def _info_to_text(info: TaskInfo) -> str:
+    age = '?' if info.age is None else f"{info.age:.3f}s"
+    head = f"{info.task!r} (age {age}) awaiting {info.awaiting}"
+    if info.event_name is not None:
+        head += f" {info.target!r}.{info.event_name}"
+    return '\n'.join((head, *(f"    {name} ({filename}:{lineno})" for name, filename, lineno in info.stack)))
+
+
+def dump_tasks(tasks: Iterable[Task]=None, *, format='text') -> str:
+    '''
+    Describes what each task is doing, as human-readable text or JSON.
+
+    .. code-block::
+
+        from asynckivy import debug
+
+        print(debug.dump_tasks())
+
+    By default, this reports the tasks started by :func:`asynckivy.managed_start` that are still running. See
+    :class:`TaskInfo` for what's reported.
+
+    :param format: ``'text'`` or ``'json'``.
+    '''
+    infos = task_infos(tasks)
+    if format == 'text':
+        return '\n'.join(_info_to_text(i) for i in infos)
+    elif format == 'json':
+        return json.dumps([_info_to_dict(i) for i in infos])
+    raise ValueError(f"'format' must be either 'text' or 'json'. (was {format!r})")
+
+
+def await_counts(tasks: Iterable[Task]=None) -> Counter:
+    '''
+    Counts the tasks by what they are awaiting.
+
+    .. code-block::
+
+        >>> debug.await_counts()
+        Counter({'asynckivy.event': 120, 'asynckivy.sleep': 8, 'asynckivy.run_in_executor': 2})
+
+    Unlike :func:`task_infos`, this stops walking the await chain of each task as soon as it finds the await point,
+    so it's cheap enough to be called periodically.
+    '''
+    if tasks is None:
+        tasks = (t for t, __ in tuple(_managed_tasks.values()))
+    return Counter(_inspect(t, None)[0] for t in tasks)
+
+
+def name_task(task: Task, name: str):
+    '''
+    Gives a name to a task, which the profiler and the other tools in this module use to identify it. Tasks without
+    a name are identified by the qualified name of the awaitable they were started with.
+    '''
+    _instrument._names[task._root_coro] = name
+
+
+class TaskProfile(NamedTuple):
+    label: str
+    '''The name given via :func:`name_task`, or the qualified name of the awaitable the tasks were started with.'''
+    total_time: float
+    '''The total main-thread time, in seconds, the tasks with this label consumed.'''
+    n_runs: int
+    '''
+    How many times the tasks with this label were resumed, plus the number of the animation frames they drove.
+    '''
+    max_time: float
+    '''The longest single run in seconds.'''
+
+
+class _Profiler:
+    __slots__ = ('stats', )
+
+    def __init__(self):
+        # label -> [total_time, n_runs, max_time]
+        self.stats: dict[str, list] = {}
+
+    def on_run(self, task, label, source, start, own_time):
+        if (s := self.stats.get(label)) is None:
+            self.stats[label] = [own_time, 1, own_time]
+            return
+        s[0] += own_time
+        s[1] += 1
+        if s[2] < own_time:
+            s[2] = own_time
+
+
+_profiler: _Profiler = None
+
+
+def start_profiling():
+    '''
+    Starts measuring how much main-thread time each task consumes. The time a task spends from when it's resumed until
+    it suspends again is attributed to it, excluding the time other tasks resumed during that spent. The per-frame
+    updates of :func:`asynckivy.anim_attrs` are attributed to the task that awaits it, and the ones of
+    :class:`asynckivy.smooth_attr` to the label ``'asynckivy.smooth_attr'``.
+
+    .. code-block::
+
+        from asynckivy import debug
+
+        debug.start_profiling()
+        ...
+        print(debug.dump_profile())
+        debug.stop_profiling()
+
+    Only the waits on the primitives of asynckivy that begin after this is called are measured. The ones on the
+    primitives of asyncgui, such as :class:`asyncgui.Event`, are not. The results are accumulated until
+    :func:`stop_profiling` is called, and calling this again while profiling clears them.
+    '''
+    global _profiler
+    if _profiler is not None:
+        _profiler.stats.clear()
+        return
+    _profiler = _Profiler()
+    _instrument.add_hook(_profiler)
+
+
+def stop_profiling() -> list[TaskProfile]:
+    '''Stops profiling, and returns the final results in the same form as :func:`profile_results`.'''
+    global _profiler
+    if _profiler is None:
+        return []
+    results = profile_results()
+    _instrument.remove_hook(_profiler)
+    _profiler = None
+    return results
+
+
+def profile_results() -> list[TaskProfile]:
+    '''Returns the results so far, the most time-consuming first.'''
+    if _profiler is None:
+        return []
+    results = [TaskProfile(label, *s) for label, s in _profiler.stats.items()]
+    results.sort(key=lambda r: r.total_time, reverse=True)
+    return results
+
+
+def dump_profile(*, format='text') -> str:
+    '''
+    Formats the results of :func:`profile_results` as a human-readable table or JSON.
+
+    :param format: ``'text'`` or ``'json'``.
+    '''
+    results = profile_results()
+    if format == 'text':
+        lines = [f"{'total(ms)':>10} {'runs':>8} {'max(ms)':>9}  label", ]
+        lines.extend(
+            f"{r.total_time * 1000.:10.3f} {r.n_runs:8d} {r.max_time * 1000.:9.3f}  {r.label}" for r in results
+        )
+        return '\n'.join(lines)
+    elif format == 'json':
+        return json.dumps([r._asdict() for r in results])
+    raise ValueError(f"'format' must be either 'text' or 'json'. (was {format!r})")
+
+
+class BindingInfo(NamedTuple):
+    dispatcher: object
+    event_name: str
+    age: float
+    '''Seconds since the binding was created.'''
+    stack: list[tuple[str, str, int]]
+    '''
+    The ``(function name, filename, line number)`` of each frame in the call stack at the time the binding was
+    created, outermost first.
+    '''
+
+
+class _BindingTracker:
+    __slots__ = ('records', 'warn_threshold', )
+
+    def __init__(self, warn_threshold):
+        # id(dispatcher) -> (weak reference to the dispatcher, {event_name: {uid: (created_at, stack)}})
+        self.records: dict[int, tuple[ref, dict[str, dict[int, tuple]]]] = {}
+        self.warn_threshold = warn_threshold
+
+    def on_bind(self, dispatcher, event_name, uid):
+        key = id(dispatcher)
+        if (record := self.records.get(key)) is None:
+            try:
+                # The record goes away with the dispatcher, along with the bindings it holds.
+                dispatcher_ref = ref(dispatcher, partial(self._forget, self.records, key))
+            except TypeError:
+                return
+            record = self.records[key] = (dispatcher_ref, {})
+        bindings = record[1].setdefault(event_name, {})
+        # skips this method and '_bindings.fbind()'
+        frame = sys._getframe(2)
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_name, code.co_filename, frame.f_lineno, ))
+            frame = frame.f_back
+        stack.reverse()
+        bindings[uid] = (perf_counter(), stack, )
+        if len(bindings) == self.warn_threshold + 1:
+            warnings.warn(
+                f"{len(bindings)} callbacks have been bound to {dispatcher!r}.{event_name} by asynckivy. "
+                "They may be leaking. Use asynckivy.debug.dump_bindings() to see where they were created.",
+                stacklevel=4,
+            )
+
+    def on_unbind(self, dispatcher, event_name, uid):
+        if (record := self.records.get(id(dispatcher))) is None:
+            return
+        per_event = record[1]
+        if (bindings := per_event.get(event_name)) is None:
+            return
+        bindings.pop(uid, None)
+        if not bindings:
+            del per_event[event_name]
+
+    @staticmethod
+    def _forget(records, key, __):
+        records.pop(key, None)
+
+
+def start_tracking_bindings(*, warn_threshold=100):
+    '''
+    Starts tracking the bindings the following APIs create, so that the ones that are never removed can be found.
+
+    * :func:`asynckivy.event`
+    * :class:`asynckivy.event_freq`
+    * :class:`asynckivy.suppress_event`
+    * :class:`asynckivy.sync_attr`
+    * :class:`asynckivy.sync_attrs`
+    * :class:`asynckivy.smooth_attr`
+
+    .. code-block::
+
+        from asynckivy import debug
+
+        debug.start_tracking_bindings()
+        ...
+        print(debug.dump_bindings())
+
+    Each binding is recorded with the call stack at the time it was created, which costs a bit on every binding, but
+    nothing on every dispatch.
+
+    :param warn_threshold: A :class:`UserWarning` is issued when more than this number of tracked bindings are on a
+        single event or property at the same time.
+
+    Only the bindings created after this is called are tracked. Calling this again while tracking only changes the
+    ``warn_threshold``.
+    '''
+    if _bindings.tracker is not None:
+        _bindings.tracker.warn_threshold = warn_threshold
+        return
+    _bindings.tracker = _BindingTracker(warn_threshold)
+
+
+def stop_tracking_bindings():
+    '''Stops tracking the bindings, and discards the records.'''
+    _bindings.tracker = None
+
+
+def binding_infos() -> list[BindingInfo]:
+    '''Returns the tracked bindings that are still in place, the oldest first.'''
+    if (tracker := _bindings.tracker) is None:
+        return []
+    now = perf_counter()
+    infos = [
+        BindingInfo(dispatcher, event_name, now - created_at, stack)
+        for dispatcher_ref, per_event in tuple(tracker.records.values())
+        if (dispatcher := dispatcher_ref()) is not None
+        for event_name, bindings in per_event.items()
+        for created_at, stack in bindings.values()
+    ]
+    infos.sort(key=lambda i: i.age, reverse=True)
+    return infos
+
+
+def dump_bindings(*, format='text') -> str:
+    '''
+    Describes the tracked bindings that are still in place, grouped by the dispatcher and the event name, as
+    human-readable text or JSON. The bindings created from the same call stack are reported together, so a leak shows
+    up as a single entry with a large count.
+
+    :param format: ``'text'`` or ``'json'``.
+    '''
+    # (id(dispatcher), event_name) -> [dispatcher, event_name, oldest_age, {stack: count}]
+    groups: dict[tuple, list] = {}
+    for info in binding_infos():
+        key = (id(info.dispatcher), info.event_name, )
+        if (g := groups.get(key)) is None:
+            g = groups[key] = [info.dispatcher, info.event_name, info.age, {}]
+        stacks = g[3]
+        stack = tuple(info.stack)
+        stacks[stack] = stacks.get(stack, 0) + 1
+    groups = sorted(groups.values(), key=lambda g: sum(g[3].values()), reverse=True)
+    if format == 'text':
+        lines = []
+        for dispatcher, event_name, oldest_age, stacks in groups:
+            lines.append(f"{dispatcher!r}.{event_name}: {sum(stacks.values())} binding(s), oldest {oldest_age:.3f}s")
+            for stack, count in sorted(stacks.items(), key=lambda item: item[1], reverse=True):
+                lines.append(f"  {count} created at:")
+                lines.extend(f"    {name} ({filename}:{lineno})" for name, filename, lineno in stack)
+        return '\n'.join(lines)
+    elif format == 'json':
+        return json.dumps([
+            {
+                'dispatcher': repr(dispatcher),
+                'event_name': event_name,
+                'count': sum(stacks.values()),
+                'oldest_age': oldest_age,
+                'stacks': [{'count': count, 'stack': [list(s) for s in stack]} for stack, count in stacks.items()],
+            }
+            for dispatcher, event_name, oldest_age, stacks in groups
+        ])
+    raise ValueError(f"'format' must be either 'text' or 'json'. (was {format!r})")
+
+
+class SlowStep(NamedTuple):
+    task: Task | None
+    '''None for a frame of :class:`asynckivy.smooth_attr`.'''
+    label: str
+    '''The name given via :func:`name_task`, or the qualified name of the awaitable the task was started with.'''
+    duration: float
+    '''
+    The main-thread time, in seconds, the task consumed until it suspended again, excluding the time the tasks it
+    resumed consumed.
+    '''
+    source: str
+    '''
+    ``'step'`` for a resumption of the task, ``'anim_attrs'`` for a frame of :func:`asynckivy.anim_attrs`, and
+    ``'smooth_attr'`` for a frame of :class:`asynckivy.smooth_attr`.
+    '''
+    awaiting: str
+    '''What the task was awaiting when it was resumed. See :attr:`TaskInfo.awaiting`.'''
+    target: object
+    '''The event dispatcher the task was waiting on if ``awaiting`` is an event-related one, otherwise None.'''
+    event_name: str | None
+    '''The name of the event the task was waiting on if ``awaiting`` is an event-related one, otherwise None.'''
+    stack: list[tuple[str, str, int]]
+    '''The coroutine stack of the task at the moment it was resumed, in the same form as :attr:`TaskInfo.stack`.'''
+
+
+def _log_slow_step(s: SlowStep):
+    where = s.awaiting if s.event_name is None else f"{s.awaiting} {s.target!r}.{s.event_name}"
+    lines = [f"asynckivy: {s.label} took {s.duration * 1000.:.1f}ms after being resumed from {where} ({s.source})", ]
+    lines.extend(f"    {name} ({filename}:{lineno})" for name, filename, lineno in s.stack)
+    Logger.warning('\n'.join(lines))
+
+
+class _SlowStepDetector:
+    __slots__ = ('threshold', 'callback', '_pending', )
+
+    def __init__(self, threshold, callback):
+        self.threshold = threshold
+        self.callback = callback
+        # The (awaiting, target, event_name, stack) of the runs in progress, innermost last.
+        self._pending: list[tuple] = []
+
+    def before_run(self, task, source):
+        if task is None:
+            self._pending.append((f"asynckivy.{source}", None, None, [], ))
+            return
+        stack = []
+        awaiting, frame = _inspect(task, stack)
+        f_locals = {} if frame is None else frame.f_locals
+        self._pending.append((awaiting, f_locals.get('event_dispatcher'), f_locals.get('event_name'), stack, ))
+
+    def on_run(self, task, label, source, start, own_time):
+        if not self._pending:
+            # The detector was started in the middle of this run.
+            return
+        cause = self._pending.pop()
+        if own_time > self.threshold:
+            self.callback(SlowStep(task, label, own_time, source, *cause))
+
+
+_slow_step_detector: _SlowStepDetector = None
+
+
+def start_detecting_slow_steps(threshold=.1, *, callback: Callable[[SlowStep], None]=None):
+    '''
+    Starts watching for tasks that block the main thread for too long after being resumed, like the
+    ``slow_callback_duration`` of the asyncio debug mode.
+
+    .. code-block::
+
+        from asynckivy import debug
+
+        debug.start_detecting_slow_steps(threshold=.03)
+
+    Each time a task consumes more than ``threshold`` seconds from when it's resumed until it suspends again, a
+    :class:`SlowStep` that describes what the task was awaiting, and where, is passed to the ``callback``. By default,
+    it's logged as a warning. The time is measured in the same way :func:`start_profiling` does, so the per-frame
+    updates of :func:`asynckivy.anim_attrs` are checked as well.
+
+    The await chain of a task is inspected every time it's resumed, which costs a few microseconds per resumption.
+    Only the waits on the primitives of asynckivy that begin after this is called are watched.
+    Calling this again while detecting only changes the settings.
+    '''
+    global _slow_step_detector
+    if callback is None:
+        callback = _log_slow_step
+    if _slow_step_detector is not None:
+        _slow_step_detector.threshold = threshold
+        _slow_step_detector.callback = callback
+        return
+    _slow_step_detector = _SlowStepDetector(threshold, callback)
+    _instrument.add_hook(_slow_step_detector)
+
+
+def stop_detecting_slow_steps():
+    global _slow_step_detector
+    if _slow_step_detector is None:
+        return
+    _instrument.remove_hook(_slow_step_detector)
+    _slow_step_detector = None
+
+
+class FrameRecord(NamedTuple):
+    start: float
+    '''The ``time.perf_counter()`` at the beginning of the frame.'''
+    duration: float
+    '''Seconds from the beginning of the frame to the beginning of the next one.'''
+    runs: list[tuple[str, str, float]]
+    '''
+    The ``(label, cause, own_time)`` of each timed run in the frame, in the order they ended. ``label`` is the same
+    as :attr:`TaskProfile.label`, ``cause`` is what resumed the task, such as ``'asynckivy.sleep'``,
+    ``'asynckivy.event'``, ``'asynckivy.run_in_thread'``, ``'asynckivy.anim_attrs'`` or ``'asynckivy.smooth_attr'``,
+    and ``own_time`` is in seconds.
+    '''
+
+
+class FrameContribution(NamedTuple):
+    label: str
+    cause: str
+    total_time: float
+    '''The total time, in seconds, the runs with this label and cause took in the frames over budget.'''
+    n_frames: int
+    '''The number of the frames over budget the runs with this label and cause appeared in.'''
+    max_time: float
+    '''The longest single run in seconds.'''
+
+
+def _cause_of(task: Task | None, source: str) -> str:
+    '''Describes what started a timed run in a way cheap enough to be done before every run.'''
+    if source == 'step':
+        return _inspect(task, None)[0]
+    return f"asynckivy.{source}"
+
+
+class _FrameRecorder:
+    __slots__ = ('records', '_runs', '_frame_start', '_pending', '_clock_event', '__weakref__', )
+
+    def __init__(self, n_frames):
+        self.records: deque[FrameRecord] = deque(maxlen=n_frames)
+        self._runs = []
+        # None until the first frame begins. The runs before that are not recorded.
+        self._frame_start = None
+        # The cause of the runs in progress, innermost last.
+        self._pending = []
+        self._clock_event = Clock.schedule_interval(self._on_frame, 0)
+
+    def close(self):
+        self._clock_event.cancel()
+
+    def _on_frame(self, dt):
+        now = perf_counter()
+        if (start := self._frame_start) is not None:
+            self.records.append(FrameRecord(start, now - start, self._runs))
+        self._frame_start = now
+        self._runs = []
+
+    def before_run(self, task, source):
+        self._pending.append(_cause_of(task, source))
+
+    def on_run(self, task, label, source, start, own_time):
+        if not self._pending:
+            # The recorder was started in the middle of this run.
+            return
+        self._runs.append((label, self._pending.pop(), own_time, ))
+
+
+_frame_recorder: _FrameRecorder = None
+
+
+def start_recording_frames(*, n_frames=600):
+    '''
+    Starts recording, for each frame, how long it took and the time each task consumed in it, so that the cause of
+    dropped frames can be found.
+
+    .. code-block::
+
+        from asynckivy import debug
+
+        debug.start_recording_frames()
+        ...
+        print(debug.dump_frame_drop_report(budget=1 / 60))
+
+    The time is measured in the same way :func:`start_profiling` does, and each run is tagged with what resumed the
+    task, which takes a short walk of the task's await chain every time it's resumed.
+
+    :param n_frames: How many of the most recent frames are kept.
+
+    Calling this again while recording discards the records and starts over.
+    '''
+    global _frame_recorder
+    if _frame_recorder is not None:
+        stop_recording_frames()
+    _frame_recorder = _FrameRecorder(n_frames)
+    _instrument.add_hook(_frame_recorder)
+
+
+def stop_recording_frames():
+    '''Stops recording, and discards the records.'''
+    global _frame_recorder
+    if _frame_recorder is None:
+        return
+    _frame_recorder.close()
+    _instrument.remove_hook(_frame_recorder)
+    _frame_recorder = None
+
+
+def frame_records() -> list[FrameRecord]:
+    '''Returns the recorded frames, the oldest first.'''
+    if _frame_recorder is None:
+        return []
+    return list(_frame_recorder.records)
+
+
+def frame_drop_report(budget=1 / 60) -> list[FrameContribution]:
+    '''
+    Sums up the runs in the recorded frames that took longer than ``budget`` seconds, grouped by the label and the
+    cause, the largest first.
+    '''
+    # (label, cause) -> [total_time, n_frames, max_time]
+    stats: dict[tuple[str, str], list] = {}
+    for record in frame_records():
+        if record.duration <= budget:
+            continue
+        seen = set()
+        for label, cause, own_time in record.runs:
+            key = (label, cause, )
+            if (s := stats.get(key)) is None:
+                s = stats[key] = [0., 0, 0.]
+            s[0] += own_time
+            if key not in seen:
+                seen.add(key)
+                s[1] += 1
+            if s[2] < own_time:
+                s[2] = own_time
+    results = [FrameContribution(*key, *s) for key, s in stats.items()]
+    results.sort(key=lambda r: r.total_time, reverse=True)
+    return results
+
+
+def dump_frame_drop_report(budget=1 / 60, *, format='text') -> str:
+    '''
+    Formats the result of :func:`frame_drop_report` as a human-readable table or JSON.
+
+    :param format: ``'text'`` or ``'json'``.
+    '''
+    results = frame_drop_report(budget)
+    if format == 'text':
+        records = frame_records()
+        n_over = sum(1 for r in records if r.duration > budget)
+        lines = [
+            f"{n_over} of {len(records)} frames took longer than {budget * 1000.:.1f}ms",
+            f"{'total(ms)':>10} {'frames':>7} {'max(ms)':>9}  label (cause)",
+        ]
+        lines.extend(
+            f"{r.total_time * 1000.:10.3f} {r.n_frames:7d} {r.max_time * 1000.:9.3f}  {r.label} ({r.cause})"
+            for r in results
+        )
+        return '\n'.join(lines)
+    elif format == 'json':
+        return json.dumps([r._asdict() for r in results])
+    raise ValueError(f"'format' must be either 'text' or 'json'. (was {format!r})")
+
+
+class _Tracer:
+    '''
+    Records trace events into a ring buffer. Each event is a tuple of
+    ``(ph, name, cat, ts, dur, tid, id, args)``, where the time is in seconds.
+    '''
+    __slots__ = ('events', '_pending', '_open_tasks', '_ids', '_main_tid', '_thread_names', '_clock_event',
+                 '__weakref__', )
+
+    def __init__(self, max_events):
+        self.events: deque[tuple] = deque(maxlen=max_events)
+        # The cause of the runs in progress, innermost last.
+        self._pending = []
+        # The tasks whose beginning has been recorded but whose end has not, and their labels, keyed by their ids.
+        self._open_tasks: dict[int, tuple[Task, str]] = {}
+        self._ids = itertools.count(1)
+        self._main_tid = threading.get_ident()
+        self._thread_names = {self._main_tid: threading.current_thread().name}
+        self._clock_event = Clock.schedule_interval(self._on_frame, 0)
+
+    def close(self):
+        self._clock_event.cancel()
+
+    def _on_frame(self, dt):
+        now = perf_counter()
+        append = self.events.append
+        tid = self._main_tid
+        append(('i', 'frame', 'frame', now, None, tid, None, None, ))
+        # The tasks cancelled while suspended end without running, so their end is picked up here.
+        open_tasks = self._open_tasks
+        for key, (task, label) in tuple(open_tasks.items()):
+            if task.state is not TaskState.STARTED:
+                del open_tasks[key]
+                append(('e', label, 'task', now, None, tid, f"task-{key}", {'state': task.state.name}, ))
+
+    def before_run(self, task, source):
+        self._pending.append(_cause_of(task, source))
+
+    def on_run(self, task, label, source, start, own_time):
+        if not self._pending:
+            # The tracer was started in the middle of this run.
+            return
+        cause = self._pending.pop()
+        append = self.events.append
+        tid = self._main_tid
+        end = perf_counter()
+        if task is not None and (key := id(task)) not in self._open_tasks:
+            self._open_tasks[key] = (task, label, )
+            append(('b', label, 'task', start, None, tid, f"task-{key}", None, ))
+        append(('X', label, source, start, end - start, tid, None, {'cause': cause}, ))
+        if task is not None and task.state is not TaskState.STARTED:
+            del self._open_tasks[key]
+            append(('e', label, 'task', end, None, tid, f"task-{key}", {'state': task.state.name}, ))
+
+    def begin(self, cat, name, args=None) -> str:
+        '''Records the beginning of an asynchronous span, and returns its id.'''
+        span_id = f"{cat}-{next(self._ids)}"
+        self.events.append(('b', name, cat, perf_counter(), None, threading.get_ident(), span_id, args, ))
+        return span_id
+
+    def end(self, cat, name, span_id):
+        self.events.append(('e', name, cat, perf_counter(), None, threading.get_ident(), span_id, None, ))
+
+    def wrap_job(self, func, name):
+        '''
+        Records the submission of a function to a thread, and returns a function that records its start and
+        completion when called in that thread.
+        '''
+        return partial(self._run_job, func, name, self.begin('thread', name))
+
+    def _run_job(self, func, name, span_id):
+        tid = threading.get_ident()
+        self._thread_names[tid] = threading.current_thread().name
+        start = perf_counter()
+        try:
+            return func()
+        finally:
+            end = perf_counter()
+            append = self.events.append
+            append(('X', name, 'thread', start, end - start, tid, None, {'span': span_id}, ))
+            append(('e', name, 'thread', end, None, tid, span_id, None, ))
+
+    def to_json(self) -> dict:
+        pid = os.getpid()
+        trace_events = [
+            {'ph': 'M', 'name': 'thread_name', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in tuple(self._thread_names.items())
+        ]
+        for ph, name, cat, ts, dur, tid, span_id, args in tuple(self.events):
+            e = {'ph': ph, 'name': name, 'cat': cat, 'ts': ts * 1e6, 'pid': pid, 'tid': tid, }
+            if dur is not None:
+                e['dur'] = dur * 1e6
+            if span_id is not None:
+                e['id'] = span_id
+            if args is not None:
+                e['args'] = args
+            if ph == 'i':
+                e['s'] = 'g'
+            trace_events.append(e)
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms', }
+
+
+def start_tracing(*, max_events=100_000):
+    '''
+    Starts recording what happens in the main thread and the worker threads as trace events, which can be viewed with
+    ``chrome://tracing`` or `Perfetto <https://ui.perfetto.dev>`__.
+
+    .. code-block::
+
+        from asynckivy import debug
+
+        debug.start_tracing()
+        ...
+        with open('trace.json', 'w') as f:
+            f.write(debug.dump_trace())
+
+    The following are recorded:
+
+    * The lifetime of each task, as an asynchronous span.
+    * Each run of a task, measured in the same way :func:`start_profiling` does, along with what resumed it.
+    * Each run of :func:`asynckivy.anim_attrs` as an asynchronous span, and each frame of it.
+    * The functions passed to :func:`asynckivy.run_in_thread` and :func:`asynckivy.run_in_executor`, as
+      asynchronous spans from when they are submitted until they complete, and as the time they actually run in the
+      worker threads.
+    * The beginning of each frame.
+
+    A task's lifetime is recorded from the first time it runs after this is called, and if the task is cancelled while
+    suspended, its end is recorded at the beginning of the next frame. Only the waits on the primitives of asynckivy
+    that begin after this is called are recorded.
+
+    :param max_events: The maximum number of events kept. When it's exceeded, the oldest ones are discarded.
+
+    Calling this again while tracing discards the events and starts over.
+    '''
+    if _trace.tracer is not None:
+        stop_tracing()
+    _trace.tracer = tracer = _Tracer(max_events)
+    _instrument.add_hook(tracer)
+
+
+def stop_tracing():
+    '''Stops tracing, and discards the events.'''
+    if (tracer := _trace.tracer) is None:
+        return
+    _trace.tracer = None
+    tracer.close()
+    _instrument.remove_hook(tracer)
+
+
+def dump_trace() -> str:
+    '''Returns the recorded events in the Chrome trace event format.'''
+    if (tracer := _trace.tracer) is None:
+        return json.dumps({'traceEvents': [], 'displayTimeUnit': 'ms', })
+    return json.dumps(tracer.to_json())
@@ -0,0 +1,98 @@
+__all__ = (
+    'Filter', 'same_touch', 'collides', 'grabbed', 'ungrabbed', 'mouse_scrolling', 'predicate',
+)
+
+from functools import lru_cache
+
+
+class Filter:
+    '''
+    A filter made of primitives combined with ``&``, ``|`` and ``~``.
+    In the descriptions of the primitives below, ``w`` and ``t`` stand for the first and second arguments passed to
+    the event handlers, which are the widget and the touch in the case of touch events.
+    '''
+    __slots__ = ('_template', '_consts', '_compiled', )
+
+    def __init__(self, template: str, consts: tuple=(), /):
+        self._template = template
+        self._consts = consts
+        self._compiled = None
+
+    def _shifted_template(self, n):
+        return self._template.format(*[f"{{{i + n}}}" for i in range(len(self._consts))])
+
+    def __and__(self, other: 'Filter') -> 'Filter':
+        return Filter(
+            f"({self._template}) and ({other._shifted_template(len(self._consts))})",
+            self._consts + other._consts,
+        )
+
+    def __or__(self, other: 'Filter') -> 'Filter':
+        return Filter(
+            f"({self._template}) or ({other._shifted_template(len(self._consts))})",
+            self._consts + other._consts,
+        )
+
+    def __invert__(self) -> 'Filter':
+        return Filter(f"not ({self._template})", self._consts)
+
+    @property
+    def compiled(self):
+        '''The plain function this filter compiles into.'''
+        if (f := self._compiled) is None:
+            self._compiled = f = _compile(self._template, len(self._consts))(*self._consts)
+        return f
+
+    def __call__(self, *args, **kwargs):
+        return self.compiled(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<Filter {self._template.format(*[repr(c) for c in self._consts])}>"
+
+
+@lru_cache(maxsize=256)
+def _compile(template: str, n_consts: int):
+    '''Compiles a template into a factory that binds the constants to a new filter function.'''
+    names = [f"_c{i}" for i in range(n_consts)]
+    source = (
+        f"def factory({', '.join(names)}):\n"
+        f"    def filter(w, *args, **kwargs):\n"
+        f"        return {template.format(*names)}\n"
+        f"    return filter\n"
+    )
+    namespace = {}
+    exec(source, namespace)
+    return namespace['factory']
+
+
+def _as_callable(filter):
+    '''(internal) Unwraps a :class:`Filter` so that the dispatcher calls the compiled function directly.'''
+    return filter.compiled if isinstance(filter, Filter) else filter
+
+
+def same_touch(touch) -> Filter:
+    '''``t is touch``'''
+    return Filter("args[0] is {0}", (touch, ))
+
+
+@lru_cache(maxsize=None)
+def collides(attr='pos') -> Filter:
+    '''``w.collide_point(*t.<attr>)``'''
+    if not attr.isidentifier():
+        raise ValueError(f"Invalid attribute name: {attr!r}")
+    return Filter(f"w.collide_point(*args[0].{attr})")
+
+
+grabbed = Filter("args[0].grab_current is w")
+'''``t.grab_current is w``'''
+
+ungrabbed = Filter("args[0].grab_current is None")
+'''``t.grab_current is None``'''
+
+mouse_scrolling = Filter("args[0].is_mouse_scrolling")
+'''``t.is_mouse_scrolling``'''
+
+
+def predicate(func) -> Filter:
+    '''Wraps an arbitrary function so that it can be combined with the other filters.'''
+    return Filter("{0}(w, *args, **kwargs)", (func, ))
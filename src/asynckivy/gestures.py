@@ -0,0 +1,363 @@
+__all__ = (
+    'tap', 'double_tap', 'long_press', 'swipe', 'fling', 'pinch', 'Pinch',
+)
+
+import types
+import math
+from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator, Callable
+
+from kivy.metrics import dp
+from kivy.clock import Clock
+from kivy.input.motionevent import MotionEvent
+from asyncgui import move_on_when, _current_task, _sleep_forever
+
+from ._sleep import move_on_after
+from ._event import event, event_freq, rest_of_touch_events
+from . import _instrument
+
+
+class _TouchDownHub:
+    '''
+    (internal)
+    Shares a single ``on_touch_down`` binding among all the recognizers waiting on the same widget.
+    '''
+    __slots__ = ('_widget', '_bind_uid', '_waiting_steps', '_n_waiting', '_next_key', '_dispatching', )
+
+    def __init__(self, widget):
+        self._widget = widget
+        # Keyed by a serial number, so that the waiters that go away remove their entries instead of leaving holes.
+        self._waiting_steps: dict[int, Callable] = {}
+        self._n_waiting = 0
+        self._next_key = 0
+        self._dispatching = False
+        self._bind_uid = widget.fbind('on_touch_down', self._on_touch_down)
+
+    def _on_touch_down(self, w, t):
+        if t.is_mouse_scrolling or not w.collide_point(*t.opos):
+            return
+        steps = self._waiting_steps
+        self._waiting_steps = {}
+        self._dispatching = True
+        try:
+            # Some of the waiters may go away during the dispatch.
+            for key in tuple(steps):
+                if (step := steps.get(key)) is not None:
+                    step(t)
+        finally:
+            self._dispatching = False
+            # The binding is kept alive during the dispatch so that recognizers that start waiting again
+            # right away don't re-bind.
+            if not self._n_waiting:
+                self._close()
+
+    @types.coroutine
+    def wait(self):
+        task = (yield _current_task)[0][0]
+        steps = self._waiting_steps
+        self._next_key = key = self._next_key + 1
+        steps[key] = _instrument.resumer(task)
+        self._n_waiting += 1
+        try:
+            return (yield _sleep_forever)[0][0]
+        finally:
+            del steps[key]
+            self._n_waiting -= 1
+            if not (self._n_waiting or self._dispatching):
+                self._close()
+
+    def _close(self):
+        w = self._widget
+        w.unbind_uid('on_touch_down', self._bind_uid)
+        del _hubs[id(w)]
+
+
+_hubs: dict[int, _TouchDownHub] = {}
+
+
+def _touch_down(widget):
+    '''Waits for a non-scrolling touch to go down inside the widget.'''
+    if (hub := _hubs.get(id(widget))) is None:
+        _hubs[id(widget)] = hub = _TouchDownHub(widget)
+    return hub.wait()
+
+
+class _VelocityTracker:
+    '''
+    (internal)
+    Estimates the velocity of a touch from its most recent positions, which are kept in a fixed-size ring buffer.
+    '''
+    __slots__ = ('_times', '_xs', '_ys', '_idx', '_len', '_capacity', '_window', )
+
+    def __init__(self, capacity=8, window=.1):
+        self._times = [0.] * capacity
+        self._xs = [0.] * capacity
+        self._ys = [0.] * capacity
+        self._idx = 0
+        self._len = 0
+        self._capacity = capacity
+        self._window = window
+
+    def add(self, time, x, y):
+        i = self._idx
+        self._times[i] = time
+        self._xs[i] = x
+        self._ys[i] = y
+        self._idx = (i + 1) % self._capacity
+        if self._len < self._capacity:
+            self._len += 1
+
+    def velocity(self) -> tuple[float, float]:
+        n = self._len
+        if n < 2:
+            return (0., 0., )
+        cap = self._capacity
+        times = self._times
+        newest = (self._idx - 1) % cap
+        t_newest = times[newest]
+        oldest = newest
+        for __ in range(n - 1):
+            i = (oldest - 1) % cap
+            if t_newest - times[i] > self._window:
+                break
+            oldest = i
+        dt = t_newest - times[oldest]
+        if dt <= 0.:
+            return (0., 0., )
+        return (
+            (self._xs[newest] - self._xs[oldest]) / dt,
+            (self._ys[newest] - self._ys[oldest]) / dt,
+        )
+
+
+async def tap(widget, *, max_duration=.3, max_distance=dp(10)) -> MotionEvent:
+    '''
+    Waits for the widget to be tapped, and returns the touch.
+
+    .. code-block::
+
+        touch = await tap(widget)
+
+    A touch counts as a tap if it's released within ``max_duration`` seconds without moving farther than
+    ``max_distance`` from where it went down.
+
+    .. versionadded:: 0.11.0
+    '''
+    while True:
+        touch = await _touch_down(widget)
+        if await _is_tap(widget, touch, max_duration, max_distance):
+            return touch
+
+
+async def _is_tap(widget, touch, max_duration, max_distance) -> bool:
+    '''Follows a touch that has just gone down, and returns whether it turned out to be a tap.'''
+    ox, oy = touch.opos
+    async with move_on_after(max_duration):
+        async for __ in rest_of_touch_events(widget, touch):
+            x, y = touch.pos
+            if math.hypot(x - ox, y - oy) > max_distance:
+                return False
+        return True
+    return False
+
+
+async def double_tap(widget, *, max_interval=.3, max_duration=.3, max_distance=dp(10)) -> MotionEvent:
+    '''
+    Waits for the widget to be tapped twice in quick succession, and returns the second touch.
+
+    .. code-block::
+
+        touch = await double_tap(widget)
+
+    :param max_interval: The maximum time allowed between the end of the first tap and the second touch going down.
+
+    .. versionadded:: 0.11.0
+    '''
+    first = None
+    while True:
+        if first is None:
+            first = await tap(widget, max_duration=max_duration, max_distance=max_distance)
+        async with move_on_after(max_interval) as timeout_tracker:
+            second = await _touch_down(widget)
+        if timeout_tracker.finished:
+            first = None
+            continue
+        if not await _is_tap(widget, second, max_duration, max_distance):
+            first = None
+            continue
+        ox, oy = first.opos
+        x, y = second.opos
+        if math.hypot(x - ox, y - oy) <= max_distance:
+            return second
+        first = second
+
+
+async def long_press(widget, *, duration=.5, max_distance=dp(10)) -> MotionEvent:
+    '''
+    Waits for the widget to be pressed and held for ``duration`` seconds, and returns the touch.
+    Unlike the other recognizers, this one returns while the touch is still down.
+
+    .. code-block::
+
+        touch = await long_press(widget)
+        async for __ in rest_of_touch_events(widget, touch):
+            ...
+
+    .. versionadded:: 0.11.0
+    '''
+    while True:
+        touch = await _touch_down(widget)
+        ox, oy = touch.opos
+        async with move_on_after(duration) as timeout_tracker:
+            async for __ in rest_of_touch_events(widget, touch):
+                x, y = touch.pos
+                if math.hypot(x - ox, y - oy) > max_distance:
+                    break
+        if timeout_tracker.finished:
+            return touch
+
+
+def _direction_of(dx, dy):
+    if abs(dx) >= abs(dy):
+        return 'right' if dx > 0 else 'left'
+    return 'up' if dy > 0 else 'down'
+
+
+async def swipe(widget, *, min_distance=dp(50), max_duration=.5) -> tuple[MotionEvent, str]:
+    '''
+    Waits for a swipe gesture on the widget, and returns the touch and the direction of the swipe,
+    which is one of ``'left'``, ``'right'``, ``'up'`` and ``'down'``.
+
+    .. code-block::
+
+        touch, direction = await swipe(widget)
+
+    .. versionadded:: 0.11.0
+    '''
+    while True:
+        touch = await _touch_down(widget)
+        async with move_on_after(max_duration) as timeout_tracker:
+            async for __ in rest_of_touch_events(widget, touch):
+                pass
+        if timeout_tracker.finished:
+            continue
+        dx = touch.x - touch.ox
+        dy = touch.y - touch.oy
+        if math.hypot(dx, dy) >= min_distance:
+            return touch, _direction_of(dx, dy)
+
+
+async def fling(widget, *, min_velocity=dp(500), velocity_window=.1) -> tuple[MotionEvent, float, float]:
+    '''
+    Waits for a fling gesture on the widget, a touch released while moving faster than ``min_velocity``
+    pixels per second, and returns the touch and its velocity at the time of release.
+
+    .. code-block::
+
+        touch, vx, vy = await fling(widget)
+
+    :param velocity_window: The velocity is estimated from the positions of the touch within this many seconds
+        before the release.
+
+    .. versionadded:: 0.11.0
+    '''
+    get_time = Clock.time
+    while True:
+        touch = await _touch_down(widget)
+        tracker = _VelocityTracker(window=velocity_window)
+        tracker.add(get_time(), *touch.pos)
+        async for __ in rest_of_touch_events(widget, touch):
+            tracker.add(get_time(), *touch.pos)
+        tracker.add(get_time(), *touch.pos)
+        vx, vy = tracker.velocity()
+        if math.hypot(vx, vy) >= min_velocity:
+            return touch, vx, vy
+
+
+class Pinch:
+    '''
+    The object bound in the as-clause of :func:`pinch`.
+    The ``scale``, ``angle`` and ``center`` are calculated from the current positions of the two touches each time
+    they are accessed.
+    '''
+    __slots__ = ('touches', '_initial_distance', '_initial_angle', '_on_touch_move', )
+
+    def __init__(self, t1: MotionEvent, t2: MotionEvent, on_touch_move):
+        self.touches = (t1, t2, )
+        # The current positions, not the 'opos', because the first touch may have moved before the second one landed.
+        self._initial_distance = max(math.hypot(t2.x - t1.x, t2.y - t1.y), 1.)
+        self._initial_angle = math.atan2(t2.y - t1.y, t2.x - t1.x)
+        self._on_touch_move = on_touch_move
+
+    @property
+    def scale(self) -> float:
+        '''The current distance between the touches divided by the initial one.'''
+        t1, t2 = self.touches
+        return math.hypot(t2.x - t1.x, t2.y - t1.y) / self._initial_distance
+
+    @property
+    def angle(self) -> float:
+        '''How much the line connecting the touches has rotated, in degrees, counterclockwise.'''
+        t1, t2 = self.touches
+        return math.degrees(math.atan2(t2.y - t1.y, t2.x - t1.x) - self._initial_angle)
+
+    @property
+    def center(self) -> tuple[float, float]:
+        '''The midpoint of the touches.'''
+        t1, t2 = self.touches
+        return ((t1.x + t2.x) / 2., (t1.y + t2.y) / 2., )
+
+    def changed(self):
+        '''Waits for either of the touches to move.'''
+        return self._on_touch_move()
+
+
+async def _second_touch(widget, first):
+    '''Waits for another touch while the ``first`` one is down. Returns None if the ``first`` one is released.'''
+    second = None
+    first.grab(widget)
+    try:
+        async with move_on_when(event(widget, 'on_touch_up', filter=lambda w, t: t is first and t.grab_current is w,
+                                      stop_dispatching=True)):
+            second = await _touch_down(widget)
+            second.grab(widget)
+    finally:
+        if second is None:
+            first.ungrab(widget)
+    return second
+
+
+@asynccontextmanager
+async def pinch(widget) -> AsyncIterator[Pinch]:
+    '''
+    Waits for two touches to go down inside the widget, and returns an async context manager that tracks them.
+    The with-block is cancelled as soon as either touch is released.
+
+    .. code-block::
+
+        async with pinch(widget) as p:
+            while True:
+                await p.changed()
+                print(p.scale, p.angle, p.center)
+
+    .. versionadded:: 0.11.0
+    '''
+    while True:
+        first = await _touch_down(widget)
+        if (second := await _second_touch(widget, first)) is not None:
+            break
+    touches = (first, second, )
+
+    def is_one_of_them(w, t):
+        return (t is first or t is second) and t.grab_current is w
+
+    try:
+        async with (
+            move_on_when(event(widget, 'on_touch_up', filter=is_one_of_them, stop_dispatching=True)),
+            event_freq(widget, 'on_touch_move', filter=is_one_of_them, stop_dispatching=True,
+                       free_to_await=True) as on_touch_move,
+        ):
+            yield Pinch(*touches, on_touch_move)
+    finally:
+        for t in touches:
+            t.ungrab(widget)
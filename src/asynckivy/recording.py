@@ -0,0 +1,330 @@
+__all__ = (
+    'Recorder', 'replay', 'iter_records', 'Record',
+)
+
+import struct
+from typing import NamedTuple, Any
+from collections.abc import Iterator, Mapping
+from functools import partial
+
+from kivy.clock import Clock
+from kivy.input.motionevent import MotionEvent
+from kivy.properties import ObjectProperty, DictProperty
+
+from ._sleep import sleep
+
+_MAGIC = b'AKREC\x01'
+
+# record kinds
+_TOUCH_DOWN, _TOUCH_MOVE, _TOUCH_UP, _KEY_DOWN, _KEY_UP, _PROPERTY, _LABEL = range(7)
+_TOUCH_KINDS = {'on_touch_down': _TOUCH_DOWN, 'on_touch_move': _TOUCH_MOVE, 'on_touch_up': _TOUCH_UP, }
+_KIND_NAMES = ('touch_down', 'touch_move', 'touch_up', 'key_down', 'key_up', 'property', 'label', )
+
+_HEAD = struct.Struct('<Bd')  # kind, time
+_TOUCH = struct.Struct('<Hff')  # touch id, sx, sy
+_KEY = struct.Struct('<iiB')  # keycode, scancode, modifiers
+_U8 = struct.Struct('<B')
+_U16 = struct.Struct('<H')
+_F64 = struct.Struct('<d')
+
+_MODIFIERS = ('shift', 'ctrl', 'alt', 'meta', 'capslock', 'numlock', )
+
+# value tags
+_NONE, _FALSE, _TRUE, _NUMBER, _STRING, _NUMBERS, _UNSUPPORTED = range(7)
+_UNSUPPORTED_VALUE = object()
+
+
+class Record(NamedTuple):
+    time: float
+    '''Seconds since the recording started.'''
+    kind: str
+    '''One of ``'touch_down'``, ``'touch_move'``, ``'touch_up'``, ``'key_down'``, ``'key_up'`` and ``'property'``.'''
+    args: tuple
+    '''
+    * ``(touch_id, sx, sy)`` for touch events.
+    * ``(keycode, scancode, codepoint, modifiers)`` for key events.
+    * ``(label, attr_name, value)`` for property changes.
+    '''
+
+
+def _pack_str(buf: bytearray, s: str):
+    b = s.encode()
+    buf += _U16.pack(len(b))
+    buf += b
+
+
+def _pack_value(buf: bytearray, value):
+    if value is None:
+        buf.append(_NONE)
+    elif value is True or value is False:
+        buf.append(_TRUE if value else _FALSE)
+    elif isinstance(value, (int, float)):
+        buf.append(_NUMBER)
+        buf += _F64.pack(value)
+    elif isinstance(value, str):
+        buf.append(_STRING)
+        _pack_str(buf, value)
+    else:
+        try:
+            values = tuple(value)
+            n = _U16.pack(len(values))
+            packed = struct.pack(f'<{len(values)}d', *values)
+        except (TypeError, struct.error):
+            # Raising here would break the property dispatch of the app being recorded.
+            buf.append(_UNSUPPORTED)
+            return
+        buf.append(_NUMBERS)
+        buf += n
+        buf += packed
+
+
+class Recorder:
+    '''
+    Records the touch events and key events that a window receives, and the changes of the properties being watched,
+    into a compact binary format that can be replayed by :func:`replay`.
+
+    .. code-block::
+
+        from kivy.core.window import Window
+        from asynckivy import recording
+
+        with recording.Recorder(Window) as rec:
+            rec.watch(slider, 'value', label='volume')
+            ...
+        with open('session.akrec', 'wb') as f:
+            f.write(rec.getvalue())
+
+    Touch positions are stored normalized by the window size, so a recording can be replayed on a window of a
+    different size.
+    '''
+    __slots__ = (
+        '_window', '_buf', '_start_time', '_touch_ids', '_next_touch_id', '_labels', '_unbind_funcs', '_get_time',
+    )
+
+    def __init__(self, window, *, touches=True, keys=True):
+        self._window = window
+        self._buf = bytearray(_MAGIC)
+        self._touch_ids: dict[Any, int] = {}
+        self._next_touch_id = 0
+        self._labels: dict[tuple[int, str], int] = {}
+        self._unbind_funcs = []
+        self._get_time = Clock.time
+        self._start_time = None
+        if touches:
+            for name, kind in _TOUCH_KINDS.items():
+                self._bind(window, name, partial(self._on_touch, kind))
+        if keys:
+            self._bind(window, 'on_key_down', partial(self._on_key, _KEY_DOWN))
+            self._bind(window, 'on_key_up', partial(self._on_key, _KEY_UP))
+
+    def _bind(self, obj, name, callback):
+        uid = obj.fbind(name, callback)
+        self._unbind_funcs.append(partial(obj.unbind_uid, name, uid))
+
+    def __enter__(self):
+        self._start_time = self._get_time()
+        return self
+
+    def __exit__(self, *__):
+        self.stop()
+
+    def stop(self):
+        '''Stops recording. This is automatically called when the with-block exits.'''
+        for f in self._unbind_funcs:
+            f()
+        self._unbind_funcs.clear()
+
+    def watch(self, obj, name, *, label: str=None):
+        '''
+        Records the changes of a property. The ``label`` identifies the object when replaying.
+        Defaults to ``name``.
+
+        The values that can be recorded are None, bools, numbers, strings and sequences of numbers. Watching an
+        :class:`~kivy.properties.ObjectProperty` or a :class:`~kivy.properties.DictProperty` raises
+        :exc:`ValueError`, and the changes to any other value, such as a list of strings, are left out of the
+        recording.
+        '''
+        if isinstance(obj.property(name, quiet=True), (ObjectProperty, DictProperty)):
+            raise ValueError(f"The values of {type(obj).__name__}.{name} cannot be recorded.")
+        key = (id(obj), name, )
+        if key in self._labels:
+            return
+        self._labels[key] = label_id = len(self._labels)
+        buf = self._buf
+        buf += _HEAD.pack(_LABEL, self._elapsed())
+        buf += _U16.pack(label_id)
+        _pack_str(buf, name if label is None else label)
+        _pack_str(buf, name)
+        self._bind(obj, name, partial(self._on_property, label_id))
+
+    def getvalue(self) -> bytes:
+        '''Returns what has been recorded so far.'''
+        return bytes(self._buf)
+
+    def _elapsed(self):
+        if (st := self._start_time) is None:
+            self._start_time = st = self._get_time()
+        return self._get_time() - st
+
+    def _on_touch(self, kind, window, touch):
+        ids = self._touch_ids
+        if (touch_id := ids.get(touch.uid)) is None:
+            ids[touch.uid] = touch_id = self._next_touch_id
+            self._next_touch_id = (touch_id + 1) & 0xFFFF
+        buf = self._buf
+        buf += _HEAD.pack(kind, self._elapsed())
+        buf += _TOUCH.pack(touch_id, touch.sx, touch.sy)
+        if kind == _TOUCH_UP:
+            del ids[touch.uid]
+
+    def _on_key(self, kind, window, keycode, scancode=None, codepoint=None, modifiers=(), *__):
+        buf = self._buf
+        buf += _HEAD.pack(kind, self._elapsed())
+        mods = sum(1 << i for i, m in enumerate(_MODIFIERS) if m in modifiers)
+        buf += _KEY.pack(keycode, scancode or 0, mods)
+        _pack_str(buf, codepoint or '')
+
+    def _on_property(self, label_id, obj, value):
+        buf = self._buf
+        buf += _HEAD.pack(_PROPERTY, self._elapsed())
+        buf += _U16.pack(label_id)
+        _pack_value(buf, value)
+
+
+class _Reader:
+    __slots__ = ('_view', '_pos', )
+
+    def __init__(self, data):
+        self._view = memoryview(data)
+        self._pos = 0
+
+    def unpack(self, s: struct.Struct):
+        r = s.unpack_from(self._view, self._pos)
+        self._pos += s.size
+        return r
+
+    def str(self):
+        n = self.unpack(_U16)[0]
+        p = self._pos
+        self._pos = p + n
+        return str(self._view[p:p + n], 'utf-8')
+
+    def value(self):
+        tag = self.unpack(_U8)[0]
+        if tag == _NONE:
+            return None
+        elif tag == _FALSE:
+            return False
+        elif tag == _TRUE:
+            return True
+        elif tag == _NUMBER:
+            return self.unpack(_F64)[0]
+        elif tag == _STRING:
+            return self.str()
+        elif tag == _NUMBERS:
+            n = self.unpack(_U16)[0]
+            return list(self.unpack(struct.Struct(f'<{n}d')))
+        elif tag == _UNSUPPORTED:
+            return _UNSUPPORTED_VALUE
+        raise ValueError(f"Unknown value tag: {tag}")
+
+    @property
+    def at_end(self):
+        return self._pos >= len(self._view)
+
+
+def iter_records(data: bytes) -> Iterator[Record]:
+    '''
+    Decodes a recording.
+
+    .. code-block::
+
+        for record in iter_records(data):
+            print(record.time, record.kind, record.args)
+    '''
+    if bytes(data[:len(_MAGIC)]) != _MAGIC:
+        raise ValueError("Not a recording made by asynckivy.recording.Recorder")
+    r = _Reader(data)
+    r._pos = len(_MAGIC)
+    labels = {}
+    while not r.at_end:
+        kind, time = r.unpack(_HEAD)
+        if kind <= _TOUCH_UP:
+            yield Record(time, _KIND_NAMES[kind], r.unpack(_TOUCH))
+        elif kind <= _KEY_UP:
+            keycode, scancode, mods = r.unpack(_KEY)
+            modifiers = [m for i, m in enumerate(_MODIFIERS) if mods & (1 << i)]
+            yield Record(time, _KIND_NAMES[kind], (keycode, scancode, r.str(), modifiers, ))
+        elif kind == _PROPERTY:
+            label_id = r.unpack(_U16)[0]
+            if (value := r.value()) is not _UNSUPPORTED_VALUE:
+                yield Record(time, 'property', (*labels[label_id], value, ))
+        elif kind == _LABEL:
+            label_id = r.unpack(_U16)[0]
+            labels[label_id] = (r.str(), r.str(), )
+        else:
+            raise ValueError(f"Unknown record kind: {kind}")
+
+
+class _ReplayedTouch(MotionEvent):
+    def __init__(self, touch_id, sx, sy):
+        super().__init__('asynckivy.recording', touch_id, (sx, sy, ), is_touch=True, type_id='touch')
+        self.profile = ['pos']
+
+    def depack(self, args):
+        self.sx, self.sy = args
+        super().depack(args)
+
+
+async def replay(data: bytes, window, *, targets: Mapping[str, Any]=None, speed=1.0):
+    '''
+    Replays a recording made by :class:`Recorder`, with the same timing as it was recorded.
+
+    .. code-block::
+
+        await replay(data, Window, targets={'volume': slider})
+
+    Touches are fed into :class:`kivy.base.EventLoop`, which dispatches them to the window it manages, in the same
+    way as the ones from real input devices. Key events are dispatched to the ``window``.
+
+    :param targets: Maps the labels given to :meth:`Recorder.watch` to the objects whose properties are replayed.
+        Property changes of labels not in this are skipped.
+    :param speed: The playback speed. ``2.0`` replays twice as fast.
+
+    Since the timing is driven by :func:`asynckivy.sleep`, replays are deterministic under a virtual clock.
+    '''
+    from kivy.base import EventLoop
+    get_time = Clock.time
+    start = get_time()
+    targets = {} if targets is None else targets
+    touches = {}
+    try:
+        for time, kind, args in iter_records(data):
+            if (remaining := time / speed - (get_time() - start)) > 0.:
+                await sleep(remaining)
+            if kind == 'touch_down':
+                touch_id, sx, sy = args
+                touches[touch_id] = t = _ReplayedTouch(touch_id, sx, sy)
+                EventLoop.post_dispatch_input('begin', t)
+            elif kind == 'touch_move':
+                touch_id, sx, sy = args
+                t = touches[touch_id]
+                t.move((sx, sy, ))
+                EventLoop.post_dispatch_input('update', t)
+            elif kind == 'touch_up':
+                touch_id, sx, sy = args
+                t = touches.pop(touch_id)
+                t.move((sx, sy, ))
+                EventLoop.post_dispatch_input('end', t)
+            elif kind == 'key_down':
+                if not window.dispatch('on_key_down', *args):
+                    window.dispatch('on_keyboard', *args)
+            elif kind == 'key_up':
+                window.dispatch('on_key_up', args[0], args[1])
+            else:
+                label, attr_name, value = args
+                if (obj := targets.get(label)) is not None:
+                    setattr(obj, attr_name, value)
+    finally:
+        for t in touches.values():
+            EventLoop.post_dispatch_input('end', t)
@@ -41,6 +41,13 @@ def kivy_runner():
             elif hasattr(post_proc, "last_touches"):
                 post_proc.last_touches.clear()
 
+    def reset_completion_queue():
+        # Completions delivered after a test ends are scheduled on the Clock of that test, which is discarded.
+        from asynckivy._threading import _completion_queue as q
+        with q._lock:
+            q._queue.clear()
+            q._armed = False
+
     from os import environ
 
     environ["KIVY_USE_DEFAULTCONFIG"] = "1"
@@ -70,6 +77,7 @@ def kivy_runner():
 
     yield runner
     clock.stop_clock()
+    reset_completion_queue()
     if EventLoop.status == "started":
         clear_window_and_event_loop()
         stopTouchApp()
@@ -0,0 +1,59 @@
+import pytest
+import threading
+
+
+@pytest.fixture()
+def cq():
+    from asynckivy._threading import _CompletionQueue
+    return _CompletionQueue()
+
+
+def test_batched_into_a_single_clock_event(kivy_runner, cq):
+    results = []
+    threads = [threading.Thread(target=cq.put, args=(results.append, i)) for i in range(100)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == []
+    assert len(kivy_runner.clock.get_events()) == 1
+    kivy_runner.advance_a_frame()
+    assert sorted(results) == list(range(100))
+    assert not kivy_runner.clock.get_events()
+
+
+def test_max_per_frame(kivy_runner, cq):
+    results = []
+    cq.max_per_frame = 3
+    for i in range(7):
+        cq.put(results.append, i)
+    kivy_runner.advance_a_frame()
+    assert results == [0, 1, 2]
+    kivy_runner.advance_a_frame()
+    assert results == [0, 1, 2, 3, 4, 5]
+    kivy_runner.advance_a_frame()
+    assert results == list(range(7))
+    cq.put(results.append, 7)
+    kivy_runner.advance_a_frame()
+    assert results == list(range(8))
+
+
+def test_rearm_after_draining(kivy_runner, cq):
+    results = []
+    cq.put(results.append, 0)
+    kivy_runner.advance_a_frame()
+    cq.put(results.append, 1)
+    kivy_runner.advance_a_frame()
+    assert results == [0, 1]
+
+
+def test_limit_completions_per_frame():
+    import asynckivy as ak
+    from asynckivy._threading import _completion_queue
+
+    with pytest.raises(ValueError):
+        ak.limit_completions_per_frame(0)
+    ak.limit_completions_per_frame(10)
+    assert _completion_queue.max_per_frame == 10
+    ak.limit_completions_per_frame(None)
+    assert _completion_queue.max_per_frame is None
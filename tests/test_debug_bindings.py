@@ -0,0 +1,116 @@
+import pytest
+import json
+import re
+import types
+
+
+@pytest.fixture(autouse=True)
+def stop_tracking_bindings():
+    from asynckivy import debug
+    yield
+    debug.stop_tracking_bindings()
+
+
+def test_nothing_is_tracked_by_default(kivy_runner):
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    from asynckivy import debug
+    ak.sync_attr((Widget(), 'x'), (types.SimpleNamespace(), 'x'))
+    assert debug.binding_infos() == []
+
+
+def test_outstanding_bindings(kivy_runner):
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    from asynckivy import debug
+    w = Widget()
+    obj = types.SimpleNamespace()
+    debug.start_tracking_bindings()
+    ak.sync_attr((w, 'x'), (obj, 'x'))
+    with ak.sync_attrs((w, 'y'), (obj, 'y')), ak.suppress_event(w, 'on_touch_down'):
+        infos = debug.binding_infos()
+        assert sorted(i.event_name for i in infos) == ['on_touch_down', 'x', 'y']
+        assert all(i.dispatcher is w for i in infos)
+        assert infos[0].event_name == 'x'
+    infos = debug.binding_infos()
+    assert [i.event_name for i in infos] == ['x']
+    assert infos[0].age >= 0
+    assert [name for name, __, __ in infos[0].stack[-2:]] == ['test_outstanding_bindings', '__init__']
+
+
+def test_bindings_made_by_tasks(kivy_runner):
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    from asynckivy import debug
+    w = Widget()
+
+    async def async_fn():
+        await ak.event(w, 'x')
+        async with ak.event_freq(w, 'y') as y_changed:
+            await y_changed()
+
+    debug.start_tracking_bindings()
+    task = ak.start(async_fn())
+    assert [i.event_name for i in debug.binding_infos()] == ['x']
+    assert 'async_fn' in (name for name, __, __ in debug.binding_infos()[0].stack)
+    w.x = 10
+    assert [i.event_name for i in debug.binding_infos()] == ['y']
+    w.y = 10
+    assert task.finished
+    assert debug.binding_infos() == []
+
+
+def test_smooth_attr(kivy_runner):
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    from asynckivy import debug
+    w = Widget()
+    debug.start_tracking_bindings()
+    with ak.smooth_attr((w, 'x'), (types.SimpleNamespace(x=0), 'x')):
+        assert [i.event_name for i in debug.binding_infos()] == ['x']
+    assert debug.binding_infos() == []
+
+
+def test_records_go_away_with_the_dispatcher(kivy_runner):
+    import gc
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    from asynckivy import debug
+    debug.start_tracking_bindings()
+    ak.sync_attr((Widget(), 'x'), (types.SimpleNamespace(), 'x'))
+    gc.collect()
+    assert debug.binding_infos() == []
+
+
+def test_warn_threshold(kivy_runner):
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    from asynckivy import debug
+    w = Widget()
+    obj = types.SimpleNamespace()
+    debug.start_tracking_bindings(warn_threshold=3)
+    for __ in range(3):
+        ak.sync_attr((w, 'x'), (obj, 'x'))
+    with pytest.warns(UserWarning, match=r"4 callbacks .*\.x by asynckivy"):
+        ak.sync_attr((w, 'x'), (obj, 'x'))
+
+
+def test_dump_bindings(kivy_runner):
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    from asynckivy import debug
+    w = Widget()
+    obj = types.SimpleNamespace()
+    debug.start_tracking_bindings()
+    for __ in range(3):
+        ak.sync_attr((w, 'x'), (obj, 'x'))
+    ak.sync_attr((w, 'y'), (obj, 'y'))
+    text = debug.dump_bindings()
+    assert re.search(r"\.x: 3 binding\(s\), oldest [0-9.]+s$", text.splitlines()[0])
+    assert '  3 created at:' in text
+    assert 'test_dump_bindings' in text
+    groups = json.loads(debug.dump_bindings(format='json'))
+    assert [(g['event_name'], g['count']) for g in groups] == [('x', 3), ('y', 1)]
+    assert groups[0]['stacks'][0]['count'] == 3
+    with pytest.raises(ValueError):
+        debug.dump_bindings(format='xml')
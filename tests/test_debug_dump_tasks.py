@@ -0,0 +1,75 @@
+import pytest
+import json
+
+
+@pytest.fixture(autouse=True)
+def _cancel_managed_tasks():
+    import asynckivy as ak
+    ak.cancel_managed_tasks()
+    yield
+    ak.cancel_managed_tasks()
+
+
+def test_awaiting(kivy_runner):
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    from asynckivy.debug import task_infos
+    w = Widget()
+
+    async def wait_for_touch():
+        await ak.event(w, 'on_touch_down')
+
+    t1 = ak.managed_start(wait_for_touch())
+    t2 = ak.managed_start(ak.sleep(10))
+    infos = {i.task: i for i in task_infos()}
+    assert infos[t1].awaiting == 'asynckivy.event'
+    assert infos[t1].target is w
+    assert infos[t1].event_name == 'on_touch_down'
+    assert [s[0] for s in infos[t1].stack] == ['wait_for_touch', 'event']
+    assert infos[t1].age >= 0.
+    assert infos[t2].awaiting == 'asynckivy.sleep'
+    assert infos[t2].target is None
+    assert infos[t2].event_name is None
+
+
+def test_unmanaged_tasks(kivy_runner):
+    import asynckivy as ak
+    from asynckivy.debug import task_infos
+
+    task = ak.start(ak.sleep_forever())
+    assert task_infos() == []
+    info, = task_infos([task])
+    assert info.age is None
+    assert info.awaiting == 'asyncgui.sleep_forever'
+    task.cancel()
+    info, = task_infos([task])
+    assert info.awaiting == '<cancelled>'
+
+
+def test_dump_tasks(kivy_runner):
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    from asynckivy.debug import dump_tasks
+    w = Widget()
+
+    ak.managed_start(ak.event(w, 'on_touch_down'))
+    text = dump_tasks()
+    assert 'awaiting asynckivy.event' in text
+    assert '.on_touch_down' in text
+    d, = json.loads(dump_tasks(format='json'))
+    assert d['awaiting'] == 'asynckivy.event'
+    assert d['event_name'] == 'on_touch_down'
+    with pytest.raises(ValueError):
+        dump_tasks(format='xml')
+
+
+def test_await_counts(kivy_runner):
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    from asynckivy.debug import await_counts
+    w = Widget()
+
+    for __ in range(3):
+        ak.managed_start(ak.event(w, 'on_touch_down'))
+    ak.managed_start(ak.sleep(10))
+    assert await_counts() == {'asynckivy.event': 3, 'asynckivy.sleep': 1}
@@ -0,0 +1,125 @@
+import pytest
+import json
+import time
+
+
+@pytest.fixture(autouse=True)
+def stop_recording_frames():
+    from asynckivy import debug
+    yield
+    debug.stop_recording_frames()
+
+
+def busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_runs_are_attributed_to_frames(kivy_runner):
+    import asynckivy as ak
+    from asynckivy import debug
+
+    async def heavy():
+        await ak.sleep(0)
+        busy_wait(.03)
+
+    async def light():
+        await ak.sleep(0)
+
+    debug.start_recording_frames()
+    kivy_runner.advance_a_frame()
+    ak.start(heavy())
+    ak.start(light())
+    kivy_runner.advance_a_frame()
+    kivy_runner.advance_a_frame()
+    records = debug.frame_records()
+    assert len(records) == 2
+    # Only the brief runs asyncgui makes while the tasks start.
+    assert all(own_time < .01 for __, __, own_time in records[0].runs)
+    runs = {label: (cause, own_time) for label, cause, own_time in records[1].runs}
+    assert runs['test_runs_are_attributed_to_frames.<locals>.heavy'][0] == 'asynckivy.sleep'
+    assert runs['test_runs_are_attributed_to_frames.<locals>.heavy'][1] >= .03
+    assert runs['test_runs_are_attributed_to_frames.<locals>.light'][0] == 'asynckivy.sleep'
+    assert records[1].duration >= .03
+
+
+def test_report(kivy_runner):
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    from asynckivy import debug
+    w = Widget()
+
+    async def heavy():
+        for __ in range(2):
+            await ak.event(w, 'x')
+            busy_wait(.03)
+
+    debug.start_recording_frames()
+    kivy_runner.advance_a_frame()
+    ak.start(heavy())
+    for __ in range(3):
+        w.x += 1
+        kivy_runner.advance_a_frame()
+    kivy_runner.advance_a_frame()
+    report = debug.frame_drop_report(budget=.02)
+    assert report[0].label == 'test_report.<locals>.heavy'
+    assert report[0].cause == 'asynckivy.event'
+    assert report[0].n_frames == 2
+    assert report[0].total_time >= .06
+    assert report[0].max_time >= .03
+    assert debug.frame_drop_report(budget=1.) == []
+    text = debug.dump_frame_drop_report(budget=.02)
+    assert text.startswith("2 of 4 frames took longer than 20.0ms")
+    assert 'test_report.<locals>.heavy (asynckivy.event)' in text
+    assert json.loads(debug.dump_frame_drop_report(budget=.02, format='json'))[0]['n_frames'] == 2
+    with pytest.raises(ValueError):
+        debug.dump_frame_drop_report(format='xml')
+
+
+def test_smooth_attr_and_anim_attrs(kivy_runner):
+    import types
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    from asynckivy import debug
+    w = Widget(x=0)
+    obj = types.SimpleNamespace(x=0)
+
+    debug.start_recording_frames()
+    kivy_runner.advance_a_frame()
+    ak.smooth_attr((w, 'x'), (obj, 'x'))
+    task = ak.start(ak.anim_attrs(w, x=100, duration=.25))
+    for __ in range(4):
+        kivy_runner.advance_a_frame()
+    assert task.finished
+    causes = {cause for record in debug.frame_records() for __, cause, __ in record.runs}
+    assert {'asynckivy.smooth_attr', 'asynckivy.anim_attrs'} <= causes
+
+
+def test_thread_completion(kivy_runner):
+    import asynckivy as ak
+    from asynckivy import debug
+
+    async def job():
+        await ak.run_in_thread(lambda: None)
+
+    debug.start_recording_frames()
+    task = ak.start(job())
+    deadline = time.monotonic() + 5.
+    while not task.finished:
+        assert time.monotonic() < deadline
+        time.sleep(.01)
+        kivy_runner.advance_a_frame()
+    kivy_runner.advance_a_frame()
+    causes = [cause for record in debug.frame_records() for __, cause, __ in record.runs]
+    assert causes == ['asynckivy.run_in_thread']
+
+
+def test_rolling_window(kivy_runner):
+    from asynckivy import debug
+    debug.start_recording_frames(n_frames=3)
+    for __ in range(6):
+        kivy_runner.advance_a_frame()
+    assert len(debug.frame_records()) == 3
+    debug.stop_recording_frames()
+    assert debug.frame_records() == []
@@ -0,0 +1,122 @@
+import pytest
+import json
+import time
+
+
+@pytest.fixture(autouse=True)
+def stop_profiling():
+    from asynckivy import debug
+    yield
+    debug.stop_profiling()
+
+
+def busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_time_is_attributed_to_tasks(kivy_runner):
+    import asynckivy as ak
+    from asynckivy import debug
+    from kivy.uix.widget import Widget
+    w = Widget()
+
+    async def heavy():
+        await ak.event(w, 'x')
+        busy_wait(.02)
+
+    async def light():
+        await ak.event(w, 'x')
+
+    debug.start_profiling()
+    t1 = ak.start(heavy())
+    t2 = ak.start(light())
+    w.x = 10
+    assert t1.finished and t2.finished
+    results = {r.label: r for r in debug.profile_results()}
+    assert results['test_time_is_attributed_to_tasks.<locals>.heavy'].total_time >= .02
+    assert results['test_time_is_attributed_to_tasks.<locals>.light'].total_time < .01
+    assert debug.profile_results()[0].label.endswith('heavy')
+
+
+def test_nested_resumption_is_excluded(kivy_runner):
+    import asynckivy as ak
+    from asynckivy import debug
+    from kivy.uix.widget import Widget
+    w1 = Widget()
+    w2 = Widget()
+
+    async def outer():
+        await ak.event(w1, 'x')
+        w2.x = 10
+
+    async def inner():
+        await ak.event(w2, 'x')
+        busy_wait(.02)
+
+    debug.start_profiling()
+    ak.start(outer())
+    ak.start(inner())
+    debug.name_task(ak.start(inner()), 'named')
+    w1.x = 10
+    results = {r.label: r for r in debug.profile_results()}
+    assert results['test_nested_resumption_is_excluded.<locals>.outer'].total_time < .01
+    assert results['test_nested_resumption_is_excluded.<locals>.inner'].n_runs == 1
+    assert results['named'].total_time >= .02
+
+
+def test_anim_attrs(kivy_runner):
+    import asynckivy as ak
+    from asynckivy import debug
+    from kivy.uix.widget import Widget
+    kr = kivy_runner
+    w = Widget()
+
+    async def animate():
+        await ak.anim_attrs(w, x=100, duration=.3)
+
+    debug.start_profiling()
+    task = ak.start(animate())
+    for __ in range(4):
+        kr.advance_a_frame(dt=.1)
+    assert task.finished
+    r, = debug.profile_results()
+    assert r.n_runs >= 3
+    debug.stop_profiling()
+
+
+def test_inactive_after_stopping():
+    from asynckivy import debug, _instrument
+    debug.start_profiling()
+    assert _instrument.active
+    debug.stop_profiling()
+    assert not _instrument.active
+    assert not _instrument._hooks
+
+
+def test_waits_on_asyncgui_primitives_are_not_measured(kivy_runner):
+    import asynckivy as ak
+    from asynckivy import debug
+    e = ak.Event()
+
+    debug.start_profiling()
+    task = ak.start(e.wait())
+    e.fire()
+    assert task.finished
+    assert debug.profile_results() == []
+
+
+def test_dump_profile(kivy_runner):
+    import asynckivy as ak
+    from asynckivy import debug
+    from kivy.uix.widget import Widget
+    w = Widget()
+
+    debug.start_profiling()
+    debug.name_task(ak.start(ak.event(w, 'x')), 'waiter')
+    w.x = 10
+    assert 'waiter' in debug.dump_profile()
+    d, = json.loads(debug.dump_profile(format='json'))
+    assert d['label'] == 'waiter'
+    assert d['n_runs'] == 1
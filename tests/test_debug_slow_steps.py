@@ -0,0 +1,138 @@
+import pytest
+import time
+
+
+@pytest.fixture(autouse=True)
+def stop_detecting_slow_steps():
+    from asynckivy import debug
+    yield
+    debug.stop_detecting_slow_steps()
+
+
+def busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_slow_step_after_event(kivy_runner):
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    from asynckivy import debug
+    w = Widget()
+    reports = []
+
+    async def heavy():
+        await ak.event(w, 'x')
+        busy_wait(.02)
+
+    async def light():
+        await ak.event(w, 'x')
+
+    debug.start_detecting_slow_steps(.01, callback=reports.append)
+    t1 = ak.start(heavy())
+    ak.start(light())
+    w.x = 10
+    assert t1.finished
+    assert len(reports) == 1
+    r = reports[0]
+    assert r.task is t1
+    assert r.label == 'test_slow_step_after_event.<locals>.heavy'
+    assert r.duration >= .02
+    assert r.source == 'step'
+    assert r.awaiting == 'asynckivy.event'
+    assert r.target is w
+    assert r.event_name == 'x'
+    assert [name for name, __, __ in r.stack] == ['heavy', 'event']
+
+
+def test_slow_step_after_sleep(kivy_runner):
+    import asynckivy as ak
+    from asynckivy import debug
+    reports = []
+
+    async def heavy():
+        await ak.sleep(.1)
+        busy_wait(.02)
+
+    debug.start_detecting_slow_steps(.01, callback=reports.append)
+    task = ak.start(heavy())
+    kivy_runner.advance_a_frame()
+    assert task.finished
+    assert [(r.awaiting, r.target, r.event_name) for r in reports] == [('asynckivy.sleep', None, None)]
+
+
+def test_nested_resumption_is_excluded(kivy_runner):
+    import asynckivy as ak
+    from asynckivy import debug
+    from kivy.uix.widget import Widget
+    w1 = Widget()
+    w2 = Widget()
+    reports = []
+
+    async def outer():
+        await ak.event(w1, 'x')
+        w2.x = 10
+
+    async def inner():
+        await ak.event(w2, 'x')
+        busy_wait(.02)
+
+    debug.start_detecting_slow_steps(.01, callback=reports.append)
+    ak.start(outer())
+    ak.start(inner())
+    w1.x = 10
+    assert [r.label for r in reports] == ['test_nested_resumption_is_excluded.<locals>.inner']
+    assert reports[0].target is w2
+
+
+def test_logged_by_default(kivy_runner, monkeypatch):
+    import asynckivy as ak
+    from asynckivy import debug
+    logged = []
+    monkeypatch.setattr(debug.Logger, 'warning', logged.append)
+
+    async def heavy():
+        await ak.sleep(0)
+        busy_wait(.02)
+
+    debug.start_detecting_slow_steps(.01)
+    ak.start(heavy())
+    kivy_runner.advance_a_frame()
+    assert len(logged) == 1
+    assert 'heavy took' in logged[0]
+    assert 'asynckivy.sleep' in logged[0]
+
+
+def test_stop(kivy_runner):
+    import asynckivy as ak
+    from asynckivy import debug
+    from asynckivy import _instrument
+    reports = []
+    debug.start_detecting_slow_steps(.01, callback=reports.append)
+    debug.stop_detecting_slow_steps()
+    assert not _instrument.active
+
+    async def heavy():
+        await ak.sleep(0)
+        busy_wait(.02)
+
+    ak.start(heavy())
+    kivy_runner.advance_a_frame()
+    assert reports == []
+
+
+def test_smooth_attr(kivy_runner):
+    import types
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    from asynckivy import debug
+    reports = []
+    w = Widget(x=0)
+    debug.start_detecting_slow_steps(0., callback=reports.append)
+    ak.smooth_attr((w, 'x'), (types.SimpleNamespace(x=100), 'x'))
+    kivy_runner.advance_a_frame()
+    assert reports
+    r = reports[0]
+    assert (r.task, r.label, r.source, r.awaiting, r.stack) == \
+        (None, 'asynckivy.smooth_attr', 'smooth_attr', 'asynckivy.smooth_attr', [])
@@ -0,0 +1,132 @@
+import pytest
+import json
+import time
+
+
+@pytest.fixture(autouse=True)
+def stop_tracing():
+    from asynckivy import debug
+    yield
+    debug.stop_tracing()
+
+
+def load_events():
+    from asynckivy import debug
+    return json.loads(debug.dump_trace())['traceEvents']
+
+
+def test_task_lifetime_and_runs(kivy_runner):
+    import asynckivy as ak
+    from asynckivy import debug
+    from kivy.uix.widget import Widget
+    w = Widget()
+
+    async def job():
+        await ak.event(w, 'x')
+        await ak.event(w, 'x')
+
+    debug.start_tracing()
+    task = ak.start(job())
+    w.x = 10
+    w.x = 20
+    assert task.finished
+    events = [ev for ev in load_events() if ev['name'] == 'test_task_lifetime_and_runs.<locals>.job']
+    assert [ev['ph'] for ev in events] == ['b', 'X', 'X', 'e']
+    assert events[0]['id'] == events[-1]['id']
+    assert events[-1]['args'] == {'state': 'FINISHED'}
+    assert [ev['args']['cause'] for ev in events if ev['ph'] == 'X'] == ['asynckivy.event', 'asynckivy.event']
+    assert all(ev['dur'] >= 0 for ev in events if ev['ph'] == 'X')
+
+
+def test_cancellation_ends_the_lifetime(kivy_runner):
+    import asynckivy as ak
+    from asynckivy import debug
+
+    async def job():
+        await ak.sleep(0)
+        await ak.sleep_forever()
+
+    debug.start_tracing()
+    task = ak.start(job())
+    kivy_runner.advance_a_frame()
+    task.cancel()
+    events = [ev for ev in load_events() if ev.get('cat') == 'task']
+    assert [ev['ph'] for ev in events] == ['b']
+    kivy_runner.advance_a_frame()
+    events = [ev for ev in load_events() if ev.get('cat') == 'task']
+    assert [(ev['ph'], ev.get('args')) for ev in events] == [('b', None), ('e', {'state': 'CANCELLED'})]
+    assert events[0]['id'] == events[1]['id']
+
+
+def test_anim_attrs(kivy_runner):
+    import types
+    import asynckivy as ak
+    from asynckivy import debug
+    debug.start_tracing()
+    task = ak.start(ak.anim_attrs(types.SimpleNamespace(x=0), x=100, duration=.15))
+    for __ in range(3):
+        kivy_runner.advance_a_frame()
+    assert task.finished
+    events = load_events()
+    spans = [ev for ev in events if ev.get('cat') == 'anim_attrs' and ev['ph'] in 'be']
+    assert [(ev['ph'], ev['name']) for ev in spans] == [('b', 'SimpleNamespace'), ('e', 'SimpleNamespace')]
+    assert spans[0]['args'] == {'attrs': ['x']}
+    assert spans[0]['id'] == spans[1]['id']
+    assert len([ev for ev in events if ev.get('cat') == 'anim_attrs' and ev['ph'] == 'X']) >= 2
+
+
+def test_frame_markers(kivy_runner):
+    from asynckivy import debug
+    debug.start_tracing()
+    for __ in range(3):
+        kivy_runner.advance_a_frame()
+    frames = [ev for ev in load_events() if ev['name'] == 'frame']
+    assert len(frames) == 3
+    assert all(ev['ph'] == 'i' and ev['s'] == 'g' for ev in frames)
+
+
+def test_thread_jobs(kivy_runner):
+    import threading
+    import asynckivy as ak
+    from asynckivy import debug
+
+    async def job():
+        await ak.run_in_thread(lambda: time.sleep(.01))
+
+    debug.start_tracing()
+    task = ak.start(job())
+    deadline = time.monotonic() + 5.
+    while not task.finished:
+        assert time.monotonic() < deadline
+        time.sleep(.01)
+        kivy_runner.advance_a_frame()
+    events = load_events()
+    jobs = [ev for ev in events if ev.get('cat') == 'thread']
+    assert [ev['ph'] for ev in jobs] == ['b', 'X', 'e']
+    submit, run, complete = jobs
+    assert submit['tid'] == threading.get_ident()
+    assert run['tid'] == complete['tid'] != submit['tid']
+    assert submit['id'] == complete['id'] == run['args']['span']
+    assert run['dur'] >= 10_000
+    names = {ev['tid']: ev['args']['name'] for ev in events if ev['ph'] == 'M'}
+    assert names[run['tid']] == 'asynckivy.run_in_thread'
+
+
+def test_ring_buffer(kivy_runner):
+    from asynckivy import debug
+    debug.start_tracing(max_events=2)
+    for __ in range(5):
+        kivy_runner.advance_a_frame()
+    assert len([ev for ev in load_events() if ev['ph'] != 'M']) == 2
+
+
+def test_nothing_is_recorded_after_stopping(kivy_runner):
+    import types
+    import asynckivy as ak
+    from asynckivy import debug, _trace
+    debug.start_tracing()
+    debug.stop_tracing()
+    assert _trace.tracer is None
+    ak.start(ak.anim_attrs(types.SimpleNamespace(x=0), x=100, duration=.1))
+    kivy_runner.advance_a_frame()
+    assert json.loads(debug.dump_trace()) == {'traceEvents': [], 'displayTimeUnit': 'ms'}
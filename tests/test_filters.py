@@ -0,0 +1,101 @@
+import pytest
+
+
+class Touch:
+    def __init__(self, pos=(0, 0), grab_current=None, is_mouse_scrolling=False):
+        self.pos = self.opos = pos
+        self.grab_current = grab_current
+        self.is_mouse_scrolling = is_mouse_scrolling
+
+
+class Widget:
+    def collide_point(self, x, y):
+        return 0 <= x <= 100 and 0 <= y <= 100
+
+
+def test_same_touch():
+    from asynckivy import filters as F
+    t1 = Touch()
+    t2 = Touch()
+    f = F.same_touch(t1)
+    assert f(Widget(), t1)
+    assert not f(Widget(), t2)
+
+
+@pytest.mark.parametrize('pos, expected', [((50, 50), True), ((150, 50), False)])
+def test_collides(pos, expected):
+    from asynckivy import filters as F
+    assert F.collides('opos')(Widget(), Touch(pos)) is expected
+
+
+def test_invalid_attribute_name():
+    from asynckivy import filters as F
+    with pytest.raises(ValueError):
+        F.collides('pos); import os; (')
+
+
+def test_combination():
+    from asynckivy import filters as F
+    w = Widget()
+    t = Touch((50, 50))
+    f = F.same_touch(t) & F.collides() & ~F.mouse_scrolling
+    assert f(w, t)
+    assert not f(w, Touch((50, 50)))
+    t.is_mouse_scrolling = True
+    assert not f(w, t)
+    t.is_mouse_scrolling = False
+    t.pos = (150, 50)
+    assert not f(w, t)
+
+
+def test_or():
+    from asynckivy import filters as F
+    w = Widget()
+    t1 = Touch()
+    t2 = Touch()
+    f = F.same_touch(t1) | F.same_touch(t2)
+    assert f(w, t1)
+    assert f(w, t2)
+    assert not f(w, Touch())
+
+
+def test_grabbed():
+    from asynckivy import filters as F
+    w = Widget()
+    assert F.grabbed(w, Touch(grab_current=w))
+    assert not F.grabbed(w, Touch())
+    assert F.ungrabbed(w, Touch())
+
+
+def test_predicate():
+    from asynckivy import filters as F
+    f = F.predicate(lambda *args: args == (1, 2)) & ~F.predicate(lambda *args: False)
+    assert f(1, 2)
+    assert not f(1, 3)
+
+
+def test_compiled_code_is_shared():
+    from asynckivy import filters as F
+    f1 = F.same_touch(Touch()) & F.collides()
+    f2 = F.same_touch(Touch()) & F.collides()
+    assert f1.compiled is not f2.compiled
+    assert f1.compiled.__code__ is f2.compiled.__code__
+    assert F.collides('opos') is F.collides('opos')
+
+
+def test_event():
+    from kivy.event import EventDispatcher
+    import asynckivy as ak
+    from asynckivy import filters as F
+
+    class ED(EventDispatcher):
+        __events__ = ('on_test', )
+        def on_test(self, *args):
+            pass
+
+    ed = ED()
+    task = ak.start(ak.event(ed, 'on_test', filter=F.predicate(lambda ed, v: v == 2)))
+    ed.dispatch('on_test', 1)
+    assert not task.finished
+    ed.dispatch('on_test', 2)
+    assert task.finished
@@ -0,0 +1,262 @@
+import pytest
+
+
+@pytest.fixture()
+def widget(kivy_runner):
+    from kivy.uix.widget import Widget
+    w = Widget(pos=(0, 0), size=(200, 200), size_hint=(None, None))
+    kivy_runner.window.add_widget(w)
+    kivy_runner.advance_a_frame()
+    return w
+
+
+def test_tap(kivy_runner, widget):
+    from kivy.tests.common import UnitTestTouch
+    from asynckivy import start, gestures
+
+    task = start(gestures.tap(widget))
+    t = UnitTestTouch(50, 50)
+    t.touch_down()
+    t.touch_move(52, 52)
+    assert not task.finished
+    t.touch_up()
+    assert task.result is t
+
+
+def test_tap_too_long(kivy_runner, widget):
+    from kivy.tests.common import UnitTestTouch
+    from asynckivy import start, gestures
+
+    task = start(gestures.tap(widget, max_duration=.2))
+    t = UnitTestTouch(50, 50)
+    t.touch_down()
+    kivy_runner.advance_a_frame(dt=.3)
+    t.touch_up()
+    assert not task.finished
+    t = UnitTestTouch(50, 50)
+    t.touch_down()
+    t.touch_up()
+    assert task.result is t
+
+
+def test_tap_moved_too_far(kivy_runner, widget):
+    from kivy.tests.common import UnitTestTouch
+    from asynckivy import start, gestures
+
+    task = start(gestures.tap(widget, max_distance=10))
+    t = UnitTestTouch(50, 50)
+    t.touch_down()
+    t.touch_move(80, 50)
+    t.touch_up()
+    assert not task.finished
+    task.cancel()
+
+
+def test_tap_outside(kivy_runner, widget):
+    from kivy.tests.common import UnitTestTouch
+    from asynckivy import start, gestures
+
+    task = start(gestures.tap(widget))
+    t = UnitTestTouch(250, 50)
+    t.touch_down()
+    t.touch_up()
+    assert not task.finished
+    task.cancel()
+
+
+def test_double_tap(kivy_runner, widget):
+    from kivy.tests.common import UnitTestTouch
+    from asynckivy import start, gestures
+
+    task = start(gestures.double_tap(widget, max_interval=.3))
+    t = UnitTestTouch(50, 50)
+    t.touch_down()
+    t.touch_up()
+    kivy_runner.advance_a_frame(dt=.4)
+    t = UnitTestTouch(50, 50)
+    t.touch_down()
+    t.touch_up()
+    assert not task.finished
+    kivy_runner.advance_a_frame(dt=.1)
+    t = UnitTestTouch(52, 50)
+    t.touch_down()
+    t.touch_up()
+    assert task.result is t
+
+
+def test_double_tap_interval_excludes_the_second_press(kivy_runner, widget):
+    from kivy.tests.common import UnitTestTouch
+    from asynckivy import start, gestures
+
+    task = start(gestures.double_tap(widget, max_interval=.3, max_duration=.3))
+    t = UnitTestTouch(50, 50)
+    t.touch_down()
+    t.touch_up()
+    kivy_runner.advance_a_frame(dt=.2)
+    t = UnitTestTouch(50, 50)
+    t.touch_down()
+    kivy_runner.advance_a_frame(dt=.15)
+    t.touch_up()
+    assert task.result is t
+
+
+def test_long_press(kivy_runner, widget):
+    from kivy.tests.common import UnitTestTouch
+    from asynckivy import start, gestures
+
+    task = start(gestures.long_press(widget, duration=.5))
+    t = UnitTestTouch(50, 50)
+    t.touch_down()
+    kivy_runner.advance_a_frame(dt=.3)
+    assert not task.finished
+    kivy_runner.advance_a_frame(dt=.3)
+    assert task.result is t
+    t.touch_up()
+
+
+@pytest.mark.parametrize('goal, expected', [
+    ((150, 60), 'right'), ((10, 50), 'left'), ((60, 150), 'up'), ((50, 1), 'down'),
+])
+def test_swipe(kivy_runner, widget, goal, expected):
+    from kivy.tests.common import UnitTestTouch
+    from asynckivy import start, gestures
+
+    task = start(gestures.swipe(widget, min_distance=40))
+    t = UnitTestTouch(50, 50)
+    t.touch_down()
+    t.touch_move(*goal)
+    t.touch_up()
+    assert task.result == (t, expected)
+
+
+def test_fling(kivy_runner, widget):
+    from kivy.tests.common import UnitTestTouch
+    from asynckivy import start, gestures
+    kr = kivy_runner
+
+    task = start(gestures.fling(widget, min_velocity=500))
+    t = UnitTestTouch(10, 50)
+    t.touch_down()
+    kr.current_time += .1
+    t.touch_move(20, 50)
+    kr.current_time += .1
+    t.touch_up()
+    assert not task.finished  # 100px/s
+
+    t = UnitTestTouch(10, 50)
+    t.touch_down()
+    for x in (30, 50, 70, ):
+        kr.current_time += .02
+        t.touch_move(x, 50)
+    t.touch_up()
+    touch, vx, vy = task.result
+    assert touch is t
+    assert vx == pytest.approx(1000, rel=.05)
+    assert vy == pytest.approx(0, abs=1)
+
+
+def test_velocity_tracker_drops_old_samples():
+    from asynckivy.gestures import _VelocityTracker
+
+    vt = _VelocityTracker(capacity=4, window=.1)
+    assert vt.velocity() == (0., 0., )
+    vt.add(0., 0., 0.)
+    vt.add(1., 1000., 0.)
+    for i in range(1, 6):
+        vt.add(1. + i * .01, 1000. + i * 10., i * 5.)
+    vx, vy = vt.velocity()
+    assert vx == pytest.approx(1000.)
+    assert vy == pytest.approx(500.)
+
+
+def test_pinch(kivy_runner, widget):
+    from kivy.tests.common import UnitTestTouch
+    import asynckivy as ak
+    from asynckivy import gestures
+
+    scales = []
+
+    async def async_fn():
+        async with gestures.pinch(widget) as p:
+            while True:
+                await p.changed()
+                scales.append(round(p.scale, 2))
+        return 'done'
+
+    task = ak.start(async_fn())
+    t1 = UnitTestTouch(40, 100)
+    t1.touch_down()
+    t2 = UnitTestTouch(60, 100)
+    t2.touch_down()
+    t2.touch_move(80, 100)
+    t1.touch_move(20, 100)
+    assert scales == [2.0, 3.0]
+    assert not task.finished
+    t1.touch_up()
+    assert task.result == 'done'
+    t2.touch_up()
+
+
+def test_pinch_first_touch_moved_before_second_one(kivy_runner, widget):
+    from kivy.tests.common import UnitTestTouch
+    import asynckivy as ak
+    from asynckivy import gestures
+
+    async def async_fn():
+        async with gestures.pinch(widget) as p:
+            return p.scale, p.angle
+
+    task = ak.start(async_fn())
+    t1 = UnitTestTouch(10, 100)
+    t1.touch_down()
+    t1.touch_move(100, 100)
+    t2 = UnitTestTouch(180, 100)
+    t2.touch_down()
+    assert task.result == (1., 0., )
+    t2.touch_up()
+    t1.touch_up()
+
+
+def test_pinch_first_touch_released_before_second_one(kivy_runner, widget):
+    from kivy.tests.common import UnitTestTouch
+    import asynckivy as ak
+    from asynckivy import gestures
+
+    async def async_fn():
+        async with gestures.pinch(widget) as p:
+            return p.touches
+
+    task = ak.start(async_fn())
+    t1 = UnitTestTouch(40, 100)
+    t1.touch_down()
+    t1.touch_up()
+    t2 = UnitTestTouch(60, 100)
+    t2.touch_down()
+    assert not task.finished
+    t3 = UnitTestTouch(70, 100)
+    t3.touch_down()
+    assert task.result == (t2, t3, )
+
+
+def test_multiple_recognizers_share_a_binding(kivy_runner, widget):
+    import asynckivy as ak
+    from asynckivy import gestures
+
+    tasks = [ak.start(gestures.tap(widget)), ak.start(gestures.long_press(widget))]
+    assert len(gestures._hubs) == 1
+    for t in tasks:
+        t.cancel()
+    assert not gestures._hubs
+
+
+def test_cancelled_waiters_dont_pile_up(kivy_runner, widget):
+    import asynckivy as ak
+    from asynckivy import gestures
+
+    alive = ak.start(gestures.tap(widget))
+    for __ in range(100):
+        ak.start(gestures.tap(widget)).cancel()
+    hub, = gestures._hubs.values()
+    assert len(hub._waiting_steps) == 1
+    alive.cancel()
+    assert not gestures._hubs
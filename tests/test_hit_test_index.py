@@ -0,0 +1,141 @@
+import pytest
+
+
+@pytest.fixture()
+def index(kivy_runner):
+    import asynckivy as ak
+    return ak.HitTestIndex(kivy_runner.window, cell_size=50)
+
+
+def add_widget(kivy_runner, pos, size=(40, 40)):
+    from kivy.uix.widget import Widget
+    w = Widget(pos=pos, size=size, size_hint=(None, None))
+    kivy_runner.window.add_widget(w)
+    return w
+
+
+def test_event(kivy_runner, index):
+    from kivy.tests.common import UnitTestTouch
+    import asynckivy as ak
+
+    w1 = add_widget(kivy_runner, (0, 0))
+    w2 = add_widget(kivy_runner, (100, 100))
+    task1 = ak.start(ak.event(w1, 'on_touch_down', index=index))
+    task2 = ak.start(ak.event(w2, 'on_touch_down', index=index))
+    t = UnitTestTouch(110, 110)
+    t.touch_down()
+    t.touch_up()
+    assert not task1.finished
+    assert task2.result == (w2, t, )
+    task1.cancel()
+    assert not index._regions
+    assert not index._grid
+
+
+def test_widget_moves(kivy_runner, index):
+    from kivy.tests.common import UnitTestTouch
+    import asynckivy as ak
+
+    w = add_widget(kivy_runner, (0, 0))
+    task = ak.start(ak.event(w, 'on_touch_down', index=index))
+    w.pos = (200, 150)
+    t = UnitTestTouch(20, 20)
+    t.touch_down()
+    t.touch_up()
+    assert not task.finished
+    t = UnitTestTouch(220, 170)
+    t.touch_down()
+    t.touch_up()
+    assert task.finished
+
+
+def test_filter_and_stop_dispatching(kivy_runner, index):
+    from kivy.tests.common import UnitTestTouch
+    import asynckivy as ak
+
+    received = []
+    w = add_widget(kivy_runner, (0, 0))
+    w.bind(on_touch_down=lambda w, t: received.append(t))
+    task = ak.start(ak.event(
+        w, 'on_touch_down', index=index, stop_dispatching=True, filter=lambda w, t: t.x > 20))
+    t = UnitTestTouch(10, 10)
+    t.touch_down()
+    t.touch_up()
+    assert received == [t]
+    assert not task.finished
+    t = UnitTestTouch(30, 10)
+    t.touch_down()
+    t.touch_up()
+    assert task.finished
+    assert len(received) == 1
+
+
+def test_non_touch_event(kivy_runner, index):
+    import asynckivy as ak
+
+    w = add_widget(kivy_runner, (0, 0))
+    with pytest.raises(ValueError):
+        ak.start(ak.event(w, 'x', index=index))
+
+
+def test_block_touch_events(kivy_runner, index):
+    from kivy.tests.common import UnitTestTouch
+    import asynckivy as ak
+
+    received = []
+    w = add_widget(kivy_runner, (0, 0))
+    w.bind(on_touch_down=lambda w, t: received.append(t))
+    with ak.block_touch_events(w, index=index):
+        t = UnitTestTouch(10, 10)
+        t.touch_down()
+        t.touch_up()
+        assert received == []
+        t = UnitTestTouch(100, 100)
+        t.touch_down()
+        t.touch_up()
+        assert received == [t]  # outside the widget
+    assert not kivy_runner.window.get_property_observers('on_touch_down')
+    t2 = UnitTestTouch(10, 10)
+    t2.touch_down()
+    t2.touch_up()
+    assert received == [t, t2]
+
+
+def test_many_widgets(kivy_runner, index):
+    from kivy.tests.common import UnitTestTouch
+    import asynckivy as ak
+
+    widgets = [add_widget(kivy_runner, (x * 10, y * 10), (10, 10)) for x in range(30) for y in range(20)]
+    tasks = [ak.start(ak.event(w, 'on_touch_down', index=index)) for w in widgets]
+    t = UnitTestTouch(155, 95)
+    t.touch_down()
+    t.touch_up()
+    finished = [w.pos for w, task in zip(widgets, tasks) if task.finished]
+    assert finished == [[150, 90]]
+    for task in tasks:
+        task.cancel()
+    assert not index._regions
+
+
+@pytest.mark.parametrize('block_first', [True, False])
+def test_block_touch_events_shields_the_waiters_under_it(kivy_runner, index, block_first):
+    from contextlib import ExitStack
+    from kivy.tests.common import UnitTestTouch
+    import asynckivy as ak
+
+    parent = add_widget(kivy_runner, (0, 0), (100, 100))
+    child = add_widget(kivy_runner, (10, 10))
+    with ExitStack() as stack:
+        if block_first:
+            stack.enter_context(ak.block_touch_events(parent, index=index))
+        task = ak.start(ak.event(child, 'on_touch_down', index=index))
+        if not block_first:
+            stack.enter_context(ak.block_touch_events(parent, index=index))
+        t = UnitTestTouch(20, 20)
+        t.touch_down()
+        t.touch_up()
+        assert not task.finished
+    t = UnitTestTouch(20, 20)
+    t.touch_down()
+    t.touch_up()
+    assert task.finished
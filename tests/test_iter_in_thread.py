@@ -0,0 +1,119 @@
+import pytest
+import threading
+import time
+
+
+def _advance_frames_until_finished(kr, task, timeout=5.):
+    deadline = time.monotonic() + timeout
+    while not task.finished:
+        assert time.monotonic() < deadline
+        time.sleep(.01)
+        kr.advance_a_frame()
+
+
+def test_iterate(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+    thread_ids = set()
+
+    def gen():
+        for i in range(20):
+            thread_ids.add(threading.get_ident())
+            yield i
+
+    async def job():
+        async with ak.iter_in_thread(gen, maxsize=3) as it:
+            return [i async for i in it]
+
+    task = ak.start(job())
+    _advance_frames_until_finished(kr, task)
+    assert task.result == list(range(20))
+    assert threading.get_ident() not in thread_ids
+
+
+def test_backpressure(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+    n_produced = 0
+
+    def gen():
+        nonlocal n_produced
+        while True:
+            n_produced += 1
+            yield n_produced
+
+    async def job():
+        async with ak.iter_in_thread(gen, maxsize=2) as it:
+            await it.__anext__()
+            await ak.sleep_forever()
+
+    task = ak.start(job())
+    for __ in range(5):
+        time.sleep(.01)
+        kr.advance_a_frame()
+    assert n_produced <= 4
+    task.cancel()
+
+
+def test_exiting_stops_the_generator(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+    closed = threading.Event()
+
+    def gen():
+        try:
+            while True:
+                yield
+        finally:
+            closed.set()
+
+    async def job():
+        async with ak.iter_in_thread(gen, maxsize=1) as it:
+            await it.__anext__()
+
+    task = ak.start(job())
+    _advance_frames_until_finished(kr, task)
+    assert closed.wait(1.)
+
+
+def test_cancel(kivy_runner):
+    import asynckivy as ak
+    closed = threading.Event()
+
+    def gen():
+        try:
+            while True:
+                yield
+        finally:
+            closed.set()
+
+    async def job():
+        async with ak.iter_in_thread(gen, maxsize=1) as it:
+            async for __ in it:
+                pass
+
+    task = ak.start(job())
+    time.sleep(.01)
+    task.cancel()
+    assert task.cancelled
+    assert closed.wait(1.)
+
+
+def test_propagate_exception(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+
+    def gen():
+        yield 1
+        raise ZeroDivisionError
+
+    async def job():
+        items = []
+        with pytest.raises(ZeroDivisionError):
+            async with ak.iter_in_thread(gen) as it:
+                async for i in it:
+                    items.append(i)
+        assert items == [1]
+
+    task = ak.start(job())
+    _advance_frames_until_finished(kr, task)
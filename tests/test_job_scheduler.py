@@ -0,0 +1,149 @@
+import pytest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+@pytest.fixture()
+def executor():
+    with ThreadPoolExecutor() as executor:
+        yield executor
+
+
+def _advance_frames_until(kr, condition, timeout=5.):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(.01)
+        kr.advance_a_frame()
+
+
+def test_max_in_flight(kivy_runner, executor):
+    import asynckivy as ak
+    kr = kivy_runner
+    scheduler = ak.JobScheduler(max_in_flight=2, executor=executor)
+    gate = threading.Event()
+    lock = threading.Lock()
+    n_running = 0
+    max_running = 0
+
+    def func():
+        nonlocal n_running, max_running
+        with lock:
+            n_running += 1
+            max_running = max(max_running, n_running)
+        gate.wait(1.)
+        with lock:
+            n_running -= 1
+
+    tasks = [ak.start(scheduler.run(func)) for __ in range(5)]
+    assert scheduler.n_waiting() == 3
+    gate.set()
+    _advance_frames_until(kr, lambda: all(t.finished for t in tasks))
+    assert max_running == 2
+    assert scheduler.n_waiting() == 0
+
+
+def test_priority(kivy_runner, executor):
+    import asynckivy as ak
+    kr = kivy_runner
+    scheduler = ak.JobScheduler(max_in_flight=1, executor=executor)
+    gate = threading.Event()
+    order = []
+
+    tasks = [ak.start(scheduler.run(gate.wait)), ]
+    for name, priority in (('A', 0), ('B', 2), ('C', 1), ('D', 2)):
+        tasks.append(ak.start(scheduler.run(lambda name=name: order.append(name), priority=priority)))
+    gate.set()
+    _advance_frames_until(kr, lambda: all(t.finished for t in tasks))
+    assert order == ['B', 'D', 'C', 'A']
+
+
+def test_categories(kivy_runner, executor):
+    import asynckivy as ak
+    kr = kivy_runner
+    scheduler = ak.JobScheduler(max_in_flight=1, max_in_flight_per_category={'b': 2}, executor=executor)
+    gate = threading.Event()
+
+    tasks = [ak.start(scheduler.run(gate.wait, category=c)) for c in 'aabbb']
+    assert scheduler.n_waiting('a') == 1
+    assert scheduler.n_waiting('b') == 1
+    assert scheduler.n_waiting('c') == 0
+    gate.set()
+    _advance_frames_until(kr, lambda: all(t.finished for t in tasks))
+
+
+def test_cancelled_jobs_are_dropped(kivy_runner, executor):
+    import asynckivy as ak
+    kr = kivy_runner
+    scheduler = ak.JobScheduler(max_in_flight=1, executor=executor)
+    gate = threading.Event()
+    called = []
+
+    first = ak.start(scheduler.run(gate.wait))
+    dropped = [ak.start(scheduler.run(lambda: called.append('dropped'))) for __ in range(3)]
+    last = ak.start(scheduler.run(lambda: called.append('last')))
+    for t in dropped:
+        t.cancel()
+        assert t.cancelled
+    assert scheduler.n_waiting() == 1
+    gate.set()
+    _advance_frames_until(kr, lambda: first.finished and last.finished)
+    assert called == ['last']
+
+
+def test_cancelling_the_caller_of_a_running_job_doesnt_free_the_slot(kivy_runner, executor):
+    import asynckivy as ak
+    kr = kivy_runner
+    scheduler = ak.JobScheduler(max_in_flight=1, executor=executor)
+    gate = threading.Event()
+    lock = threading.Lock()
+    n_running = 0
+    max_running = 0
+
+    def func():
+        nonlocal n_running, max_running
+        with lock:
+            n_running += 1
+            max_running = max(max_running, n_running)
+        gate.wait(1.)
+        with lock:
+            n_running -= 1
+
+    tasks = [ak.start(scheduler.run(func)) for __ in range(4)]
+    for t in tasks[:3]:
+        _advance_frames_until(kr, lambda: n_running == 1)
+        t.cancel()
+        assert t.cancelled
+        kr.advance_a_frame()
+        time.sleep(.05)
+        assert max_running == 1
+        gate.set()
+        _advance_frames_until(kr, lambda: n_running == 0)
+        gate.clear()
+    gate.set()
+    _advance_frames_until(kr, lambda: tasks[3].finished)
+    assert max_running == 1
+
+
+def test_exception_frees_the_slot(kivy_runner, executor):
+    import asynckivy as ak
+    kr = kivy_runner
+    scheduler = ak.JobScheduler(max_in_flight=1, executor=executor)
+
+    async def job():
+        with pytest.raises(ZeroDivisionError):
+            await scheduler.run(lambda: 1 / 0)
+        return await scheduler.run(lambda: 'A')
+
+    task = ak.start(job())
+    _advance_frames_until(kr, lambda: task.finished)
+    assert task.result == 'A'
+
+
+def test_invalid_max_in_flight():
+    import asynckivy as ak
+    with pytest.raises(ValueError):
+        ak.JobScheduler(max_in_flight=0)
+    with pytest.raises(ValueError):
+        ak.JobScheduler(max_in_flight_per_category={'a': 0})
@@ -0,0 +1,141 @@
+import pytest
+
+
+@pytest.fixture()
+def window():
+    from kivy.event import EventDispatcher
+
+    class Window(EventDispatcher):
+        __events__ = ('on_keyboard', )
+
+        def on_keyboard(self, *args):
+            pass
+
+        def press(self, keycode, *modifiers):
+            return self.dispatch('on_keyboard', keycode, 0, '', list(modifiers))
+
+    return Window()
+
+
+def test_key(window):
+    import asynckivy as ak
+
+    task = ak.start(ak.key(window, 27))
+    window.press(13)
+    assert not task.finished
+    window.press(27, 'ctrl')
+    assert not task.finished
+    assert window.press(27, 'numlock')
+    assert task.result == (window, 27, 0, '', ['numlock'])
+    assert not window.press(27)
+
+
+def test_key_name(kivy_runner):
+    import asynckivy as ak
+
+    window = kivy_runner.window
+    task = ak.start(ak.key(window, 'escape'))
+    window.dispatch('on_keyboard', 27, 0, '', [])
+    assert task.finished
+
+
+def test_unknown_key(window):
+    import asynckivy as ak
+
+    with pytest.raises(ValueError):
+        ak.start(ak.key(window, 27, modifiers={'hyper', }))
+
+
+def test_modifiers(window):
+    import asynckivy as ak
+
+    task = ak.start(ak.key(window, 115, modifiers={'ctrl', 'shift'}))
+    window.press(115, 'ctrl')
+    assert not task.finished
+    window.press(115, 'shift', 'ctrl')
+    assert task.finished
+
+
+def test_any_modifiers(window):
+    import asynckivy as ak
+
+    task = ak.start(ak.key(window, 115, modifiers=None))
+    window.press(115, 'alt')
+    assert task.finished
+
+
+@pytest.mark.parametrize('consume', (True, False))
+def test_priority_and_consume(window, consume):
+    import asynckivy as ak
+
+    low = ak.start(ak.key(window, 27, priority=0))
+    high = ak.start(ak.key(window, 27, priority=1, consume=consume))
+    window.press(27)
+    assert high.finished
+    assert low.finished is not consume
+    low.cancel()
+
+
+def test_newest_first_among_the_same_priority(window):
+    import asynckivy as ak
+
+    older = ak.start(ak.key(window, 27))
+    newer = ak.start(ak.key(window, 27))
+    window.press(27)
+    assert newer.finished
+    assert not older.finished
+    window.press(27)
+    assert older.finished
+
+
+def test_single_binding_per_window(window):
+    import asynckivy as ak
+    from asynckivy import _key
+
+    tasks = [ak.start(ak.key(window, k)) for k in range(100)]
+    assert len(_key._keymaps) == 1
+    assert len(window.get_property_observers('on_keyboard')) == 1
+    for t in tasks:
+        t.cancel()
+    assert not _key._keymaps
+    assert not window.get_property_observers('on_keyboard')
+
+
+def test_rewait_inside_the_dispatch(window):
+    import asynckivy as ak
+
+    async def async_fn():
+        nonlocal n
+        while True:
+            await ak.key(window, 27)
+            n += 1
+
+    n = 0
+    task = ak.start(async_fn())
+    window.press(27)
+    assert n == 1
+    window.press(27)
+    assert n == 2
+    task.cancel()
+
+
+@pytest.mark.parametrize('free_to_await', (True, False))
+def test_key_stream(window, free_to_await):
+    import asynckivy as ak
+
+    async def async_fn():
+        nonlocal n
+        async with ak.key_stream(window, 27, free_to_await=free_to_await) as pressed:
+            while True:
+                await pressed()
+                n += 1
+
+    n = 0
+    task = ak.start(async_fn())
+    for expected in (1, 2, 3):
+        window.press(27)
+        assert n == expected
+    task.cancel()
+    window.press(27)
+    assert n == 3
+    assert not window.get_property_observers('on_keyboard')
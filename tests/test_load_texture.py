@@ -0,0 +1,188 @@
+import pytest
+import struct
+import time
+import zlib
+
+
+def _make_png(width, height) -> bytes:
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    raw = b''.join(b'\x00' + b'\xff\x00\x00\xff' * width for __ in range(height))
+    return b''.join((
+        b'\x89PNG\r\n\x1a\n',
+        chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)),
+        chunk(b'IDAT', zlib.compress(raw)),
+        chunk(b'IEND', b''),
+    ))
+
+
+@pytest.fixture()
+def image_paths(tmp_path):
+    paths = []
+    for i, size in enumerate(((4, 2), (8, 8), (16, 4))):
+        p = tmp_path / f'{i}.png'
+        p.write_bytes(_make_png(*size))
+        paths.append(str(p))
+    return paths
+
+
+@pytest.fixture()
+def fresh_state():
+    import asynckivy as ak
+    from asynckivy._load_texture import _cache
+    yield
+    _cache.clear()
+    ak.configure_load_texture(bytes_per_frame=4 * 1024 * 1024, cache_bytes=64 * 1024 * 1024)
+    ak.shutdown_pools()
+
+
+def _advance_frames_until(kr, condition, timeout=5.):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(.01)
+        kr.advance_a_frame()
+
+
+def test_load(kivy_runner, fresh_state, image_paths):
+    import asynckivy as ak
+    kr = kivy_runner
+
+    task = ak.start(ak.load_texture(image_paths[0]))
+    _advance_frames_until(kr, lambda: task.finished)
+    assert tuple(task.result.size) == (4, 2)
+
+
+def test_cache(kivy_runner, fresh_state, image_paths, monkeypatch):
+    import asynckivy as ak
+    from asynckivy import _load_texture
+    kr = kivy_runner
+
+    task = ak.start(ak.load_texture(image_paths[0]))
+    _advance_frames_until(kr, lambda: task.finished)
+    monkeypatch.setattr(_load_texture, '_decode', None)
+    task = ak.start(ak.load_texture(image_paths[0]))
+    kr.advance_a_frame()
+    assert tuple(task.result.size) == (4, 2)
+
+
+def test_cache_eviction(kivy_runner, fresh_state, image_paths):
+    import asynckivy as ak
+    from asynckivy._load_texture import _cache
+    kr = kivy_runner
+    ak.configure_load_texture(cache_bytes=8 * 8 * 4 + 4 * 2 * 4)
+
+    async def job():
+        for p in image_paths[:2]:
+            await ak.load_texture(p)
+        await ak.load_texture(image_paths[0])  # makes the first one the most recently used
+        await ak.load_texture(image_paths[2])
+
+    task = ak.start(job())
+    _advance_frames_until(kr, lambda: task.finished)
+    assert _cache.get(image_paths[0]) is not None
+    assert _cache.get(image_paths[1]) is None
+
+
+def test_budget_and_priority(kivy_runner, fresh_state, image_paths):
+    import asynckivy as ak
+    kr = kivy_runner
+    ak.configure_load_texture(bytes_per_frame=8 * 8 * 4)
+    order = []
+
+    async def load(path, priority):
+        await ak.load_texture(path, priority=priority)
+        order.append(path)
+
+    async def job():
+        # decodes all of them first so that the uploads compete with each other
+        for p in image_paths:
+            await ak.load_texture(p)
+        async with ak.open_nursery() as nursery:
+            for p, priority in zip(image_paths, (0, 1, 2)):
+                nursery.start(load(p, priority))
+
+    task = ak.start(job())
+    _advance_frames_until(kr, lambda: order)
+    # The one with the highest priority exceeds the budget by itself, thus it's the only one uploaded in this frame.
+    assert order == [image_paths[2]]
+    kr.advance_a_frame()
+    assert order == [image_paths[2], image_paths[1]]
+    kr.advance_a_frame()
+    assert order == [image_paths[2], image_paths[1], image_paths[0]]
+    assert task.finished
+
+
+def test_cancel_while_waiting_for_upload(kivy_runner, fresh_state, image_paths):
+    import asynckivy as ak
+    kr = kivy_runner
+    task = ak.start(ak.load_texture(image_paths[0]))
+    _advance_frames_until(kr, lambda: task.finished)
+
+    cancelled = ak.start(ak.load_texture(image_paths[0], priority=1))
+    task = ak.start(ak.load_texture(image_paths[0]))
+    cancelled.cancel()
+    assert cancelled.cancelled
+    kr.advance_a_frame()
+    assert task.finished
+
+
+
+def test_concurrent_requests_share_the_decode(kivy_runner, fresh_state, image_paths, monkeypatch):
+    import asynckivy as ak
+    from asynckivy import _load_texture
+    kr = kivy_runner
+    decoded = []
+    decode = _load_texture._decode
+
+    def counting_decode(path):
+        decoded.append(path)
+        return decode(path)
+
+    monkeypatch.setattr(_load_texture, '_decode', counting_decode)
+    tasks = [ak.start(ak.load_texture(image_paths[0])) for __ in range(3)]
+    _advance_frames_until(kr, lambda: all(t.finished for t in tasks))
+    assert decoded == [image_paths[0]]
+    assert all(tuple(t.result.size) == (4, 2) for t in tasks)
+    assert not _load_texture._decoding
+
+
+def test_cancelling_the_decoding_request(kivy_runner, fresh_state, image_paths):
+    import asynckivy as ak
+    from asynckivy import _load_texture
+    kr = kivy_runner
+
+    decoding = ak.start(ak.load_texture(image_paths[0]))
+    waiting = ak.start(ak.load_texture(image_paths[0]))
+    decoding.cancel()
+    assert decoding.cancelled
+    _advance_frames_until(kr, lambda: waiting.finished)
+    assert tuple(waiting.result.size) == (4, 2)
+    assert not _load_texture._decoding
+
+
+def test_decode_error_reaches_every_request(kivy_runner, fresh_state, tmp_path):
+    import asynckivy as ak
+    from asynckivy import _load_texture
+    kr = kivy_runner
+    path = str(tmp_path / 'missing.png')
+    errors = []
+
+    async def load():
+        try:
+            await ak.load_texture(path)
+        except Exception as e:
+            errors.append(e)
+
+    tasks = [ak.start(load()) for __ in range(2)]
+    _advance_frames_until(kr, lambda: all(t.finished for t in tasks))
+    assert len(errors) == 2
+    assert not _load_texture._decoding
+
+
+def test_invalid_arguments():
+    import asynckivy as ak
+    with pytest.raises(ValueError):
+        ak.configure_load_texture(bytes_per_frame=0)
+    with pytest.raises(ValueError):
+        ak.configure_load_texture(cache_bytes=-1)
@@ -1,15 +1,6 @@
 import pytest
 
 
-@pytest.fixture(scope="module", autouse=True)
-def _shorten_gc_interval():
-    from asynckivy import _managed_start as _ms
-    original = _ms._GC_IN_EVERY
-    _ms._GC_IN_EVERY = _ms._n_until_gc = 2
-    yield
-    _ms._GC_IN_EVERY = _ms._n_until_gc = original
-
-
 @pytest.fixture(autouse=True)
 def _cancel_managed_tasks():
     import asynckivy as ak
@@ -22,21 +13,16 @@ async def finish_immediately():
     pass
 
 
-def test_finished_tasks_only():
+def test_finished_tasks_are_not_retained():
     import asynckivy as ak
     from asynckivy import _managed_start as _ms
 
     assert len(_ms._managed_tasks) == 0
-    assert _ms._n_until_gc == 2
-    ak.managed_start(finish_immediately())
-    assert len(_ms._managed_tasks) == 1
-    assert _ms._n_until_gc == 1
     ak.managed_start(finish_immediately())
     assert len(_ms._managed_tasks) == 0
-    assert _ms._n_until_gc == 2
 
 
-def test_unfinished_tasks_only():
+def test_unfinished_tasks_are_retained():
     import asynckivy as ak
     from asynckivy import _managed_start as _ms
 
@@ -45,16 +31,52 @@ def test_unfinished_tasks_only():
     assert len(_ms._managed_tasks) == 1
     ak.managed_start(ak.sleep_forever())
     assert len(_ms._managed_tasks) == 2
-    assert _ms._n_until_gc == _ms._GC_IN_EVERY
 
 
-def test_mix_finished_tasks_and_unfinished_ones():
+def test_tasks_are_removed_when_they_end():
     import asynckivy as ak
     from asynckivy import _managed_start as _ms
 
+    e = ak.Event()
+    t1 = ak.managed_start(e.wait())
+    t2 = ak.managed_start(ak.sleep_forever())
+    assert len(_ms._managed_tasks) == 2
+    e.fire()
+    assert t1.finished
+    assert [t for t, __ in _ms._managed_tasks.values()] == [t2]
+    t2.cancel()
     assert len(_ms._managed_tasks) == 0
-    ak.managed_start(ak.sleep_forever())
-    assert len(_ms._managed_tasks) == 1
-    ak.managed_start(finish_immediately())
-    assert len(_ms._managed_tasks) == 1
-    assert _ms._n_until_gc == _ms._GC_IN_EVERY
+
+
+def test_cancel_managed_tasks():
+    import asynckivy as ak
+    from asynckivy import _managed_start as _ms
+
+    tasks = [ak.managed_start(ak.sleep_forever()) for __ in range(3)]
+    ak.cancel_managed_tasks()
+    assert all(t.cancelled for t in tasks)
+    assert len(_ms._managed_tasks) == 0
+
+
+def test_task_with_on_end():
+    import asynckivy as ak
+    from asynckivy import _managed_start as _ms
+
+    ended = []
+    task = ak.Task(ak.sleep_forever())
+    task._on_end = ended.append
+    ak.managed_start(task)
+    task.cancel()
+    assert ended == [task]
+    assert len(_ms._managed_tasks) == 0
+
+
+def test_already_started_task():
+    import asynckivy as ak
+    from asynckivy import _managed_start as _ms
+
+    task = ak.start(ak.sleep_forever())
+    with pytest.raises(ValueError):
+        ak.managed_start(task)
+    assert len(_ms._managed_tasks) == 0
+    task.cancel()
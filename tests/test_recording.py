@@ -0,0 +1,123 @@
+import pytest
+
+
+@pytest.fixture()
+def widget(kivy_runner):
+    from kivy.uix.widget import Widget
+    w = Widget()
+    kivy_runner.window.add_widget(w)
+    kivy_runner.advance_a_frame()
+    return w
+
+
+def record_a_session(kivy_runner, widget):
+    from kivy.tests.common import UnitTestTouch
+    from asynckivy import recording
+    kr = kivy_runner
+    window = kr.window
+
+    with recording.Recorder(window) as rec:
+        rec.watch(widget, 'opacity', label='w')
+        t = UnitTestTouch(10, 20)
+        t.touch_down()
+        kr.current_time += .1
+        t.touch_move(30, 40)
+        kr.current_time += .1
+        t.touch_up()
+        widget.opacity = .5
+        kr.current_time += .2
+        window.dispatch('on_key_down', 27, 41, '', ['ctrl', 'numlock'])
+        window.dispatch('on_key_up', 27, 41)
+    t = UnitTestTouch(0, 0)
+    t.touch_down()  # not recorded
+    t.touch_up()
+    return rec.getvalue()
+
+
+def test_iter_records(kivy_runner, widget):
+    from asynckivy.recording import iter_records
+
+    data = record_a_session(kivy_runner, widget)
+    records = list(iter_records(data))
+    assert [r.kind for r in records] == \
+        ['touch_down', 'touch_move', 'touch_up', 'property', 'key_down', 'key_up']
+    assert [r.time for r in records] == pytest.approx([0., .1, .2, .2, .4, .4])
+    assert records[1].args[0] == 0
+    assert records[3].args == ('w', 'opacity', .5)
+    assert records[4].args == (27, 41, '', ['ctrl', 'numlock'])
+
+
+def test_values_that_cannot_be_recorded(kivy_runner, widget):
+    from kivy.uix.spinner import Spinner
+    from asynckivy import recording
+
+    spinner = Spinner()
+    with recording.Recorder(kivy_runner.window) as rec:
+        with pytest.raises(ValueError):
+            rec.watch(widget, 'parent')
+        rec.watch(spinner, 'values')
+        spinner.values = ['a', 'b']
+        rec.watch(widget, 'pos')
+        widget.pos = (1, 2)
+    records = list(recording.iter_records(rec.getvalue()))
+    assert [r.args for r in records] == [('pos', 'pos', [1., 2.])]
+
+
+def test_invalid_data():
+    from asynckivy.recording import iter_records
+    with pytest.raises(ValueError):
+        list(iter_records(b'abc'))
+
+
+def test_replay(kivy_runner, widget):
+    import asynckivy as ak
+    from asynckivy.recording import replay
+    kr = kivy_runner
+    data = record_a_session(kivy_runner, widget)
+    widget.opacity = 1.
+
+    log = []
+    widget.bind(
+        on_touch_down=lambda w, t: log.append(('down', tuple(t.pos))),
+        on_touch_move=lambda w, t: log.append(('move', tuple(t.pos))),
+        on_touch_up=lambda w, t: log.append(('up', tuple(t.pos))),
+    )
+    kr.window.bind(on_keyboard=lambda *args: log.append(('key', args[1])))
+
+    task = ak.start(replay(data, kr.window, targets={'w': widget}))
+    assert log == [('down', pytest.approx((10, 20), abs=1))]
+    kr.advance_a_frame(dt=.1)
+    assert log[-1] == ('move', pytest.approx((30, 40), abs=1))
+    kr.advance_a_frame(dt=.1)
+    assert log[-1][0] == 'up'
+    assert widget.opacity == .5
+    assert not task.finished
+    kr.advance_a_frame(dt=.2)
+    assert log[-1] == ('key', 27)
+    assert task.finished
+
+
+def test_replay_at_double_speed(kivy_runner, widget):
+    import asynckivy as ak
+    from asynckivy.recording import replay
+    kr = kivy_runner
+    data = record_a_session(kivy_runner, widget)
+
+    task = ak.start(replay(data, kr.window, speed=2.))
+    kr.advance_a_frame(dt=.15)
+    assert not task.finished
+    kr.advance_a_frame(dt=.1)
+    assert task.finished
+
+
+def test_cancel_replay_releases_touches(kivy_runner, widget):
+    import asynckivy as ak
+    from asynckivy.recording import replay
+    kr = kivy_runner
+    data = record_a_session(kivy_runner, widget)
+
+    ups = []
+    widget.bind(on_touch_up=lambda w, t: ups.append(t))
+    task = ak.start(replay(data, kr.window))
+    task.cancel()
+    assert len(ups) == 1
@@ -0,0 +1,124 @@
+import pytest
+import asyncio
+import threading
+import time
+from concurrent.futures import CancelledError as FutureCancelledError
+
+
+@pytest.fixture(scope='module', autouse=True)
+def shutdown_loop():
+    yield
+    from asynckivy._asyncio_bridge import _shutdown_loop
+    _shutdown_loop()
+
+
+def _advance_frames_until_finished(kr, task, timeout=5.):
+    deadline = time.monotonic() + timeout
+    while not (task.finished or task.cancelled):
+        assert time.monotonic() < deadline
+        time.sleep(.01)
+        kr.advance_a_frame()
+
+
+def test_return_value(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+
+    async def coro():
+        await asyncio.sleep(0)
+        return threading.get_ident()
+
+    task = ak.start(ak.run_in_asyncio(coro()))
+    assert not task.finished
+    _advance_frames_until_finished(kr, task)
+    assert task.result != threading.get_ident()
+
+
+def test_loop_is_shared(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+
+    async def coro():
+        return asyncio.get_running_loop()
+
+    async def job():
+        return (await ak.run_in_asyncio(coro()), await ak.run_in_asyncio(coro()))
+
+    task = ak.start(job())
+    _advance_frames_until_finished(kr, task)
+    loop1, loop2 = task.result
+    assert loop1 is loop2
+
+
+def test_propagate_exception(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+
+    async def coro():
+        raise ZeroDivisionError
+
+    async def job():
+        with pytest.raises(ZeroDivisionError):
+            await ak.run_in_asyncio(coro())
+
+    task = ak.start(job())
+    _advance_frames_until_finished(kr, task)
+
+
+def test_cancel_from_asynckivy(kivy_runner):
+    import asynckivy as ak
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    async def coro():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    task = ak.start(ak.run_in_asyncio(coro()))
+    assert started.wait(1.)
+    task.cancel()
+    assert task.cancelled
+    assert cancelled.wait(1.)
+
+
+def test_cancel_from_asyncio(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+
+    async def coro():
+        asyncio.current_task().cancel()
+        await asyncio.sleep(0)
+
+    async def caller():
+        with pytest.raises(FutureCancelledError):
+            await ak.run_in_asyncio(coro())
+        return 'handled'
+
+    task = ak.start(caller())
+    _advance_frames_until_finished(kr, task)
+    assert task.result == 'handled'
+
+
+def test_shutdown_doesnt_hang_on_a_coroutine_that_ignores_cancellation(kivy_runner, monkeypatch):
+    import asynckivy as ak
+    from asynckivy import _asyncio_bridge
+    monkeypatch.setattr(_asyncio_bridge, '_SHUTDOWN_TIMEOUT', .1)
+    started = threading.Event()
+
+    async def stubborn():
+        started.set()
+        while True:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                pass
+
+    ak.start(ak.run_in_asyncio(stubborn()))
+    assert started.wait(1.)
+    start = time.monotonic()
+    _asyncio_bridge._shutdown_loop()
+    assert time.monotonic() - start < 1.
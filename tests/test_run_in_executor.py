@@ -76,3 +76,48 @@ def test_cancel_before_start_executing(kivy_runner):
         assert not e.is_fired
         time.sleep(.2)
         assert not e.is_fired
+
+
+def test_cancel_token(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+    started = threading.Event()
+    token_set = threading.Event()
+
+    def func(token):
+        started.set()
+        token_set.set() if token.wait(1.) else None
+
+    async def job(executor):
+        await ak.run_in_executor(executor, func, cancel_token=True)
+
+    with ThreadPoolExecutor() as executor:
+        task = ak.start(job(executor))
+        assert started.wait(1.)
+        task.cancel()
+        assert task.cancelled
+        assert token_set.wait(1.)
+        time.sleep(.01)
+        kr.advance_a_frame()  # drains the completion of 'func'
+
+
+def test_wait_on_cancel(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+    started = threading.Event()
+
+    def func(token):
+        started.set()
+        token.wait(1.)
+
+    async def job(executor):
+        await ak.run_in_executor(executor, func, cancel_token=True, wait_on_cancel=True)
+
+    with ThreadPoolExecutor() as executor:
+        task = ak.start(job(executor))
+        assert started.wait(1.)
+        task.cancel()
+        assert not task.finished
+        time.sleep(.01)
+        kr.advance_a_frame()
+        assert task.cancelled
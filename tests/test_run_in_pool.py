@@ -0,0 +1,93 @@
+import pytest
+import threading
+import time
+
+
+@pytest.fixture()
+def shutdown_pools():
+    import asynckivy as ak
+    yield
+    ak.shutdown_pools()
+
+
+@pytest.mark.parametrize('pool', ('io', 'cpu'))
+def test_thread_name(kivy_runner, shutdown_pools, pool):
+    import asynckivy as ak
+    kr = kivy_runner
+
+    async def job():
+        return await ak.run_in_pool(lambda: threading.current_thread().name, pool=pool)
+
+    task = ak.start(job())
+    time.sleep(.01)
+    assert not task.finished
+    kr.advance_a_frame()
+    assert task.result.startswith(f'asynckivy.{pool}')
+
+
+def test_threads_are_reused(kivy_runner, shutdown_pools):
+    import asynckivy as ak
+    kr = kivy_runner
+    ak.configure_pool('test', max_workers=1)
+
+    async def job():
+        return [await ak.run_in_pool(threading.get_ident, pool='test') for __ in range(3)]
+
+    task = ak.start(job())
+    for __ in range(3):
+        time.sleep(.01)
+        kr.advance_a_frame()
+    assert len(set(task.result)) == 1
+
+
+def test_propagate_exception(kivy_runner, shutdown_pools):
+    import asynckivy as ak
+    kr = kivy_runner
+
+    async def job():
+        with pytest.raises(ZeroDivisionError):
+            await ak.run_in_pool(lambda: 1 / 0)
+
+    task = ak.start(job())
+    time.sleep(.01)
+    kr.advance_a_frame()
+    assert task.finished
+
+
+def test_unknown_pool(kivy_runner):
+    import asynckivy as ak
+
+    with pytest.raises(ValueError):
+        ak.start(ak.run_in_pool(lambda: None, pool='unknown'))
+
+
+def test_configure_after_creation(kivy_runner, shutdown_pools):
+    import asynckivy as ak
+    kr = kivy_runner
+    task = ak.start(ak.run_in_pool(lambda: None))
+    time.sleep(.01)
+    kr.advance_a_frame()
+    assert task.finished
+    with pytest.raises(RuntimeError):
+        ak.configure_pool('io', max_workers=2)
+
+
+def test_shutdown_while_queued(kivy_runner, shutdown_pools):
+    from concurrent.futures import CancelledError
+    import asynckivy as ak
+    kr = kivy_runner
+    ak.configure_pool('test', max_workers=1)
+    release = threading.Event()
+
+    async def queued():
+        with pytest.raises(CancelledError):
+            await ak.run_in_pool(lambda: None, pool='test')
+
+    running = ak.start(ak.run_in_pool(lambda: release.wait(5), pool='test'))
+    task = ak.start(queued())
+    ak.shutdown_pools()
+    release.set()
+    time.sleep(.01)
+    kr.advance_a_frame()
+    assert task.finished
+    assert running.finished
@@ -0,0 +1,80 @@
+import pytest
+import time
+import operator
+
+
+@pytest.fixture()
+def shutdown_pools():
+    import asynckivy as ak
+    from asynckivy._pool import _pools
+    yield
+    pools = tuple(_pools.values())
+    ak.shutdown_pools()
+    # so that the exiting worker processes don't slow down the following tests
+    for p in pools:
+        p.shutdown(wait=True)
+
+
+def _advance_frames_until_finished(kr, task, timeout=10.):
+    deadline = time.monotonic() + timeout
+    while not task.finished:
+        assert time.monotonic() < deadline
+        time.sleep(.01)
+        kr.advance_a_frame()
+
+
+def test_return_value(kivy_runner, shutdown_pools):
+    import asynckivy as ak
+    kr = kivy_runner
+
+    task = ak.start(ak.run_in_process(pow, 2, 10))
+    assert not task.finished
+    _advance_frames_until_finished(kr, task)
+    assert task.result == 1024
+
+
+def test_propagate_exception(kivy_runner, shutdown_pools):
+    import asynckivy as ak
+    kr = kivy_runner
+
+    async def job():
+        with pytest.raises(ZeroDivisionError):
+            await ak.run_in_process(operator.truediv, 1, 0)
+
+    task = ak.start(job())
+    _advance_frames_until_finished(kr, task)
+
+
+def test_shared_memory(kivy_runner, shutdown_pools):
+    import asynckivy as ak
+    kr = kivy_runner
+
+    task = ak.start(ak.run_in_process(operator.mul, b'ab', 100_000, shared_memory=True))
+    _advance_frames_until_finished(kr, task)
+    assert task.result == b'ab' * 100_000
+
+
+def test_shared_memory_empty_result(kivy_runner, shutdown_pools):
+    import asynckivy as ak
+    kr = kivy_runner
+
+    task = ak.start(ak.run_in_process(bytes, shared_memory=True))
+    _advance_frames_until_finished(kr, task)
+    assert task.result == b''
+
+
+def test_cancel_before_start_executing(kivy_runner, shutdown_pools):
+    import asynckivy as ak
+    kr = kivy_runner
+    ak.start(ak.run_in_process(time.sleep, .3))
+    ak.start(ak.run_in_process(time.sleep, .3))  # in case the pool has 2 workers
+    task = ak.start(ak.run_in_process(pow, 2, 10))
+    task.cancel()
+    assert task.cancelled
+
+
+def test_run_in_pool_rejects_the_process_pool(kivy_runner):
+    import asynckivy as ak
+
+    with pytest.raises(ValueError):
+        ak.start(ak.run_in_pool(lambda: None, pool='process'))
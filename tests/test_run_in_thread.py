@@ -50,3 +50,43 @@ def test_no_exception(daemon, kivy_runner):
     assert not task.finished
     kr.advance_a_frame()
     assert task.finished
+
+
+def test_cancel_token(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+    token_set = threading.Event()
+
+    def func(token):
+        token_set.set() if token.wait(1.) else None
+
+    async def job():
+        await ak.run_in_thread(func, cancel_token=True)
+
+    task = ak.start(job())
+    kr.advance_a_frame()
+    task.cancel()
+    assert task.cancelled
+    assert token_set.wait(1.)
+    time.sleep(.01)
+    kr.advance_a_frame()  # drains the completion of 'func'
+
+
+def test_wait_on_cancel(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+
+    def func(token):
+        token.wait(1.)
+        return 'ignored'
+
+    async def job():
+        await ak.run_in_thread(func, cancel_token=True, wait_on_cancel=True)
+
+    task = ak.start(job())
+    kr.advance_a_frame()
+    task.cancel()
+    assert not task.finished
+    time.sleep(.01)
+    kr.advance_a_frame()
+    assert task.cancelled
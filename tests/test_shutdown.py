@@ -0,0 +1,76 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _cancel_managed_tasks():
+    import asynckivy as ak
+    yield
+    ak.cancel_managed_tasks()
+
+
+def test_tasks_that_finish_in_time(kivy_runner):
+    import asynckivy as ak
+    saved = []
+
+    async def edit_draft():
+        await ak.stop_requested()
+        await ak.sleep(.25)
+        saved.append(True)
+
+    task = ak.managed_start(edit_draft())
+    kivy_runner.advance_a_frame()
+    assert not saved
+    assert ak.shutdown(1.0, tick=kivy_runner.advance_a_frame) == []
+    assert saved
+    assert task.finished
+
+
+def test_tasks_that_dont_finish_in_time(kivy_runner):
+    import asynckivy as ak
+
+    async def slow():
+        await ak.stop_requested()
+        await ak.sleep(5.)
+
+    t1 = ak.managed_start(slow())
+    t2 = ak.managed_start(ak.sleep_forever())
+    start = kivy_runner.current_time
+    assert ak.shutdown(.5, tick=kivy_runner.advance_a_frame) == [t1, t2]
+    assert t1.cancelled and t2.cancelled
+    assert .5 <= kivy_runner.current_time - start < .7
+
+
+def test_returns_immediately_when_there_is_nothing_to_wait_for(kivy_runner):
+    import asynckivy as ak
+    start = kivy_runner.current_time
+    assert ak.shutdown(1.0, tick=kivy_runner.advance_a_frame) == []
+    assert kivy_runner.current_time == start
+
+
+def test_completions_are_pumped(kivy_runner):
+    import time
+    import threading
+    import asynckivy as ak
+    ev = threading.Event()
+    results = []
+
+    def tick():
+        time.sleep(.01)
+        kivy_runner.advance_a_frame()
+
+    async def write():
+        results.append(await ak.run_in_thread(lambda: ev.wait(5) and 'written'))
+
+    ak.managed_start(write())
+    ev.set()
+    assert ak.shutdown(5., tick=tick) == []
+    assert results == ['written']
+
+
+def test_stop_requested_is_reset(kivy_runner):
+    import asynckivy as ak
+    ak.shutdown(1.0, tick=kivy_runner.advance_a_frame)
+    task = ak.start(ak.stop_requested())
+    assert not task.finished
+    ak.shutdown(1.0, tick=kivy_runner.advance_a_frame)
+    assert task.finished
@@ -0,0 +1,191 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _cancel_managed_tasks():
+    import asynckivy as ak
+    yield
+    ak.cancel_managed_tasks()
+
+
+def test_max_concurrent():
+    import asynckivy as ak
+    e = ak.Event()
+    n_running = 0
+    max_running = 0
+    finished = []
+
+    async def job(i):
+        nonlocal n_running, max_running
+        n_running += 1
+        max_running = max(max_running, n_running)
+        try:
+            await e.wait()
+            finished.append(i)
+        finally:
+            n_running -= 1
+
+    limiter = ak.TaskLimiter(2)
+    for i in range(5):
+        limiter.start(job, i)
+    assert limiter.n_active == 2
+    assert limiter.n_waiting == 3
+    e.fire()
+    assert finished == [0, 1]
+    e.fire()
+    assert finished == [0, 1, 2, 3]
+    e.fire()
+    assert finished == [0, 1, 2, 3, 4]
+    assert max_running == 2
+    assert limiter.n_active == 0
+    assert limiter.n_waiting == 0
+
+
+def test_priority():
+    import asynckivy as ak
+    e = ak.Event()
+    order = []
+
+    async def job(name):
+        order.append(name)
+        await e.wait()
+
+    limiter = ak.TaskLimiter(1)
+    limiter.start(job, 'first')
+    limiter.start(job, 'low', priority=-1)
+    limiter.start(job, 'normal1')
+    limiter.start(job, 'high', priority=1)
+    limiter.start(job, 'normal2')
+    for __ in range(4):
+        e.fire()
+    assert order == ['first', 'high', 'normal1', 'normal2', 'low']
+
+
+def test_waiting_ones_are_not_coroutines_yet():
+    import asynckivy as ak
+    called = []
+
+    def async_func(i):
+        called.append(i)
+        return ak.sleep_forever()
+
+    limiter = ak.TaskLimiter(1)
+    for i in range(3):
+        limiter.start(async_func, i)
+    assert called == [0]
+
+
+def test_cancelling_a_running_task_discards_the_waiting_ones():
+    import asynckivy as ak
+    from asynckivy import _managed_start as _ms
+    started = []
+
+    async def job(i):
+        started.append(i)
+        await ak.sleep_forever()
+
+    limiter = ak.TaskLimiter(1)
+    limiter.start(job, 0)
+    limiter.start(job, 1)
+    task, __ = next(iter(_ms._managed_tasks.values()))
+    task.cancel()
+    assert started == [0]
+    assert limiter.n_active == 0
+    assert limiter.n_waiting == 0
+
+
+def test_tasks_that_end_immediately_dont_grow_the_recursion():
+    import sys
+    import asynckivy as ak
+    n = sys.getrecursionlimit() * 2
+    finished = []
+
+    async def job(i):
+        finished.append(i)
+
+    e = ak.Event()
+    limiter = ak.TaskLimiter(1)
+    limiter.start(e.wait)
+    for i in range(n):
+        limiter.start(job, i)
+    e.fire()
+    assert len(finished) == n
+
+
+def test_clear():
+    import asynckivy as ak
+    e = ak.Event()
+    limiter = ak.TaskLimiter(1)
+    limiter.start(e.wait)
+    limiter.start(e.wait)
+    limiter.clear()
+    assert limiter.n_waiting == 0
+    e.fire()
+    assert limiter.n_active == 0
+
+
+def test_cancel_managed_tasks_doesnt_start_the_waiting_ones():
+    import asynckivy as ak
+    started = []
+
+    async def job(i):
+        started.append(i)
+        await ak.sleep_forever()
+
+    limiter = ak.TaskLimiter(2)
+    for i in range(100):
+        limiter.start(job, i)
+    ak.cancel_managed_tasks()
+    assert started == [0, 1]
+    assert limiter.n_active == 0
+    assert limiter.n_waiting == 0
+
+
+def test_nursery():
+    import asynckivy as ak
+    e = ak.Event()
+    finished = []
+
+    async def job(i):
+        await e.wait()
+        finished.append(i)
+
+    async def main():
+        async with ak.open_nursery() as nursery:
+            limiter = ak.TaskLimiter(2, start=nursery.start)
+            for i in range(4):
+                limiter.start(job, i)
+
+    task = ak.start(main())
+    e.fire()
+    assert not task.finished
+    e.fire()
+    assert task.finished
+    assert finished == [0, 1, 2, 3]
+
+
+def test_closed_nursery():
+    import asynckivy as ak
+    started = []
+
+    async def job(i):
+        started.append(i)
+        await ak.sleep_forever()
+
+    async def main():
+        async with ak.open_nursery() as nursery:
+            limiter = ak.TaskLimiter(1, start=nursery.start)
+            for i in range(3):
+                limiter.start(job, i)
+            nursery.close()
+        assert limiter.n_waiting == 0
+
+    task = ak.start(main())
+    assert task.finished
+    assert started == [0]
+
+
+def test_invalid_max_concurrent():
+    import asynckivy as ak
+    with pytest.raises(ValueError):
+        ak.TaskLimiter(0)
@@ -0,0 +1,90 @@
+import pytest
+import threading
+import time
+
+
+def test_recv_batch(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+    ch = ak.ThreadChannel()
+
+    def produce():
+        for i in range(100):
+            ch.send(i)
+
+    task = ak.start(ch.recv_batch())
+    t = threading.Thread(target=produce)
+    t.start()
+    t.join()
+    assert not task.finished
+    kr.advance_a_frame()
+    assert task.result == list(range(100))
+
+
+def test_woken_up_at_most_once_per_frame(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+    ch = ak.ThreadChannel()
+    batches = []
+
+    async def receive():
+        while True:
+            batches.append(await ch.recv_batch())
+
+    task = ak.start(receive())
+    for i in range(3):
+        for j in range(10):
+            ch.send((i, j))
+        kr.advance_a_frame()
+    assert len(batches) == 3
+    assert batches[1] == [(1, j) for j in range(10)]
+    task.cancel()
+
+
+def test_max_items(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+    ch = ak.ThreadChannel()
+    for i in range(5):
+        ch.send(i)
+    kr.advance_a_frame()
+
+    task = ak.start(ch.recv_batch(max_items=3))
+    assert task.result == [0, 1, 2]
+    assert len(ch) == 2
+
+
+@pytest.mark.parametrize('policy, expected', [('drop_newest', [0, 1, 2]), ('drop_oldest', [2, 3, 4])])
+def test_dropping_policies(kivy_runner, policy, expected):
+    import asynckivy as ak
+    ch = ak.ThreadChannel(3, policy=policy)
+    results = [ch.send(i) for i in range(5)]
+    assert results == [True, True, True, policy == 'drop_oldest', policy == 'drop_oldest']
+    assert ak.start(ch.recv_batch()).result == expected
+
+
+def test_blocking_policy(kivy_runner):
+    import asynckivy as ak
+    ch = ak.ThreadChannel(2)
+    done = threading.Event()
+
+    def produce():
+        for i in range(3):
+            ch.send(i)
+        done.set()
+
+    t = threading.Thread(target=produce)
+    t.start()
+    assert not done.wait(.05)
+    assert ak.start(ch.recv_batch()).result == [0, 1]
+    assert done.wait(1.)
+    t.join()
+    assert ak.start(ch.recv_batch()).result == [2]
+
+
+def test_invalid_arguments():
+    import asynckivy as ak
+    with pytest.raises(ValueError):
+        ak.ThreadChannel(policy='unknown')
+    with pytest.raises(ValueError):
+        ak.ThreadChannel(-1)
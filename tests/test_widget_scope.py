@@ -0,0 +1,141 @@
+import pytest
+
+
+@pytest.fixture()
+def tree(kivy_runner):
+    from kivy.uix.widget import Widget
+    root = Widget()
+    middle = Widget()
+    leaf = Widget()
+    root.add_widget(middle)
+    middle.add_widget(leaf)
+    kivy_runner.window.add_widget(root)
+    yield root, middle, leaf
+    kivy_runner.window.remove_widget(root)
+
+
+def test_attached(tree, kivy_runner):
+    import asynckivy as ak
+    root, middle, leaf = tree
+
+    scope = ak.widget_scope(leaf)
+    assert scope.attached
+    kivy_runner.window.remove_widget(root)
+    assert not scope.attached
+    kivy_runner.window.add_widget(root)
+    assert scope.attached
+    scope.close()
+
+
+def test_cancel_on_detach(tree):
+    import asynckivy as ak
+    root, middle, leaf = tree
+
+    scope = ak.widget_scope(leaf)
+    task = scope.start(ak.sleep_forever())
+    assert not task.cancelled
+    root.remove_widget(middle)
+    assert task.cancelled
+    scope.close()
+
+
+def test_detaching_the_widget_itself(tree):
+    import asynckivy as ak
+    root, middle, leaf = tree
+
+    scope = ak.widget_scope(leaf)
+    task = scope.start(ak.sleep_forever())
+    middle.remove_widget(leaf)
+    assert task.cancelled
+    scope.close()
+
+
+def test_changes_above_the_detached_point_are_ignored(tree, kivy_runner):
+    import asynckivy as ak
+    from kivy.uix.widget import Widget
+    root, middle, leaf = tree
+
+    scope = ak.widget_scope(leaf)
+    root.remove_widget(middle)
+    other = Widget()
+    other.add_widget(middle)
+    assert not scope.attached
+    kivy_runner.window.add_widget(other)
+    assert scope.attached
+    kivy_runner.window.remove_widget(root)
+    assert scope.attached
+    kivy_runner.window.remove_widget(other)
+    assert not scope.attached
+    scope.close()
+
+
+def test_start_on_attach(tree, kivy_runner):
+    import asynckivy as ak
+    root, middle, leaf = tree
+    started = []
+
+    async def async_func(name):
+        started.append(name)
+        await ak.sleep_forever()
+
+    scope = ak.widget_scope(leaf)
+    scope.start_on_attach(async_func, 'A')
+    assert started == ['A']
+    kivy_runner.window.remove_widget(root)
+    scope.start_on_attach(async_func, 'B')
+    assert started == ['A']
+    kivy_runner.window.add_widget(root)
+    assert started == ['A', 'A', 'B']
+    scope.close()
+
+
+def test_close(tree):
+    import asynckivy as ak
+    root, middle, leaf = tree
+
+    scope = ak.widget_scope(leaf)
+    task = scope.start(ak.sleep_forever())
+    scope.close()
+    assert task.cancelled
+    root.remove_widget(middle)
+
+
+def test_finished_tasks_are_not_retained(tree):
+    import asynckivy as ak
+    root, middle, leaf = tree
+
+    scope = ak.widget_scope(leaf)
+    e = ak.Event()
+    scope.start(e.wait())
+    assert len(scope._tasks) == 1
+    e.fire()
+    assert len(scope._tasks) == 0
+    scope.close()
+
+
+def test_starting_a_started_task(tree):
+    import asynckivy as ak
+    root, middle, leaf = tree
+
+    scope = ak.widget_scope(leaf)
+    task = ak.start(ak.sleep_forever())
+    with pytest.raises(ValueError):
+        scope.start(task)
+    assert len(scope._tasks) == 0
+    task.cancel()
+    scope.close()
+
+
+def test_existing_on_end_is_kept(tree):
+    import asynckivy as ak
+    root, middle, leaf = tree
+
+    scope = ak.widget_scope(leaf)
+    ended = []
+    task = ak.Task(ak.sleep_forever())
+    task._on_end = ended.append
+    scope.start(task)
+    root.remove_widget(middle)
+    assert task.cancelled
+    assert ended == [task]
+    assert len(scope._tasks) == 0
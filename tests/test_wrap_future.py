@@ -0,0 +1,53 @@
+import pytest
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+def test_result(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+    future = Future()
+
+    task = ak.start(ak.wrap_future(future))
+    future.set_result('A')
+    assert not task.finished
+    kr.advance_a_frame()
+    assert task.result == 'A'
+
+
+def test_already_done(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+    future = Future()
+    future.set_result('A')
+
+    task = ak.start(ak.wrap_future(future))
+    kr.advance_a_frame()
+    assert task.result == 'A'
+
+
+def test_propagate_exception(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+
+    async def job(executor):
+        with pytest.raises(ZeroDivisionError):
+            await ak.wrap_future(executor.submit(lambda: 1 / 0))
+
+    with ThreadPoolExecutor() as executor:
+        task = ak.start(job(executor))
+        time.sleep(.01)
+        kr.advance_a_frame()
+        assert task.finished
+
+
+def test_cancel(kivy_runner):
+    import asynckivy as ak
+    kr = kivy_runner
+    future = Future()
+
+    task = ak.start(ak.wrap_future(future))
+    task.cancel()
+    assert task.cancelled
+    assert future.cancelled()
+    kr.advance_a_frame()